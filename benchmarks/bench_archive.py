@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+War archive benchmark
+
+Fills a SQLite war archive with thousands of synthetic wars, then times
+cross-war queries. First checks that a 90-day war survives a save and
+load unchanged. Exits non-zero on a mismatch or if a query takes longer
+than QUERY_LIMIT_MS.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import WarModel, Participant, generate_war_dates
+from clan_war_archive import WarArchive
+
+WARS = 3000
+ROSTER = 100
+PLAYERS = 1000
+WAR_LENGTH = 14
+REPEATS = 5
+QUERY_LIMIT_MS = 50
+
+
+def build_war(rng, index):
+    """Synthetic war drawn from a shared player pool, one war every two weeks"""
+    model = WarModel()
+    model.prize_pool = 1000000.0
+    model.prize_mode = "ranked" if index % 2 else "equal"
+    model.war_dates = generate_war_dates(datetime(2015, 1, 1) + timedelta(days=14 * index), WAR_LENGTH)
+    model.participants = [Participant(f"Player {number:04d}", rng.getrandbits(WAR_LENGTH))
+                          for number in rng.sample(range(PLAYERS), ROSTER)]
+    model.reindex()
+    return model
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def round_trip_ok(archive):
+    """Store and reload a 90-day war where players attend days past bit 63"""
+    model = WarModel()
+    model.war_dates = generate_war_dates(datetime(2014, 1, 1), 90)
+    model.participants = [Participant("Every Day", (1 << 90) - 1), Participant("Late Joiner", 1 << 89),
+                          Participant("Absent", 0)]
+    model.reindex()
+    archive.save_war(model, "Round trip")
+    war_id = next(war[0] for war in archive.list_wars() if war[1] == "Round trip")
+    loaded = archive.load_war(war_id)
+    archive.delete_war(war_id)
+    return ([(p.name, p.mask) for p in loaded.participants] == [(p.name, p.mask) for p in model.participants]
+            and loaded.war_dates == model.war_dates)
+
+
+def main():
+    rng = random.Random(WARS)
+    with tempfile.TemporaryDirectory() as directory:
+        with WarArchive(os.path.join(directory, "archive.db")) as archive:
+            if not round_trip_ok(archive):
+                print("MISMATCH: a 90-day war did not survive a save and load")
+                return 1
+            start = time.perf_counter()
+            archive.save_wars((f"War {index + 1:05d}", build_war(rng, index)) for index in range(WARS))
+            elapsed = time.perf_counter() - start
+            print(f"Stored {WARS} wars x {ROSTER} participants in {elapsed:.2f}s "
+                  f"({WARS * ROSTER / elapsed:,.0f} participants/s)")
+
+            queries = {
+                "player summary (all time)": lambda: archive.player_summary("Player 0042"),
+                "player summary (one year)": lambda: archive.player_summary("Player 0042",
+                                                                            "2020-01-01", "2020-12-31"),
+                "days attended (one year)": lambda: archive.days_attended("Player 0042",
+                                                                          "2020-01-01", "2020-12-31"),
+                "present on a date": lambda: archive.attendance_on("2020-06-15"),
+                "list wars": archive.list_wars,
+            }
+            slow = False
+            for label, query in queries.items():
+                elapsed_ms = best_time(query)
+                slow = slow or elapsed_ms > QUERY_LIMIT_MS
+                print(f"{label:<28} {elapsed_ms:>8.2f}ms")
+
+    if slow:
+        print(f"A query took longer than {QUERY_LIMIT_MS}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Binary war format benchmark
+
+Saves synthetic wars as JSON and as the compact binary format, then
+compares file size, read time (file to save data) and full load time (file
+to WarModel). Exits non-zero if the binary format is less than TARGET times
+smaller or faster to read. Building the participants is the same work for
+both formats, so the full load speedup is reported but not checked.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import WarModel, Participant, load_war, read_war
+from clan_war_binary import BINARY_EXTENSION
+
+SIZES = [1000, 10000, 100000]
+WAR_LENGTH = 14
+SQUAD_SIZE = 20
+CLASS_ICONS = ["⚔️", "🏹", "🔮", "🛡️", None]
+REPEATS = 3
+TARGET = 10
+
+
+def build_model(size):
+    """Synthetic roster with random attendance, class icons and squads"""
+    rng = random.Random(size)
+    model = WarModel()
+    model.prize_pool = 1000000.0
+    model.participants = [Participant(f"Player {i:06d}", rng.getrandbits(WAR_LENGTH), rng.choice(CLASS_ICONS))
+                          for i in range(size)]
+    model.reindex()
+    for start in range(0, min(size, 2000), SQUAD_SIZE):
+        squad_index = len(model.squads)
+        model.add_squad(f"Squad {squad_index + 1}")
+        for participant in model.participants[start:start + SQUAD_SIZE]:
+            model.add_to_squad(squad_index, participant.name)
+    return model
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{'Size':>8} {'JSON':>11} {'Binary':>11} {'Ratio':>7} "
+          f"{'JSON read':>10} {'Bin read':>9} {'Speedup':>8} {'JSON load':>10} {'Bin load':>9} {'Speedup':>8}")
+    failed = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            model = build_model(size)
+            json_file = os.path.join(directory, f"war_{size}.json")
+            binary_file = os.path.join(directory, f"war_{size}{BINARY_EXTENSION}")
+            model.save(json_file)
+            model.save(binary_file)
+
+            # Both formats must load to the same war
+            expected = json.dumps(load_war(json_file).to_dict(), sort_keys=True)
+            if json.dumps(load_war(binary_file).to_dict(), sort_keys=True) != expected:
+                print(f"MISMATCH for {size} participants")
+                return 1
+
+            json_size = os.path.getsize(json_file)
+            binary_size = os.path.getsize(binary_file)
+            json_read_ms = best_time(lambda: read_war(json_file))
+            binary_read_ms = best_time(lambda: read_war(binary_file))
+            json_load_ms = best_time(lambda: load_war(json_file))
+            binary_load_ms = best_time(lambda: load_war(binary_file))
+            ratio = json_size / binary_size
+            read_speedup = json_read_ms / binary_read_ms
+            failed = failed or ratio < TARGET or read_speedup < TARGET
+
+            print(f"{size:>8} {json_size:>10,}B {binary_size:>10,}B {ratio:>6.1f}x "
+                  f"{json_read_ms:>8.1f}ms {binary_read_ms:>7.1f}ms {read_speedup:>7.1f}x "
+                  f"{json_load_ms:>8.1f}ms {binary_load_ms:>7.1f}ms {json_load_ms / binary_load_ms:>7.1f}x")
+
+    if failed:
+        print(f"Binary format is below the {TARGET}x size/read target")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
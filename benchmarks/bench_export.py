@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Results exporter benchmark
+
+Exports large synthetic rosters as CSV, TSV and JSON Lines with the
+streaming exporter and compares them with building the full text report
+in memory, on 14- and 90-day wars. Reports time, throughput and peak
+traced memory, and checks every exported table has one line per
+participant plus its header. Exits non-zero on a mismatch, or when an
+export peaks above a small fixed budget per participant: a streaming
+export must not hold the whole report, however long the war is.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import Participant, WarModel, generate_war_dates
+from clan_war_export import export_model
+
+SIZES = [1000, 10000, 100000]
+WAR_LENGTHS = [14, 90]
+FORMATS = ['csv', 'tsv', 'jsonl']
+REPEATS = 3
+ROW_BYTES = 256  # per-participant working set: name and mask pairs, totals and ranks
+SLACK_MB = 4.0   # the 1 MB write buffer and interpreter noise
+
+
+def make_war(size, length, prize_mode, seed=7):
+    """A war of length days with size participants and skewed attendance"""
+    rng = random.Random(seed + size + length)
+    model = WarModel()
+    model.set_war_dates(generate_war_dates(length=length))
+    model.prize_mode = prize_mode
+    model.prize_pool = 10000000.0
+    model.participants = [Participant(f"Player {i:07d}", rng.getrandbits(length) | rng.getrandbits(length))
+                          for i in range(size)]
+    model.reindex()
+    return model
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(func):
+    """Peak traced memory of one run in MB"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    print(f"{'Size':>7} {'Days':>5} {'Mode':>7} {'Format':>7} {'Time':>10} {'MB/s':>8} {'Peak':>9}")
+    with tempfile.TemporaryDirectory() as folder:
+        for size in SIZES:
+            for length in WAR_LENGTHS:
+                for prize_mode in ('equal', 'ranked'):
+                    model = make_war(size, length, prize_mode)
+                    for fmt in FORMATS:
+                        path = os.path.join(folder, f"results.{fmt}")
+                        export_ms = best_time(lambda: export_model(model, path))
+                        with open(path, encoding='utf-8') as f:
+                            lines = sum(1 for _ in f)
+                        if lines != size + (fmt != 'jsonl'):
+                            print(f"MISMATCH: {lines} lines in {fmt} export of {size} participants")
+                            return 1
+                        megabytes = os.path.getsize(path) / (1 << 20)
+                        peak = peak_memory(lambda: export_model(model, path))
+                        print(f"{size:>7} {length:>5} {prize_mode:>7} {fmt:>7} {export_ms:>8.1f}ms "
+                              f"{megabytes / export_ms * 1000:>8.1f} {peak:>7.2f}MB")
+                        budget = size * ROW_BYTES / (1 << 20) + SLACK_MB
+                        if peak > budget:
+                            print(f"TOO MUCH MEMORY: {peak:.1f}MB peak exporting {size} rows "
+                                  f"({budget:.1f}MB allowed)")
+                            return 1
+
+                    # The text report is built whole before it can be written
+                    model.invalidate_results()
+                    report_ms = best_time(lambda: (model.invalidate_results(), model.generate_export_results()))
+                    model.invalidate_results()
+                    peak = peak_memory(model.generate_export_results)
+                    print(f"{size:>7} {length:>5} {prize_mode:>7} {'text':>7} {report_ms:>8.1f}ms "
+                          f"{'':>8} {peak:>7.2f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
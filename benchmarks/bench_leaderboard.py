@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Leaderboard benchmark
+
+Fills a war archive with a 100k-player history, then times storing one more
+war (which updates the leaderboard in place), a full leaderboard rebuild for
+comparison, and top-K queries for every metric. Exits non-zero if a top-K
+query takes longer than QUERY_LIMIT_MS.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import WarModel, Participant, generate_war_dates
+from clan_war_archive import METRICS, SEASON_METRICS, WarArchive
+
+PLAYERS = 100000
+WARS = 12
+ROSTER = 20000
+WAR_LENGTH = 14
+TOP = 100
+REPEATS = 5
+QUERY_LIMIT_MS = 50
+
+
+def build_war(rng, index):
+    """Synthetic war; consecutive wars overlap so players build streaks"""
+    model = WarModel()
+    model.prize_pool = 1000000.0
+    model.war_dates = generate_war_dates(datetime(2023, 1, 1) + timedelta(days=60 * index), WAR_LENGTH)
+    first = index * (PLAYERS - ROSTER) // WARS
+    numbers = rng.sample(range(PLAYERS), ROSTER // 2) + list(range(first, first + ROSTER // 2))
+    model.participants = [Participant(f"Player {number:06d}", rng.getrandbits(WAR_LENGTH))
+                          for number in dict.fromkeys(numbers)]
+    model.reindex()
+    return model
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    rng = random.Random(PLAYERS)
+    with tempfile.TemporaryDirectory() as directory:
+        with WarArchive(os.path.join(directory, "archive.db")) as archive:
+            start = time.perf_counter()
+            archive.save_wars((f"War {index + 1:03d}", build_war(rng, index)) for index in range(WARS))
+            elapsed = time.perf_counter() - start
+            players = archive.connection.execute("SELECT COUNT(*) FROM player_stats").fetchone()[0]
+            print(f"Stored {WARS} wars with {players:,} players in {elapsed:.2f}s")
+
+            model = build_war(rng, WARS)
+            start = time.perf_counter()
+            archive.save_war(model, f"War {WARS + 1:03d}")
+            store_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            archive.rebuild_leaderboard()
+            rebuild_ms = (time.perf_counter() - start) * 1000
+            print(f"Store one war ({len(model.participants):,} players) {store_ms:>9.1f}ms  "
+                  f"full leaderboard rebuild {rebuild_ms:>9.1f}ms")
+
+            season = archive.seasons()[0]
+            queries = {f"top {TOP} by {metric}": (metric, None) for metric in METRICS}
+            queries.update({f"top {TOP} by {metric} ({season})": (metric, season) for metric in SEASON_METRICS})
+            slow = False
+            for label, (metric, season) in queries.items():
+                elapsed_ms = best_time(lambda: archive.leaderboard(metric, TOP, season))
+                slow = slow or elapsed_ms > QUERY_LIMIT_MS
+                print(f"{label:<28} {elapsed_ms:>8.2f}ms")
+
+    if slow:
+        print(f"A leaderboard query took longer than {QUERY_LIMIT_MS}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Payout engine benchmark
+
+Compares the pure Python and NumPy paths of clan_war_vector (and the
+row-by-row WarModel calculation) on large synthetic rosters, and checks
+that both vectorized paths give identical results.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import WarModel, Participant
+import clan_war_vector
+
+SIZES = [1000, 10000, 50000, 200000]
+WAR_LENGTH = 14
+REPEATS = 3
+
+
+def build_model(size):
+    """Synthetic roster with random attendance"""
+    rng = random.Random(size)
+    model = WarModel()
+    model.prize_pool = 1000000.0
+    model.participants = [Participant(f"Player {i:06d}", rng.getrandbits(WAR_LENGTH))
+                          for i in range(size)]
+    model.reindex()
+    return model
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"NumPy available: {clan_war_vector.HAS_NUMPY}")
+    print(f"{'Size':>8} {'Mode':>7} {'WarModel':>10} {'Python':>10} {'NumPy':>10}")
+    
+    for size in SIZES:
+        model = build_model(size)
+        for mode in ("equal", "ranked"):
+            model.prize_mode = mode
+            calculate = model.calculate_equal_payouts if mode == "equal" else model.calculate_ranked_payouts
+            
+            model_ms = best_time(lambda: (model.invalidate_results(), calculate()))
+            python_ms = best_time(lambda: clan_war_vector.compute_payouts(model, use_numpy=False))
+            
+            if clan_war_vector.HAS_NUMPY:
+                numpy_ms = best_time(lambda: clan_war_vector.compute_payouts(model, use_numpy=True))
+                python_result = clan_war_vector.compute_payouts(model, use_numpy=False)
+                numpy_result = clan_war_vector.compute_payouts(model, use_numpy=True)
+                for field in python_result.__slots__:
+                    if getattr(python_result, field) != getattr(numpy_result, field):
+                        print(f"MISMATCH in {field} for {size} participants ({mode})")
+                        return 1
+                numpy_text = f"{numpy_ms:>8.1f}ms"
+            else:
+                numpy_text = f"{'n/a':>10}"
+            
+            print(f"{size:>8} {mode:>7} {model_ms:>8.1f}ms {python_ms:>8.1f}ms {numpy_text}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Ranking engine benchmark
+
+Ranks large synthetic rosters three ways: the previous comparison sort,
+the counting-sort Ranking, and Ranking limited to the paid places (heap
+selection). Checks all three agree on every paid participant and that the
+full rankings are identical. Exits non-zero on a mismatch.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import default_ranked_prizes, ordinal
+from clan_war_ranking import Ranking
+
+SIZES = [1000, 10000, 100000, 1000000]
+WAR_LENGTHS = [14, 90]
+REPEATS = 3
+
+
+def sorted_ranking(names, totals, ranked_prizes):
+    """The comparison-sort ranking the engine used before"""
+    order = sorted(range(len(totals)), key=totals.__getitem__, reverse=True)
+    rankings = []
+    current_rank = 1
+    prev_attendance = None
+    for i, index in enumerate(order):
+        if prev_attendance is not None and totals[index] != prev_attendance:
+            current_rank = i + 1
+        if current_rank <= len(ranked_prizes):
+            payout = ranked_prizes[current_rank - 1]['amount']
+            rank_label = ranked_prizes[current_rank - 1]['label']
+        else:
+            payout = 0
+            rank_label = f"{ordinal(current_rank)} Place"
+        rankings.append((names[index], current_rank, rank_label, payout))
+        prev_attendance = totals[index]
+    return rankings
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    prizes = default_ranked_prizes()
+    print(f"{'Size':>8} {'Days':>5} {'Sort':>10} {'Counting':>10} {'Speedup':>8} {'Top-K':>10} {'Speedup':>8}")
+
+    for size in SIZES:
+        for length in WAR_LENGTHS:
+            rng = random.Random(size + length)
+            names = [f"Player {i:07d}" for i in range(size)]
+            # Skewed attendance: most players show up most days
+            totals = [min(length, int(rng.betavariate(5, 2) * (length + 1))) for _ in range(size)]
+
+            expected = sorted_ranking(names, totals, prizes)
+            if Ranking(totals, prizes).rows(names) != expected:
+                print(f"MISMATCH for {size} participants, {length} days")
+                return 1
+            top = Ranking(totals, prizes, places=len(prizes)).rows(names)
+            if top != expected[:len(top)] or any(row[3] for row in expected[len(top):]):
+                print(f"TOP-K MISMATCH for {size} participants, {length} days")
+                return 1
+
+            sort_ms = best_time(lambda: sorted_ranking(names, totals, prizes))
+            counting_ms = best_time(lambda: Ranking(totals, prizes).rows(names))
+            top_ms = best_time(lambda: Ranking(totals, prizes, places=len(prizes)).rows(names))
+            print(f"{size:>8} {length:>5} {sort_ms:>8.1f}ms {counting_ms:>8.1f}ms {sort_ms / counting_ms:>7.1f}x "
+                  f"{top_ms:>8.1f}ms {sort_ms / top_ms:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Tracker benchmark suite
+
+Builds synthetic wars (100 to 100k participants, several war lengths and
+squad counts) and times the hot paths: add_participant, update_attendance,
+refresh_attendance_grid, refresh_squad_details, generate_equal_results,
+generate_ranked_results, save_data and load_specific_file. Each case
+reports its best time and peak traced memory, and is compared with the
+stored baseline (benchmarks/baseline.json) to flag regressions.
+
+Cases can run on the headless WarModel (the "model" backend, what the
+tracker does without drawing, and the default) or through a withdrawn
+ClanWarTracker window (the "tk" backend, which also times
+refresh_attendance_grid). The committed baseline only holds model cases,
+so Tk cases are opt-in: record their baseline on your machine under Xvfb
+before comparing them.
+
+    python benchmarks/bench_suite.py                  # compare model cases with the baseline
+    python benchmarks/bench_suite.py --save-baseline  # record a new baseline
+    xvfb-run python benchmarks/bench_suite.py --backend tk --save-baseline
+    xvfb-run python benchmarks/bench_suite.py --backend all
+
+Exits non-zero when a case is slower or uses more memory than the
+baseline allows, or when a case it ran has no baseline entry yet. The
+cases that wait on the disk (save_data and load_specific_file) get a
+wider time tolerance.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_binary import is_binary
+from clan_war_engine import Participant, Squad, WarModel, generate_war_dates, write_war
+from clan_war_journal import WarJournal
+from clan_war_stream import iter_war_batches
+
+SIZES = [100, 1000, 10000, 100000]
+WAR_LENGTHS = [14, 90]
+SQUAD_COUNTS = [5, 50]
+REPEATS = 3
+ADDS = 100       # participants added per add_participant run
+TOGGLES = 1000   # cells toggled per update_attendance run
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+THRESHOLD = 1.5          # allowed slowdown / memory growth over the baseline
+MIN_DELTA_MS = 5.0       # smaller differences are timer and disk noise
+MIN_DELTA_MB = 0.5
+# Disk time (save_data's fsync, reading back the file just written) varies run
+# to run with whatever else the disk is doing
+IO_OPERATIONS = {'save_data', 'load_specific_file'}
+IO_THRESHOLD = 2.0
+IO_MIN_DELTA_MS = 20.0
+
+CLASS_ICONS = [None, "sword_shield", "two_handed", "spear", "dual_axe", "dual_dagger", "war_hammer"]
+
+
+def make_war(size, length, squads, seed=11):
+    """A synthetic war: most players attend most days, everyone is in one squad"""
+    rng = random.Random(seed + size * 7 + length)
+    model = WarModel()
+    model.set_war_dates(generate_war_dates(length=length))
+    model.prize_pool = 10000000.0
+    # Two random draws OR-ed together give roughly 75% attendance
+    model.participants = [Participant(f"Player {i:06d}",
+                                      rng.getrandbits(length) | rng.getrandbits(length),
+                                      CLASS_ICONS[i % len(CLASS_ICONS)])
+                          for i in range(size)]
+    names = [participant.name for participant in model.participants]
+    model.squads = [Squad(f"Squad {s:03d}", names[s::squads]) for s in range(squads)]
+    model.reindex()
+    return model
+
+
+def read_like_tracker(filename):
+    """Load a war file the way load_specific_file does (streamed JSON, or snapshot plus journal)"""
+    with open(filename, 'rb') as f:
+        binary = is_binary(f.read(4))
+    model = WarModel()
+    journal = WarJournal(filename)
+    if binary:
+        journal.load(model)
+        return model
+    for _, settings, participants, squads, done in iter_war_batches(filename, wars=1):
+        model.extend_participants(participants)
+        if done:
+            model.squads = squads
+            model.update_settings(settings)
+            model.reindex()
+            journal.replay(model, settings.get('journal_seq', 0))
+    return model
+
+
+class ModelCases:
+    """The benchmarked operations on a headless WarModel"""
+
+    backend = 'model'
+
+    def __init__(self, model, path):
+        self.model = model
+        self.path = path
+        self.rng = random.Random(len(model.participants))
+        self.added = 0
+
+    def add_participant(self):
+        for _ in range(ADDS):
+            self.added += 1
+            self.model.add_participant(f"New Player {self.added:06d}")
+
+    def update_attendance(self):
+        model, rng = self.model, self.rng
+        size, length = len(model.participants), model.war_length
+        for _ in range(TOGGLES):
+            index, day = rng.randrange(size), rng.randrange(length)
+            model.set_attendance(index, day, not model.participants[index].attended(day))
+
+    def refresh_squad_details(self):
+        model = self.model
+        squad = model.squads[0]
+        model.available_participants(squad)
+        [model.get_participant(name) for name in squad.members]
+
+    def generate_equal_results(self):
+        self.model.invalidate_results()
+        self.model.generate_equal_results()
+
+    def generate_ranked_results(self):
+        self.model.invalidate_results()
+        self.model.generate_ranked_results()
+
+    def save_data(self):
+        write_war(self.path, self.model.to_dict())
+
+    def load_specific_file(self):
+        read_like_tracker(self.path)
+
+    def close(self):
+        pass
+
+
+class TkCases(ModelCases):
+    """The benchmarked operations through a withdrawn ClanWarTracker, painted to completion"""
+
+    backend = 'tk'
+
+    def __init__(self, model, path):
+        import clan_war_tracker
+        # Dialogs would block the run; the suite only needs the work they report on
+        clan_war_tracker.messagebox.showinfo = lambda *args, **kwargs: None
+        self.app = app = clan_war_tracker.ClanWarTracker()
+        app.root.withdraw()
+        app.autosave_enabled.set(False)
+        app.ensure_roster_tab()
+        app.show_model(model)
+        self.settle()
+        super().__init__(model, path)
+
+    def settle(self):
+        """Run the event loop until file work and repaints are finished"""
+        app = self.app
+        app.root.update()
+        while app.file_worker.tasks or app.save_in_flight or app.refresh_scheduler.pending:
+            time.sleep(0.001)
+            app.root.update()
+        app.root.update_idletasks()
+
+    def add_participant(self):
+        entry = self.app.participant_entry
+        for _ in range(ADDS):
+            self.added += 1
+            entry.delete(0, 'end')
+            entry.insert(0, f"New Player {self.added:06d}")
+            self.app.add_participant()
+        self.settle()
+
+    def update_attendance(self):
+        app, rng = self.app, self.rng
+        size, length = len(app.participants), app.model.war_length
+        for _ in range(TOGGLES):
+            index, day = rng.randrange(size), rng.randrange(length)
+            app.update_attendance(index, day, not app.participants[index].attended(day))
+        app.root.update_idletasks()
+
+    def refresh_attendance_grid(self):
+        self.app.refresh_attendance_grid()
+        self.app.root.update_idletasks()
+
+    def refresh_squad_details(self):
+        app = self.app
+        app.squad_listbox.selection_clear(0, 'end')
+        app.squad_listbox.selection_set(0)
+        app.refresh_squad_details()
+        app.root.update_idletasks()
+
+    def generate_equal_results(self):
+        self.app.model.invalidate_results()
+        self.app.generate_equal_results()
+
+    def generate_ranked_results(self):
+        self.app.model.invalidate_results()
+        self.app.generate_ranked_results()
+
+    def save_data(self):
+        app = self.app
+        if app.journal is None or app.journal.snapshot_path != self.path:
+            app.close_journal()
+            app.journal = app.open_journal(WarJournal(self.path))
+        app.request_save()
+        self.settle()
+
+    def load_specific_file(self):
+        self.app.load_specific_file(self.path)
+        self.settle()
+
+    def close(self):
+        self.app.close_journal()
+        self.settle()
+        self.app.file_worker.shutdown()
+        self.app.root.destroy()
+
+
+# load_specific_file replaces the open war, so it runs last
+OPERATIONS = ['add_participant', 'update_attendance', 'refresh_attendance_grid', 'refresh_squad_details',
+              'generate_equal_results', 'generate_ranked_results', 'save_data', 'load_specific_file']
+
+
+def display_available():
+    """True if Tk can open a window here"""
+    try:
+        import tkinter
+        root = tkinter.Tk()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+
+def best_time(func):
+    """Best of REPEATS runs in milliseconds"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(func):
+    """Peak traced memory of one run in MB"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes, backends, folder):
+    """Run every case; return {case key: {'ms': ..., 'peak_mb': ...}}"""
+    results = {}
+    print(f"{'Case':<64} {'Time':>10} {'Peak':>9}")
+    for size in sizes:
+        for length in WAR_LENGTHS:
+            for squads in SQUAD_COUNTS:
+                for backend in backends:
+                    path = os.path.join(folder, f"war_{size}_{length}_{squads}.json")
+                    cases = backend(make_war(size, length, squads), path)
+                    try:
+                        for operation in OPERATIONS:
+                            run = getattr(cases, operation, None)
+                            if run is None:
+                                continue
+                            key = f"{cases.backend}/{operation}/{size}p/{length}d/{squads}sq"
+                            ms = best_time(run)
+                            peak = peak_memory(run)
+                            results[key] = {'ms': round(ms, 3), 'peak_mb': round(peak, 3)}
+                            print(f"{key:<64} {ms:>8.1f}ms {peak:>7.2f}MB")
+                    finally:
+                        cases.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Cases that got slower or hungrier than the baseline allows, and cases it has no entry for
+
+    Returns (regressions as report lines, keys missing from the baseline).
+    """
+    regressions = []
+    missing = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            missing.append(key)
+            continue
+        time_threshold, min_delta_ms = threshold, MIN_DELTA_MS
+        if key.split('/')[1] in IO_OPERATIONS:
+            time_threshold, min_delta_ms = max(threshold, IO_THRESHOLD), IO_MIN_DELTA_MS
+        if result['ms'] > before['ms'] * time_threshold and result['ms'] - before['ms'] > min_delta_ms:
+            regressions.append(f"{key}: {before['ms']:.1f}ms -> {result['ms']:.1f}ms")
+        if (result['peak_mb'] > before['peak_mb'] * threshold
+                and result['peak_mb'] - before['peak_mb'] > MIN_DELTA_MB):
+            regressions.append(f"{key}: {before['peak_mb']:.2f}MB -> {result['peak_mb']:.2f}MB")
+    return regressions, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the tracker's hot paths against a stored baseline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="roster sizes to build")
+    parser.add_argument('--backend', choices=['model', 'tk', 'all'], default='model',
+                        help="run headless model cases (default), Tk cases (needs a display) or both")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON to compare with or save to")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="record these results as the baseline instead of comparing")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f"allowed ratio over the baseline (default {THRESHOLD})")
+    parser.add_argument('--output', help="also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    backends = []
+    if args.backend in ('model', 'all'):
+        backends.append(ModelCases)
+    if args.backend in ('tk', 'all'):
+        if display_available():
+            backends.append(TkCases)
+        else:
+            print("No display: Tk cases skipped (run under Xvfb to include them)")
+    if not backends:
+        return 1
+
+    # The tracker reads and writes its helper files in the working directory
+    start_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            results = run_suite(args.sizes, backends, folder)
+        finally:
+            os.chdir(start_dir)
+
+    report = {'python': platform.python_version(), 'machine': platform.platform(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        # Cases not run this time (other sizes or backends) keep their old baseline
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f)['results']
+            saved.update(results)
+            report['results'] = dict(sorted(saved.items()))
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline} ({len(report['results'])} cases)")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions, missing = compare(results, baseline, args.threshold)
+    compared = len(results) - len(missing)
+    if regressions:
+        print(f"\n{len(regressions)} REGRESSION(S) against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+    if missing:
+        # A case without a baseline entry is not guarded at all, so say so loudly
+        print(f"\n{len(missing)} case(s) have no entry in {args.baseline}:")
+        for key in missing:
+            print(f"  {key}")
+        print("Record them with --save-baseline (Tk cases under xvfb-run) and commit the baseline")
+    if regressions or missing:
+        return 1
+    print(f"\nNo regressions in {compared} cases compared with {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Attendance toggle benchmark
+
+Times a checkbox click (ClanWarTracker.update_attendance) on rosters of
+increasing size and fails if the cost of a click grows with the roster.
+Needs a display (run under Xvfb on headless machines).
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from clan_war_engine import mask_from_list
+from clan_war_tracker import ClanWarTracker
+
+SIZES = [100, 1000, 10000]
+CLICKS = 2000
+MAX_GROWTH = 3.0
+
+
+def build_tracker(size):
+    """Create a withdrawn tracker with a synthetic roster"""
+    app = ClanWarTracker()
+    app.root.withdraw()
+    for i in range(size):
+        participant = app.model.add_participant(f"Player {i:05d}")
+        participant.mask = mask_from_list([i % (day + 2) == 0 for day in range(14)])
+    app.refresh_attendance_grid()
+    app.root.update()
+    return app
+
+
+def time_clicks(app):
+    """Return the mean cost of one click in microseconds"""
+    size = len(app.participants)
+    start = time.perf_counter()
+    for i in range(CLICKS):
+        index = (i * 7919) % size
+        day = i % 14
+        app.update_attendance(index, day, not app.participants[index].attended(day))
+    app.root.update_idletasks()
+    return (time.perf_counter() - start) / CLICKS * 1e6
+
+
+def main():
+    # Keep the auto-reload of a real last_saved_file.txt out of the run
+    os.chdir(tempfile.mkdtemp())
+    
+    results = []
+    for size in SIZES:
+        app = build_tracker(size)
+        cost = time_clicks(app)
+        app.root.destroy()
+        results.append(cost)
+        print(f"{size:>7} participants: {cost:8.1f} us per click")
+    
+    growth = max(results) / min(results)
+    print(f"Growth from {SIZES[0]} to {SIZES[-1]} participants: {growth:.2f}x")
+    if growth > MAX_GROWTH:
+        print(f"FAIL: click cost grows with roster size (limit {MAX_GROWTH}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - War History Archive
+Stores many wars in one SQLite database (stdlib sqlite3) with tables for
+wars, players, participants, daily attendance, squads and payouts, so
+questions like "how many wars did X attend this year" are one indexed
+query instead of opening every war file. Per-player leaderboard totals
+(days, wars, payout, streaks) are kept in their own tables and updated as
+each war is stored, so a lifetime or season top-K never rescans history.
+
+Usage:
+    python clan_war_archive.py import ARCHIVE.db WARS [WARS ...]
+    python clan_war_archive.py list ARCHIVE.db
+    python clan_war_archive.py player ARCHIVE.db NAME [--year YYYY]
+    python clan_war_archive.py leaderboard ARCHIVE.db [--by days|wars|payout|streak|best_streak]
+                                           [--top K] [--season YYYY]
+Created by Nex Clan
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from clan_war_batch import collect_war_files
+from clan_war_binary import BINARY_EXTENSION
+from clan_war_engine import DATE_FORMAT, Participant, Squad, WarModel, load_war
+from clan_war_stream import is_archive, iter_wars
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wars (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    start_date TEXT,
+    end_date TEXT,
+    war_dates TEXT NOT NULL,
+    prize_pool REAL NOT NULL,
+    prize_mode TEXT NOT NULL,
+    ranked_prizes TEXT NOT NULL,
+    participants INTEGER NOT NULL,
+    saved_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS participants (
+    war_id INTEGER NOT NULL REFERENCES wars(id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    position INTEGER NOT NULL,
+    pid INTEGER,
+    class_icon TEXT,
+    mask BLOB NOT NULL,
+    total_days INTEGER NOT NULL,
+    PRIMARY KEY (war_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS attendance (
+    war_id INTEGER NOT NULL REFERENCES wars(id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    day INTEGER NOT NULL,
+    date TEXT,
+    PRIMARY KEY (war_id, player_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS squads (
+    id INTEGER PRIMARY KEY,
+    war_id INTEGER NOT NULL REFERENCES wars(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS squad_members (
+    squad_id INTEGER NOT NULL REFERENCES squads(id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (squad_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS payouts (
+    war_id INTEGER NOT NULL REFERENCES wars(id) ON DELETE CASCADE,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    rank INTEGER,
+    label TEXT,
+    payout REAL NOT NULL,
+    PRIMARY KEY (war_id, player_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS wars_by_start ON wars(start_date);
+CREATE INDEX IF NOT EXISTS participants_by_player ON participants(player_id, war_id);
+CREATE INDEX IF NOT EXISTS attendance_by_player ON attendance(player_id, date);
+CREATE INDEX IF NOT EXISTS attendance_by_date ON attendance(date);
+CREATE INDEX IF NOT EXISTS squads_by_war ON squads(war_id);
+CREATE INDEX IF NOT EXISTS squad_members_by_player ON squad_members(player_id);
+CREATE INDEX IF NOT EXISTS payouts_by_player ON payouts(player_id, war_id);
+
+-- Leaderboard aggregates, kept up to date as wars are stored and deleted.
+-- A streak counts consecutive wars (by start date) with at least one day
+-- attended; it is current while last_war is the newest war.
+CREATE TABLE IF NOT EXISTS player_stats (
+    player_id INTEGER PRIMARY KEY REFERENCES players(id),
+    wars INTEGER NOT NULL DEFAULT 0,
+    days INTEGER NOT NULL DEFAULT 0,
+    payout REAL NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    previous_best INTEGER NOT NULL DEFAULT 0,
+    last_war INTEGER
+);
+CREATE TABLE IF NOT EXISTS season_stats (
+    season TEXT NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    wars INTEGER NOT NULL DEFAULT 0,
+    days INTEGER NOT NULL DEFAULT 0,
+    payout REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (season, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leaderboard_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+);
+CREATE INDEX IF NOT EXISTS stats_by_days ON player_stats(days DESC, player_id);
+CREATE INDEX IF NOT EXISTS stats_by_wars ON player_stats(wars DESC, player_id);
+CREATE INDEX IF NOT EXISTS stats_by_payout ON player_stats(payout DESC, player_id);
+CREATE INDEX IF NOT EXISTS stats_by_best_streak ON player_stats(best_streak DESC, player_id);
+CREATE INDEX IF NOT EXISTS stats_by_streak ON player_stats(last_war, streak DESC, player_id);
+CREATE INDEX IF NOT EXISTS season_by_days ON season_stats(season, days DESC, player_id);
+CREATE INDEX IF NOT EXISTS season_by_wars ON season_stats(season, wars DESC, player_id);
+CREATE INDEX IF NOT EXISTS season_by_payout ON season_stats(season, payout DESC, player_id);
+"""
+
+# Leaderboard metrics; the current streak and best streak are lifetime only
+METRICS = ('days', 'wars', 'payout', 'streak', 'best_streak')
+SEASON_METRICS = ('days', 'wars', 'payout')
+
+# Add (sign 1) or remove (sign -1) one war's totals; wars count only days attended
+ADD_STATS = (
+    "INSERT INTO player_stats (player_id, wars, days, payout) "
+    "SELECT p.player_id, :sign * (p.total_days > 0), :sign * p.total_days, :sign * COALESCE(pay.payout, 0) "
+    "FROM participants p LEFT JOIN payouts pay ON pay.war_id = p.war_id AND pay.player_id = p.player_id "
+    "WHERE p.war_id = :war "
+    "ON CONFLICT (player_id) DO UPDATE SET wars = wars + excluded.wars, days = days + excluded.days, "
+    "payout = payout + excluded.payout")
+ADD_SEASON_STATS = (
+    "INSERT INTO season_stats (season, player_id, wars, days, payout) "
+    "SELECT substr(w.start_date, 1, 4), p.player_id, :sign * (p.total_days > 0), :sign * p.total_days, "
+    ":sign * COALESCE(pay.payout, 0) "
+    "FROM wars w JOIN participants p ON p.war_id = w.id "
+    "LEFT JOIN payouts pay ON pay.war_id = p.war_id AND pay.player_id = p.player_id "
+    "WHERE w.id = :war AND w.start_date IS NOT NULL "
+    "ON CONFLICT (season, player_id) DO UPDATE SET wars = wars + excluded.wars, "
+    "days = days + excluded.days, payout = payout + excluded.payout")
+
+
+def mask_to_blob(mask, length):
+    """Attendance mask as little-endian bytes (masks of wars over 63 days overflow SQLite INTEGER)"""
+    return mask.to_bytes(max(1, (max(length, mask.bit_length()) + 7) // 8), 'little')
+
+
+def blob_to_mask(value):
+    """Attendance mask from its stored form (archives written before BLOB masks hold integers)"""
+    return value if isinstance(value, int) else int.from_bytes(value, 'little')
+
+
+def iso_date(date):
+    """Convert a war date (MM/DD/YYYY) to ISO format for range queries, None if unparseable"""
+    try:
+        return datetime.strptime(date, DATE_FORMAT).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+class WarArchive:
+    """SQLite store of many wars
+
+    A connection belongs to the thread that opened it, so background work
+    should open its own WarArchive.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")  # WAL stays consistent; a power cut can only lose the last commit
+        self.connection.executescript(SCHEMA)
+        if self.state('built') is None:
+            self.rebuild_leaderboard()
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Writing
+    def player_ids(self, names):
+        """Map player names to IDs, adding new players"""
+        names = list(dict.fromkeys(names))
+        self.connection.executemany("INSERT OR IGNORE INTO players (name) VALUES (?)",
+                                    ((name,) for name in names))
+        ids = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            rows = self.connection.execute(
+                f"SELECT name, id FROM players WHERE name IN ({','.join('?' * len(chunk))})", chunk)
+            ids.update(rows)
+        return ids
+
+    def save_war(self, model, name):
+        """Store a war under name, replacing any war with that name; return its ID"""
+        with self.connection:
+            return self.store_war(model, name)
+
+    def save_wars(self, wars):
+        """Store (name, model) pairs in one transaction; return how many were stored"""
+        count = 0
+        with self.connection:
+            for name, model in wars:
+                self.store_war(model, name)
+                count += 1
+        return count
+
+    def store_war(self, model, name):
+        """Insert a war inside the caller's transaction"""
+        dates = [iso_date(date) for date in model.war_dates]
+        if model.prize_mode == "ranked":
+            results = model.calculate_ranked_payouts()
+        else:
+            results = [(participant, None, None, payout) for participant, payout in model.calculate_payouts()]
+
+        replaced = self.connection.execute("SELECT id FROM wars WHERE name = ?", (name,)).fetchone()
+        if replaced:
+            self.remove_from_leaderboard(replaced[0])
+        self.connection.execute("DELETE FROM wars WHERE name = ?", (name,))
+        war_id = self.connection.execute(
+            "INSERT INTO wars (name, start_date, end_date, war_dates, prize_pool, prize_mode, "
+            "ranked_prizes, participants, saved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, dates[0] if dates else None, dates[-1] if dates else None,
+             json.dumps(model.war_dates), model.prize_pool, model.prize_mode,
+             json.dumps(model.ranked_prizes), len(model.participants),
+             time.strftime("%Y-%m-%d %H:%M:%S"))).lastrowid
+
+        members = [member for squad in model.squads for member in squad.members]
+        players = self.player_ids([participant.name for participant in model.participants] + members)
+
+        self.connection.executemany(
+            "INSERT INTO participants (war_id, player_id, position, pid, class_icon, mask, total_days) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((war_id, players[participant.name], position, participant.pid, participant.class_icon,
+              mask_to_blob(participant.mask, len(dates)), participant.total_days)
+             for position, participant in enumerate(model.participants)))
+
+        self.connection.executemany(
+            "INSERT INTO attendance (war_id, player_id, day, date) VALUES (?, ?, ?, ?)",
+            ((war_id, players[participant.name], day, dates[day])
+             for participant in model.participants
+             for day in range(len(dates)) if participant.mask >> day & 1))
+
+        for position, squad in enumerate(model.squads):
+            squad_id = self.connection.execute(
+                "INSERT INTO squads (war_id, position, name) VALUES (?, ?, ?)",
+                (war_id, position, squad.name)).lastrowid
+            self.connection.executemany(
+                "INSERT INTO squad_members (squad_id, player_id, position) VALUES (?, ?, ?)",
+                ((squad_id, players[member], index) for index, member in enumerate(squad.members)))
+
+        self.connection.executemany(
+            "INSERT INTO payouts (war_id, player_id, rank, label, payout) VALUES (?, ?, ?, ?, ?)",
+            ((war_id, players[participant.name], rank, label, payout)
+             for participant, rank, label, payout in results))
+        self.add_to_leaderboard(war_id)
+        return war_id
+
+    def delete_war(self, war_id):
+        """Remove a war and everything stored with it"""
+        with self.connection:
+            self.remove_from_leaderboard(war_id)
+            self.connection.execute("DELETE FROM wars WHERE id = ?", (war_id,))
+
+    # Leaderboard upkeep - O(war size) per stored war instead of rescanning history
+    def newest_wars(self, limit=2):
+        """IDs of the newest wars by start date"""
+        return [war_id for war_id, in self.connection.execute(
+            "SELECT id FROM wars ORDER BY start_date DESC, id DESC LIMIT ?", (limit,))]
+
+    def state(self, key):
+        """Read a leaderboard bookkeeping value"""
+        row = self.connection.execute("SELECT value FROM leaderboard_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key, value):
+        """Write a leaderboard bookkeeping value"""
+        self.connection.execute("INSERT OR REPLACE INTO leaderboard_state (key, value) VALUES (?, ?)",
+                                (key, value))
+
+    def add_to_leaderboard(self, war_id):
+        """Fold a just-stored war into the player aggregates
+
+        Totals are always updated in place. Streaks are extended in place
+        when the war is the newest one; a war stored out of date order
+        marks them stale and they are rebuilt on the next read.
+        """
+        self.connection.execute(ADD_STATS, {'sign': 1, 'war': war_id})
+        self.connection.execute(ADD_SEASON_STATS, {'sign': 1, 'war': war_id})
+
+        newest = self.newest_wars()
+        if self.state('streaks_stale') or newest[0] != war_id:
+            self.set_state('streaks_stale', 1)
+            return
+        previous = newest[1] if len(newest) > 1 else None
+        self.connection.execute(
+            "UPDATE player_stats SET previous_best = best_streak, "
+            "streak = CASE WHEN last_war IS :previous THEN streak + 1 ELSE 1 END, "
+            "best_streak = max(best_streak, CASE WHEN last_war IS :previous THEN streak + 1 ELSE 1 END), "
+            "last_war = :war "
+            "WHERE player_id IN (SELECT player_id FROM participants WHERE war_id = :war AND total_days > 0)",
+            {'previous': previous, 'war': war_id})
+        self.set_state('undo_war', war_id)
+
+    def remove_from_leaderboard(self, war_id):
+        """Take a war that is about to be deleted out of the player aggregates
+
+        Replacing the newest war (saving the same war again) rolls its
+        streaks back in place; anything else marks streaks stale.
+        """
+        self.connection.execute(ADD_STATS, {'sign': -1, 'war': war_id})
+        self.connection.execute(ADD_SEASON_STATS, {'sign': -1, 'war': war_id})
+
+        newest = self.newest_wars()
+        if self.state('streaks_stale') or self.state('undo_war') != war_id or newest[0] != war_id:
+            self.set_state('streaks_stale', 1)
+            return
+        previous = newest[1] if len(newest) > 1 else None
+        self.connection.execute(
+            "UPDATE player_stats SET streak = streak - 1, best_streak = previous_best, last_war = ? "
+            "WHERE last_war = ?", (previous, war_id))
+        self.set_state('undo_war', None)
+
+    def rebuild_streaks(self):
+        """Recompute every streak from the stored wars in one ordered scan"""
+        wars = list(reversed(self.newest_wars(-1)))  # oldest first
+        order = {war_id: index for index, war_id in enumerate(wars)}
+        attended = {}
+        for player_id, war_id in self.connection.execute(
+                "SELECT player_id, war_id FROM participants WHERE total_days > 0"):
+            attended.setdefault(player_id, []).append(order[war_id])
+
+        rows = []
+        for player_id, indexes in attended.items():
+            indexes.sort()
+            streak = best = 0
+            last = None
+            for index in indexes:
+                streak = streak + 1 if last is not None and index == last + 1 else 1
+                best = max(best, streak)
+                last = index
+            rows.append((streak, best, best, wars[last], player_id))
+
+        self.connection.execute("UPDATE player_stats SET streak = 0, best_streak = 0, last_war = NULL")
+        self.connection.executemany("UPDATE player_stats SET streak = ?, best_streak = ?, previous_best = ?, "
+                                    "last_war = ? WHERE player_id = ?", rows)
+        self.set_state('streaks_stale', 0)
+        self.set_state('undo_war', None)  # The newest war's streaks can no longer be rolled back in place
+
+    def rebuild_leaderboard(self):
+        """Recompute all leaderboard aggregates from scratch (archives made before the leaderboard existed)"""
+        with self.connection:
+            self.connection.execute("DELETE FROM player_stats")
+            self.connection.execute("DELETE FROM season_stats")
+            for war_id, in self.connection.execute("SELECT id FROM wars").fetchall():
+                self.connection.execute(ADD_STATS, {'sign': 1, 'war': war_id})
+                self.connection.execute(ADD_SEASON_STATS, {'sign': 1, 'war': war_id})
+            self.rebuild_streaks()
+            self.set_state('built', 1)
+
+    def import_files(self, filenames):
+        """Import JSON or binary war files (season archives war by war); return (wars, participants)"""
+        totals = {'wars': 0, 'participants': 0}
+
+        def wars():
+            for filename in filenames:
+                base = os.path.splitext(os.path.basename(filename))[0]
+                if not filename.endswith(BINARY_EXTENSION) and is_archive(filename):
+                    models = ((f"{base} [war {index + 1}]", model)
+                              for index, model in enumerate(iter_wars(filename)))
+                else:
+                    models = [(base, load_war(filename))]
+                for name, model in models:
+                    totals['wars'] += 1
+                    totals['participants'] += len(model.participants)
+                    yield name, model
+
+        self.save_wars(wars())
+        return totals['wars'], totals['participants']
+
+    # Reading
+    def list_wars(self):
+        """(id, name, start date, end date, participants) for every war, newest first"""
+        return self.connection.execute(
+            "SELECT id, name, start_date, end_date, participants FROM wars "
+            "ORDER BY start_date DESC, id DESC").fetchall()
+
+    def load_war(self, war_id):
+        """Rebuild a stored war as a WarModel"""
+        row = self.connection.execute(
+            "SELECT war_dates, prize_pool, prize_mode, ranked_prizes FROM wars WHERE id = ?",
+            (war_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No war with ID {war_id} in the archive")
+        war_dates, prize_pool, prize_mode, ranked_prizes = row
+
+        model = WarModel()
+        model.participants = [
+            Participant(name, blob_to_mask(mask), class_icon, pid=pid)
+            for name, mask, class_icon, pid in self.connection.execute(
+                "SELECT pl.name, p.mask, p.class_icon, p.pid "
+                "FROM participants p JOIN players pl ON pl.id = p.player_id "
+                "WHERE p.war_id = ? ORDER BY p.position", (war_id,))]
+
+        squads = {}
+        for squad_id, name in self.connection.execute(
+                "SELECT id, name FROM squads WHERE war_id = ? ORDER BY position", (war_id,)):
+            squads[squad_id] = Squad(name)
+        for squad_id, member in self.connection.execute(
+                "SELECT m.squad_id, pl.name FROM squad_members m JOIN squads s ON s.id = m.squad_id "
+                "JOIN players pl ON pl.id = m.player_id WHERE s.war_id = ? ORDER BY m.squad_id, m.position",
+                (war_id,)):
+            squads[squad_id].members[member] = None
+        model.squads = list(squads.values())
+
+        model.update_settings({
+            'prize_pool': prize_pool,
+            'war_dates': json.loads(war_dates),
+            'prize_mode': prize_mode,
+            'ranked_prizes': json.loads(ranked_prizes)
+        })
+        model.reindex()
+        return model
+
+    # Cross-war queries
+    def player_summary(self, name, start_date=None, end_date=None):
+        """Wars, days attended and total payout for a player, optionally within ISO dates"""
+        row = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(p.total_days), 0), COALESCE(SUM(pay.payout), 0) "
+            "FROM players pl JOIN participants p ON p.player_id = pl.id "
+            "JOIN wars w ON w.id = p.war_id "
+            "LEFT JOIN payouts pay ON pay.war_id = p.war_id AND pay.player_id = p.player_id "
+            "WHERE pl.name = ? AND p.total_days > 0 "
+            "AND (? IS NULL OR w.start_date >= ?) AND (? IS NULL OR w.start_date <= ?)",
+            (name, start_date, start_date, end_date, end_date)).fetchone()
+        return {'wars': row[0], 'days': row[1], 'payout': row[2]}
+
+    def days_attended(self, name, start_date=None, end_date=None):
+        """Days a player was present between ISO dates (inclusive)"""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM attendance a JOIN players pl ON pl.id = a.player_id "
+            "WHERE pl.name = ? AND (? IS NULL OR a.date >= ?) AND (? IS NULL OR a.date <= ?)",
+            (name, start_date, start_date, end_date, end_date)).fetchone()[0]
+
+    def attendance_on(self, date):
+        """Names of players present on an ISO date"""
+        return [name for name, in self.connection.execute(
+            "SELECT pl.name FROM attendance a JOIN players pl ON pl.id = a.player_id "
+            "WHERE a.date = ? ORDER BY pl.name", (date,))]
+
+
+    # Leaderboard
+    def seasons(self):
+        """Seasons (years) with stored wars, newest first"""
+        return [season for season, in self.connection.execute(
+            "SELECT DISTINCT substr(start_date, 1, 4) FROM wars WHERE start_date IS NOT NULL "
+            "ORDER BY 1 DESC")]
+
+    def leaderboard(self, metric='days', limit=10, season=None):
+        """Top players by a metric, as (place, name, wars, days, payout, streak, best streak) rows
+
+        Reads the materialized aggregates through an index, so the cost
+        depends on limit, not on how many players or wars are stored.
+        Season boards cover wars starting in that year and carry no streaks.
+        """
+        if metric not in (SEASON_METRICS if season else METRICS):
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+
+        if season:
+            rows = self.connection.execute(
+                f"SELECT pl.name, s.wars, s.days, s.payout, NULL, NULL FROM season_stats s "
+                f"JOIN players pl ON pl.id = s.player_id "
+                f"WHERE s.season = ? AND +s.wars > 0 ORDER BY s.{metric} DESC, s.player_id LIMIT ?",
+                (str(season), limit))
+        else:
+            if self.state('streaks_stale'):
+                with self.connection:
+                    self.rebuild_streaks()
+            newest = self.newest_wars(1)
+            newest = newest[0] if newest else None
+            current = "CASE WHEN s.last_war = :newest THEN s.streak ELSE 0 END"
+            if metric == 'streak':
+                where, order = "s.last_war = :newest", "s.last_war, s.streak DESC, s.player_id"
+            else:
+                where, order = "+s.wars > 0", f"s.{metric} DESC, s.player_id"  # '+' keeps the sort index in use
+            rows = self.connection.execute(
+                f"SELECT pl.name, s.wars, s.days, s.payout, {current}, s.best_streak FROM player_stats s "
+                f"JOIN players pl ON pl.id = s.player_id WHERE {where} ORDER BY {order} LIMIT :limit",
+                {'newest': newest, 'limit': limit})
+        return [(place,) + tuple(row) for place, row in enumerate(rows, 1)]
+
+
+def format_leaderboard(rows, season=None):
+    """Leaderboard rows as a text table"""
+    lines = [f"{'#':>4}  {'Player':<24} {'Wars':>5} {'Days':>6} {'Payout':>14}"
+             + ("" if season else f" {'Streak':>6} {'Best':>5}")]
+    for place, name, wars, days, payout, streak, best in rows:
+        line = f"{place:>4}  {name:<24} {wars:>5} {days:>6} {'$' + format(payout, ',.2f'):>14}"
+        lines.append(line if season else line + f" {streak:>6} {best:>5}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run the archive command line"""
+    parser = argparse.ArgumentParser(description="Clan war history archive")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="import war files")
+    import_parser.add_argument('archive')
+    import_parser.add_argument('wars', nargs='+', help="war files, directories or glob patterns")
+
+    list_parser = commands.add_parser('list', help="list stored wars")
+    list_parser.add_argument('archive')
+
+    player_parser = commands.add_parser('player', help="summarize one player across wars")
+    player_parser.add_argument('archive')
+    player_parser.add_argument('name')
+    player_parser.add_argument('--year', type=int, help="only wars starting in this year")
+
+    leaderboard_parser = commands.add_parser('leaderboard', help="top players across all wars")
+    leaderboard_parser.add_argument('archive')
+    leaderboard_parser.add_argument('--by', choices=METRICS, default='days', help="ranking metric")
+    leaderboard_parser.add_argument('--top', type=int, default=10, help="players to show")
+    leaderboard_parser.add_argument('--season', help="only wars starting in this year")
+    args = parser.parse_args(argv)
+    if args.command == 'leaderboard' and args.season and args.by not in SEASON_METRICS:
+        parser.error("streaks are only ranked across all seasons")
+
+    with WarArchive(args.archive) as archive:
+        if args.command == 'import':
+            files = collect_war_files(args.wars)
+            start = time.perf_counter()
+            wars, participants = archive.import_files(files)
+            print(f"Imported {wars} wars ({participants} participants) from {len(files)} files "
+                  f"in {time.perf_counter() - start:.2f}s")
+        elif args.command == 'list':
+            for war_id, name, start_date, end_date, count in archive.list_wars():
+                print(f"{war_id:>6}  {name:<30} {start_date or '?':>10} - {end_date or '?':<10} {count:>6} players")
+        elif args.command == 'leaderboard':
+            start = time.perf_counter()
+            rows = archive.leaderboard(args.by, args.top, args.season)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(format_leaderboard(rows, args.season))
+            print(f"({elapsed:.1f}ms)")
+        else:
+            start_date = end_date = None
+            if args.year:
+                start_date, end_date = f"{args.year}-01-01", f"{args.year}-12-31"
+            start = time.perf_counter()
+            summary = archive.player_summary(args.name, start_date, end_date)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{args.name}: {summary['wars']} wars, {summary['days']} days, "
+                  f"${summary['payout']:,.2f} paid ({elapsed:.1f}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Batch Payout Calculator
+Computes equal or ranked payouts for many saved war files in parallel and
+writes one consolidated report.
+
+Usage:
+    python clan_war_batch.py WARS [WARS ...] [--mode equal|ranked]
+                             [--output REPORT] [--workers N]
+
+WARS may be war files, directories (every *.json and *.nxwar inside) or glob
+patterns. Season archives holding several wars are streamed war by war.
+Created by Nex Clan
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from clan_war_binary import BINARY_EXTENSION
+from clan_war_engine import load_war
+from clan_war_stream import is_archive, iter_wars
+
+
+def collect_war_files(paths):
+    """Expand files, directories and glob patterns into a sorted list of war files"""
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files.update(glob.glob(os.path.join(path, "*.json")))
+            files.update(glob.glob(os.path.join(path, "*" + BINARY_EXTENSION)))
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            files.update(p for p in glob.glob(path) if os.path.isfile(p))
+    return sorted(files)
+
+
+def war_result(filename, model, mode):
+    """Results for one loaded war"""
+    if mode:
+        model.set_prize_mode(mode)
+
+    return {
+        'filename': filename,
+        'participants': len(model.participants),
+        'report': model.generate_export_results(),
+        'payouts': [(participant.name, participant.total_days, payout)
+                    for participant, payout in model.calculate_payouts()],
+        'error': None
+    }
+
+
+def process_war_file(job):
+    """Compute the results for every war in one file (runs in a worker process)"""
+    filename, mode = job
+    try:
+        if not filename.endswith(BINARY_EXTENSION) and is_archive(filename):
+            # One war in memory at a time
+            return [war_result(f"{filename} [war {index + 1}]", model, mode)
+                    for index, model in enumerate(iter_wars(filename))]
+        return [war_result(filename, load_war(filename), mode)]
+    except Exception as e:
+        return [{
+            'filename': filename,
+            'participants': 0,
+            'report': "",
+            'payouts': [],
+            'error': str(e)
+        }]
+
+
+def build_report(results):
+    """Build the consolidated report text"""
+    lines = []
+    lines.append("NEX CLAN WAR TRACKER - BATCH PAYOUT REPORT")
+    lines.append("=" * 60)
+    lines.append(f"Generated: {time.strftime('%m/%d/%Y %H:%M:%S')}")
+    lines.append(f"Wars: {len(results)}")
+    lines.append("")
+
+    # Season totals per player
+    totals = {}
+    for result in results:
+        for name, days, payout in result['payouts']:
+            wars, total_days, total_payout = totals.get(name, (0, 0, 0.0))
+            totals[name] = (wars + 1, total_days + days, total_payout + payout)
+
+    lines.append("SEASON TOTALS")
+    lines.append("-" * 60)
+    lines.append(f"{'Player':<25} {'Wars':>5} {'Days':>6}  {'Payout':>15}")
+    for name, (wars, days, payout) in sorted(totals.items(), key=lambda item: (-item[1][2], item[0])):
+        lines.append(f"{name:<25} {wars:>5} {days:>6}  ${payout:>14,.2f}")
+    lines.append("")
+
+    # Individual wars
+    for result in results:
+        lines.append("#" * 60)
+        lines.append(f"FILE: {result['filename']}")
+        if result['error']:
+            lines.append(f"ERROR: {result['error']}")
+        else:
+            lines.append(result['report'])
+        lines.append("")
+
+    lines.append("Created by Nex Clan")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run the batch calculator"""
+    parser = argparse.ArgumentParser(description="Compute payouts for many clan war files")
+    parser.add_argument('wars', nargs='+', help="war files, directories or glob patterns")
+    parser.add_argument('--mode', choices=['equal', 'ranked'],
+                        help="prize mode to use (default: the mode saved in each file)")
+    parser.add_argument('--output', default="batch_report.txt", help="consolidated report file")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    files = collect_war_files(args.wars)
+    if not files:
+        print("No war files found.", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    jobs = [(filename, args.mode) for filename in files]
+    chunksize = max(1, len(jobs) // ((args.workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = [result for file_results in executor.map(process_war_file, jobs, chunksize=chunksize)
+                   for result in file_results]
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, 'w') as f:
+        f.write(build_report(results))
+
+    failed = [result for result in results if result['error']]
+    participants = sum(result['participants'] for result in results)
+    elapsed = max(elapsed, 1e-9)
+
+    print(f"Processed {len(results)} wars from {len(files)} files ({participants} participants) in {elapsed:.3f}s")
+    print(f"Throughput: {len(files) / elapsed:,.1f} files/s, {participants / elapsed:,.1f} participants/s")
+    for result in failed:
+        print(f"Failed: {result['filename']}: {result['error']}", file=sys.stderr)
+    print(f"Report written to {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
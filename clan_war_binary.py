@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Compact Binary War Format
+An alternative to the JSON save format for large or archived wars: a fixed
+header, one interned string table, fixed-width numeric columns and
+attendance packed as bitsets. Files start with the NXCW magic bytes, so
+loaders can tell them apart from JSON.
+
+Usage (convert either way, the target format follows the extension):
+    python clan_war_binary.py war.json war.nxwar
+    python clan_war_binary.py war.nxwar war.json
+Created by Nex Clan
+"""
+
+import struct
+import sys
+from array import array
+
+MAGIC = b"NXCW"
+VERSION = 1
+BINARY_EXTENSION = ".nxwar"
+
+# magic, version, flags, days, participants, class icons, squads, squad
+# members, ranked prizes, string table bytes, prize pool, journal seq, prize mode
+HEADER = struct.Struct("<4sHHHIHIIIIdQB")
+PRIZE_MODES = ("equal", "ranked")
+
+# Optional columns, omitted when they carry no information
+HAS_IDS = 1       # IDs are not simply 1..N
+HAS_RESULTS = 2   # some participant has a stored payout or rank
+
+# Attendance bitsets that fit a machine word are read as one array
+MASK_TYPECODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+def is_binary(head):
+    """True if head (the first bytes of a file) starts a binary war file"""
+    return head[:len(MAGIC)] == MAGIC
+
+
+def _column(typecode, values):
+    """Little-endian bytes for a column of fixed-width numbers"""
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_column(typecode, data, offset, count):
+    """Read a column written by _column, return (values, next offset)"""
+    column = array(typecode)
+    end = offset + column.itemsize * count
+    column.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, end
+
+
+def _mask_width(days):
+    """Bytes per packed attendance bitset"""
+    width = (days + 7) // 8
+    return width if width in MASK_TYPECODES or width > 8 else min(w for w in MASK_TYPECODES if w >= width)
+
+
+def encode_war(data):
+    """Encode save data (WarModel.to_dict format) into bytes
+
+    The string table holds participant names first, in roster order, so
+    names need no index column; class icons, dates, squad names and prize
+    labels follow, interned.
+    """
+    participants = data.get('participants', [])
+    war_dates = data.get('war_dates', [])
+    squads = data.get('squads', [])
+    ranked_prizes = data.get('ranked_prizes', [])
+    days = len(war_dates)
+    width = _mask_width(days)
+    day_bits = (1 << days) - 1
+
+    strings = {}
+    for participant in participants:
+        strings.setdefault(participant['name'], len(strings))
+    if len(strings) != len(participants):
+        raise ValueError("Participant names must be unique")
+
+    def intern(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    icons = {}
+    icon_column, masks, ids, payouts, ranks = [], [], [], [], []
+    for participant in participants:
+        icon = participant.get('class_icon')
+        icon_column.append(0 if icon is None else icons.setdefault(icon, len(icons) + 1))
+        mask = participant.get('mask')
+        if mask is None:
+            mask = 0
+            for day, present in enumerate(participant.get('attendance', [])):
+                if present:
+                    mask |= 1 << day
+        masks.append((mask & day_bits).to_bytes(width, "little"))
+        ids.append(participant.get('id') or 0)
+        payouts.append(participant.get('payout', 0.0))
+        ranks.append(participant.get('rank', 0))
+    icon_ids = [intern(icon) for icon in icons]
+
+    flags = 0
+    if ids != list(range(1, len(ids) + 1)):
+        flags |= HAS_IDS
+    if any(payouts) or any(ranks):
+        flags |= HAS_RESULTS
+
+    date_ids = [intern(date) for date in war_dates]
+
+    squad_names, squad_sizes, squad_members = [], [], []
+    for squad in squads:
+        squad_names.append(intern(squad['name']))
+        members = squad.get('members', [])
+        squad_sizes.append(len(members))
+        squad_members.extend(intern(member) for member in members)
+
+    prize_ranks = [prize['rank'] for prize in ranked_prizes]
+    prize_amounts = [int(prize['amount']) for prize in ranked_prizes]
+    prize_labels = [intern(prize['label']) for prize in ranked_prizes]
+
+    if any("\0" in text for text in strings):
+        raise ValueError("Text may not contain NUL characters")
+    table = "\0".join(strings).encode("utf-8")
+    mode = data.get('prize_mode', 'equal')
+
+    sections = [
+        HEADER.pack(MAGIC, VERSION, flags, days, len(participants), len(icons), len(squads),
+                    len(squad_members), len(ranked_prizes), len(table), float(data.get('prize_pool', 0.0)),
+                    data.get('journal_seq', 0), PRIZE_MODES.index(mode) if mode in PRIZE_MODES else 0),
+        table,
+        _column("I", icon_ids),
+        _column("H", icon_column),
+        b"".join(masks),
+    ]
+    if flags & HAS_IDS:
+        sections.append(_column("I", ids))
+    if flags & HAS_RESULTS:
+        sections.append(_column("d", payouts))
+        sections.append(_column("I", ranks))
+    sections += [
+        _column("I", date_ids),
+        _column("I", squad_names),
+        _column("I", squad_sizes),
+        _column("I", squad_members),
+        _column("I", prize_ranks),
+        _column("q", prize_amounts),
+        _column("I", prize_labels),
+    ]
+    return b"".join(sections)
+
+
+def decode_war(blob):
+    """Decode bytes written by encode_war into save data
+
+    Participants come back as 'participant_columns' - parallel lists of
+    names, masks, class icons, payouts, ranks and IDs - which
+    WarModel.update_from_dict turns into participants in one pass.
+    """
+    (magic, version, flags, days, count, icon_count, squad_count, member_count, prize_count,
+     table_size, prize_pool, journal_seq, mode) = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a binary war file")
+    if version > VERSION:
+        raise ValueError(f"Unsupported binary war file version {version}")
+
+    offset = HEADER.size
+    strings = bytes(blob[offset:offset + table_size]).decode("utf-8").split("\0")
+    offset += table_size
+
+    icon_ids, offset = _read_column("I", blob, offset, icon_count)
+    icon_column, offset = _read_column("H", blob, offset, count)
+    icon_table = [None] + [strings[icon] for icon in icon_ids]
+    icons = [icon_table[icon] for icon in icon_column] if icon_count else [None] * count
+
+    width = _mask_width(days)
+    if width in MASK_TYPECODES:
+        masks, offset = _read_column(MASK_TYPECODES[width], blob, offset, count)
+        masks = masks.tolist()
+    else:
+        from_bytes = int.from_bytes
+        masks = [from_bytes(blob[start:start + width], "little")
+                 for start in range(offset, offset + count * width, width)]
+        offset += count * width
+
+    if flags & HAS_IDS:
+        ids, offset = _read_column("I", blob, offset, count)
+        ids = [pid or None for pid in ids]
+    else:
+        ids = range(1, count + 1)
+    if flags & HAS_RESULTS:
+        payouts, offset = _read_column("d", blob, offset, count)
+        ranks, offset = _read_column("I", blob, offset, count)
+    else:
+        payouts = [0.0] * count
+        ranks = [0] * count
+
+    date_ids, offset = _read_column("I", blob, offset, days)
+    squad_names, offset = _read_column("I", blob, offset, squad_count)
+    squad_sizes, offset = _read_column("I", blob, offset, squad_count)
+    squad_members, offset = _read_column("I", blob, offset, member_count)
+    squads = []
+    start = 0
+    for name, size in zip(squad_names, squad_sizes):
+        squads.append({'name': strings[name],
+                       'members': [strings[member] for member in squad_members[start:start + size]]})
+        start += size
+
+    prize_ranks, offset = _read_column("I", blob, offset, prize_count)
+    prize_amounts, offset = _read_column("q", blob, offset, prize_count)
+    prize_labels, offset = _read_column("I", blob, offset, prize_count)
+
+    return {
+        'participant_columns': (strings[:count], masks, icons, payouts, ranks, ids),
+        'squads': squads,
+        'prize_pool': prize_pool,
+        'war_dates': [strings[date] for date in date_ids],
+        'prize_mode': PRIZE_MODES[mode] if mode < len(PRIZE_MODES) else 'equal',
+        'ranked_prizes': [{'rank': rank, 'amount': amount, 'label': strings[label]}
+                          for rank, amount, label in zip(prize_ranks, prize_amounts, prize_labels)],
+        'journal_seq': journal_seq
+    }
+
+
+def convert(source, target):
+    """Convert a war file between JSON and binary; the target extension picks the format"""
+    from clan_war_engine import load_war  # the engine imports this module
+    load_war(source).save(target)
+
+
+def main(argv=None):
+    """Run the converter"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print(f"Usage: python clan_war_binary.py SOURCE TARGET  (TARGET ending in {BINARY_EXTENSION} is binary)",
+              file=sys.stderr)
+        return 2
+
+    convert(*argv)
+    print(f"Converted {argv[0]} -> {argv[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,760 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Core Engine
+Headless war model: roster, attendance, squads, prize calculation and
+persistence. Imports nothing from tkinter so payouts can be computed on a
+server or from a cron job.
+Created by Nex Clan
+"""
+
+import json
+import os
+from collections import Counter
+import tempfile
+from datetime import datetime, timedelta
+
+from clan_war_binary import BINARY_EXTENSION, decode_war, encode_war, is_binary
+from clan_war_ranking import Ranking, ordinal
+
+WAR_LENGTH = 14
+WAR_LENGTHS = (14, 30, 60, 90)  # Offered in the UI; any positive length works
+DATE_FORMAT = "%m/%d/%Y"
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask):
+        """Number of set bits in mask"""
+        return bin(mask).count("1")
+
+
+def mask_from_list(attendance):
+    """Pack a list of attendance flags into an integer bitmask (bit n = day n)"""
+    mask = 0
+    for day, present in enumerate(attendance):
+        if present:
+            mask |= 1 << day
+    return mask
+
+
+def mask_to_list(mask, length):
+    """Unpack an attendance bitmask into a list of bools"""
+    return [bool(mask >> day & 1) for day in range(length)]
+
+
+def count_days(masks, length):
+    """Number of masks with each day set, for days 0..length-1"""
+    day_totals = [0] * length
+
+    # Rosters share few distinct attendance patterns, so count those once
+    for mask, count in Counter(masks).items():
+        mask &= (1 << length) - 1
+        while mask:
+            low = mask & -mask
+            day_totals[low.bit_length() - 1] += count
+            mask ^= low
+    return day_totals
+
+
+def days_mask(days):
+    """Bitmask with the given day indexes set"""
+    mask = 0
+    for day in days:
+        mask |= 1 << day
+    return mask
+
+
+def generate_war_dates(start_date=None, length=WAR_LENGTH):
+    """Generate consecutive war dates starting from start_date (default today)"""
+    start_date = start_date or datetime.now()
+    dates = []
+    for i in range(length):
+        date = start_date + timedelta(days=i)
+        dates.append(date.strftime(DATE_FORMAT))
+    return dates
+
+
+def default_ranked_prizes():
+    """Default ranked prize structure"""
+    return [
+        {"rank": 1, "amount": 400000, "label": "1st Place"},
+        {"rank": 2, "amount": 200000, "label": "2nd Place"},
+        {"rank": 3, "amount": 100000, "label": "3rd Place"},
+        {"rank": 4, "amount": 50000, "label": "4th Place"},
+        {"rank": 5, "amount": 25000, "label": "5th Place"}
+    ]
+
+
+def write_atomic(filename, content):
+    """Write text or bytes to filename via a temp file and rename, so a crash never leaves a partial file"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(content, bytes) else 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates owner-only files; keep the permissions of the file being replaced
+        os.chmod(temp_path, os.stat(filename).st_mode & 0o777 if os.path.exists(filename) else 0o644)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class Participant:
+    """A war participant with attendance held as an integer bitmask"""
+
+    __slots__ = ('pid', 'name', 'mask', 'class_icon', 'payout', 'rank')
+
+    def __init__(self, name, mask=0, class_icon=None, payout=0.0, rank=0, pid=None):
+        self.pid = pid  # Stable ID, assigned by the model
+        self.name = name
+        self.mask = mask
+        self.class_icon = class_icon
+        self.payout = payout
+        self.rank = rank
+
+    @property
+    def total_days(self):
+        """Days attended, derived from the bitmask"""
+        return popcount(self.mask)
+
+    def attended(self, day):
+        """Check attendance on a day"""
+        return bool(self.mask >> day & 1)
+
+    def set_day(self, day, value):
+        """Set attendance on a day"""
+        if value:
+            self.mask |= 1 << day
+        else:
+            self.mask &= ~(1 << day)
+
+    def to_dict(self, length):
+        """Return the JSON save format (attendance as a list of bools)"""
+        return {
+            'id': self.pid,
+            'name': self.name,
+            'attendance': mask_to_list(self.mask, length),
+            'total_days': self.total_days,
+            'payout': self.payout,
+            'rank': self.rank,
+            'class_icon': self.class_icon
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a participant from the JSON save format"""
+        return cls(data['name'],
+                   mask_from_list(data.get('attendance', [])),
+                   data.get('class_icon'),
+                   data.get('payout', 0.0),
+                   data.get('rank', 0),
+                   data.get('id'))
+
+
+class Squad:
+    """A named squad; members is an insertion-ordered set of participant names"""
+
+    __slots__ = ('name', 'members')
+
+    def __init__(self, name, members=()):
+        self.name = name
+        self.members = dict.fromkeys(members)
+
+    def to_dict(self):
+        """Return the JSON save format"""
+        return {
+            'name': self.name,
+            'members': list(self.members)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a squad from the JSON save format"""
+        return cls(data['name'], data.get('members', []))
+
+
+class WarModel:
+    """State of a single clan war and the calculations on it"""
+
+    def __init__(self):
+        self.participants = []
+        self.squads = []
+        self.prize_pool = 0.0
+        self.war_dates = generate_war_dates()
+        self.prize_mode = "equal"
+        self.ranked_prizes = default_ranked_prizes()
+        self.day_totals = [0] * len(self.war_dates)
+
+        # Participant lookup by name and by stable ID
+        self.by_name = {}
+        self.by_id = {}
+        self.next_pid = 1
+
+        # Squad lookup by name and participant name -> squads they are in
+        self.squads_by_name = {}
+        self.squads_by_member = {}
+
+        # Called as listener(op, data) after every mutation (e.g. the journal)
+        self.listeners = []
+
+        # Bumped on every mutation; saved_version is the version last written to disk
+        self.version = 0
+        self.saved_version = 0
+
+        # Computed payouts and reports, valid while results_key matches
+        self.results_cache = {}
+        self.results_key = None
+
+    def emit(self, op, **data):
+        """Notify listeners of a mutation"""
+        self.version += 1
+        for listener in self.listeners:
+            listener(op, data)
+
+    @property
+    def dirty(self):
+        """True if there are changes since the last save"""
+        return self.version != self.saved_version
+
+    def mark_saved(self, version=None):
+        """Record that the given version (default: the current one) is on disk"""
+        self.saved_version = self.version if version is None else version
+
+    # Result cache
+    def cached_result(self, name, compute):
+        """Return compute() from the cache while the war is unchanged
+
+        Entries are keyed on the mutation version and the prize settings, so
+        any edit (or a bulk load, which calls invalidate_results) drops them.
+        Cached values are shared; callers must not modify them.
+        """
+        key = (self.version, self.prize_mode, self.prize_pool,
+               tuple((prize['rank'], prize['amount'], prize['label']) for prize in self.ranked_prizes))
+        if key != self.results_key:
+            self.results_cache = {}
+            self.results_key = key
+        if name not in self.results_cache:
+            self.results_cache[name] = compute()
+        return self.results_cache[name]
+
+    def invalidate_results(self):
+        """Drop cached results after a change made without emit() (bulk loads)"""
+        self.results_cache = {}
+        self.results_key = None
+
+    # Roster
+    def index_participant(self, participant):
+        """Add a participant to the lookup indexes, assigning an ID if needed"""
+        if participant.pid is None or participant.pid in self.by_id:
+            participant.pid = self.next_pid
+        self.next_pid = max(self.next_pid, participant.pid + 1)
+        self.by_name[participant.name] = participant
+        self.by_id[participant.pid] = participant
+
+    def reindex(self):
+        """Rebuild the lookup indexes and day counts after bulk changes"""
+        self.by_name = {participant.name: participant for participant in self.participants}
+        self.by_id = {participant.pid: participant for participant in self.participants}
+        if len(self.by_id) == len(self.participants) and None not in self.by_id:
+            self.next_pid = max(self.by_id, default=0) + 1
+        else:
+            # Missing or clashing IDs get fresh ones in roster order
+            self.by_id = {}
+            self.next_pid = max((p.pid for p in self.participants if p.pid is not None), default=0) + 1
+            for participant in self.participants:
+                self.index_participant(participant)
+
+        self.squads_by_name = {squad.name: squad for squad in self.squads}
+        self.squads_by_member = {}
+        for squad in self.squads:
+            for member in squad.members:
+                self.squads_by_member.setdefault(member, set()).add(squad)
+        self.recount_attendance()
+
+    def has_participant(self, name):
+        """Check if a participant with this name exists"""
+        return name in self.by_name
+
+    def get_participant(self, name):
+        """Look up a participant by name"""
+        return self.by_name.get(name)
+
+    def get_participant_by_id(self, pid):
+        """Look up a participant by stable ID"""
+        return self.by_id.get(pid)
+
+    def add_participant(self, name, pid=None):
+        """Add a new participant and return it"""
+        if self.has_participant(name):
+            raise ValueError(f"'{name}' is already in the list.")
+
+        participant = Participant(name, pid=pid)
+        self.participants.append(participant)
+        self.index_participant(participant)
+        self.emit('add_participant', name=name, id=participant.pid)
+        return participant
+
+    def rename_participant(self, index, new_name):
+        """Rename the participant at index, updating squad memberships"""
+        participant = self.participants[index]
+        if new_name == participant.name:
+            return
+        if self.has_participant(new_name):
+            raise ValueError(f"'{new_name}' is already in the list.")
+
+        old_name = participant.name
+        del self.by_name[old_name]
+        participant.name = new_name
+        self.by_name[new_name] = participant
+
+        squads = self.squads_by_member.pop(old_name, set())
+        for squad in squads:
+            squad.members = {new_name if member == old_name else member: None for member in squad.members}
+        if squads:
+            self.squads_by_member[new_name] = squads
+        self.emit('rename_participant', id=participant.pid, name=new_name)
+
+    def remove_participant(self, index):
+        """Remove the participant at index and return it"""
+        participant = self.participants.pop(index)
+        del self.by_name[participant.name]
+        del self.by_id[participant.pid]
+        for squad in self.squads_by_member.pop(participant.name, ()):
+            del squad.members[participant.name]
+        for day in range(len(self.day_totals)):
+            if participant.attended(day):
+                self.day_totals[day] -= 1
+        self.emit('remove_participant', id=participant.pid)
+        return participant
+
+    def set_class_icon(self, participant, class_icon):
+        """Set the class icon for a participant"""
+        participant.class_icon = class_icon
+        self.emit('set_class_icon', id=participant.pid, class_icon=class_icon)
+
+    # Attendance
+    def set_attendance(self, index, day, value):
+        """Set attendance for one participant and day, return True if it changed"""
+        return self.set_participant_attendance(self.participants[index], day, value)
+
+    def set_participant_attendance(self, participant, day, value):
+        """Set attendance for a participant and day, return True if it changed"""
+        if participant.attended(day) == bool(value):
+            return False
+
+        participant.set_day(day, value)
+        self.day_totals[day] += 1 if value else -1
+        self.emit('set_attendance', id=participant.pid, day=day, value=bool(value))
+        return True
+
+    @property
+    def war_length(self):
+        """Number of days in the war"""
+        return len(self.war_dates)
+
+    def set_war_length(self, length):
+        """Lengthen or shorten the war; added days follow the last date, cut days lose their attendance"""
+        if length < 1:
+            raise ValueError("A war needs at least one day")
+        dates = self.war_dates[:length]
+        if len(dates) < length:
+            try:
+                start = datetime.strptime(dates[-1], DATE_FORMAT) + timedelta(days=1)
+            except (IndexError, ValueError):
+                start = None
+            dates += generate_war_dates(start, length - len(dates))
+        self.set_war_dates(dates)
+
+    def recount_attendance(self):
+        """Recompute the per-day attendance counts"""
+        self.day_totals = count_days((participant.mask for participant in self.participants),
+                                     len(self.war_dates))
+
+    def set_war_dates(self, war_dates):
+        """Change the war dates, keeping attendance for days that still exist"""
+        self.war_dates = war_dates
+        keep = (1 << len(war_dates)) - 1
+        for participant in self.participants:
+            participant.mask &= keep
+        self.recount_attendance()
+        self.emit('set_war_dates', war_dates=war_dates)
+
+    def reset_attendance(self, war_dates):
+        """Start a new war period and clear all attendance data"""
+        self.war_dates = war_dates
+        for participant in self.participants:
+            participant.mask = 0
+        self.recount_attendance()
+        self.emit('reset_attendance', war_dates=war_dates)
+
+    def mark_day(self, day, value=True):
+        """Mark every participant present (or absent) on a day"""
+        bit = 1 << day
+        for participant in self.participants:
+            if value:
+                participant.mask |= bit
+            else:
+                participant.mask &= ~bit
+        self.day_totals[day] = len(self.participants) if value else 0
+        self.emit('mark_day', day=day, value=bool(value))
+
+    def count_present(self, day):
+        """Count the participants present on a day"""
+        return sum(participant.mask >> day & 1 for participant in self.participants)
+
+    def common_attendance(self, participants):
+        """Bitmask of the days every given participant attended"""
+        mask = (1 << len(self.war_dates)) - 1
+        for participant in participants:
+            mask &= participant.mask
+        return mask
+
+    def present_on_all(self, days):
+        """Participants who attended every one of the given days"""
+        required = days_mask(days)
+        return [participant for participant in self.participants
+                if participant.mask & required == required]
+
+    # Squads
+    def add_squad(self, name):
+        """Add a new squad and return it"""
+        if name in self.squads_by_name:
+            raise ValueError(f"'{name}' already exists.")
+
+        squad = Squad(name)
+        self.squads.append(squad)
+        self.squads_by_name[name] = squad
+        self.emit('add_squad', name=name)
+        return squad
+
+    def rename_squad(self, index, new_name):
+        """Rename the squad at index"""
+        if new_name in self.squads_by_name:
+            raise ValueError(f"'{new_name}' already exists.")
+        squad = self.squads[index]
+        old_name = squad.name
+        del self.squads_by_name[old_name]
+        squad.name = new_name
+        self.squads_by_name[new_name] = squad
+        self.emit('rename_squad', name=old_name, new_name=new_name)
+
+    def delete_squad(self, index):
+        """Delete the squad at index and return it"""
+        squad = self.squads.pop(index)
+        del self.squads_by_name[squad.name]
+        for member in squad.members:
+            self.squads_by_member[member].discard(squad)
+            if not self.squads_by_member[member]:
+                del self.squads_by_member[member]
+        self.emit('delete_squad', name=squad.name)
+        return squad
+
+    def add_to_squad(self, squad_index, participant_name):
+        """Add participant to squad"""
+        squad = self.squads[squad_index]
+        squad.members[participant_name] = None
+        self.squads_by_member.setdefault(participant_name, set()).add(squad)
+        self.emit('add_to_squad', squad=squad.name, name=participant_name)
+
+    def remove_from_squad(self, squad_index, participant_name):
+        """Remove participant from squad"""
+        squad = self.squads[squad_index]
+        del squad.members[participant_name]
+        self.squads_by_member[participant_name].discard(squad)
+        if not self.squads_by_member[participant_name]:
+            del self.squads_by_member[participant_name]
+        self.emit('remove_from_squad', squad=squad.name, name=participant_name)
+
+    def squads_of(self, participant_name):
+        """Squads a participant is in"""
+        return list(self.squads_by_member.get(participant_name, ()))
+
+    def available_participants(self, squad):
+        """Participants not yet in the squad, in roster order"""
+        members = squad.members
+        return [participant for participant in self.participants if participant.name not in members]
+
+    # Prize structure
+    def set_prize_pool(self, amount):
+        """Set the equal distribution prize pool"""
+        if amount != self.prize_pool:
+            self.prize_pool = amount
+            self.emit('set_prize_pool', amount=amount)
+
+    def set_prize_mode(self, mode):
+        """Set the prize mode ('equal' or 'ranked')"""
+        if mode != self.prize_mode:
+            self.prize_mode = mode
+            self.emit('set_prize_mode', mode=mode)
+
+    def set_ranked_prize(self, index, amount):
+        """Update ranked prize amount"""
+        if 0 <= index < len(self.ranked_prizes) and self.ranked_prizes[index]['amount'] != int(amount):
+            self.ranked_prizes[index]['amount'] = int(amount)
+            self.emit('set_ranked_prize', index=index, amount=int(amount))
+
+    def add_rank(self, amount=10000):
+        """Add a new rank to the prize structure"""
+        next_rank = len(self.ranked_prizes) + 1
+        self.ranked_prizes.append({
+            "rank": next_rank,
+            "amount": amount,
+            "label": f"{ordinal(next_rank)} Place"
+        })
+        self.emit('add_rank', amount=amount)
+
+    def remove_rank(self):
+        """Remove the last rank, keeping at least one"""
+        if len(self.ranked_prizes) > 1:
+            self.ranked_prizes.pop()
+            self.emit('remove_rank')
+
+    # Journal replay
+    def apply_change(self, op, data):
+        """Re-apply a mutation recorded by emit()"""
+        if op == 'add_participant':
+            self.add_participant(data['name'], data.get('id'))
+        elif op == 'rename_participant':
+            participant = self.by_id[data['id']]
+            self.rename_participant(self.participants.index(participant), data['name'])
+        elif op == 'remove_participant':
+            self.remove_participant(self.participants.index(self.by_id[data['id']]))
+        elif op == 'set_class_icon':
+            self.set_class_icon(self.by_id[data['id']], data['class_icon'])
+        elif op == 'set_attendance':
+            self.set_participant_attendance(self.by_id[data['id']], data['day'], data['value'])
+        elif op == 'set_war_dates':
+            self.set_war_dates(data['war_dates'])
+        elif op == 'reset_attendance':
+            self.reset_attendance(data['war_dates'])
+        elif op == 'mark_day':
+            self.mark_day(data['day'], data['value'])
+        elif op == 'add_squad':
+            self.add_squad(data['name'])
+        elif op == 'rename_squad':
+            self.rename_squad(self.squad_index(data['name']), data['new_name'])
+        elif op == 'delete_squad':
+            self.delete_squad(self.squad_index(data['name']))
+        elif op == 'add_to_squad':
+            self.add_to_squad(self.squad_index(data['squad']), data['name'])
+        elif op == 'remove_from_squad':
+            self.remove_from_squad(self.squad_index(data['squad']), data['name'])
+        elif op == 'set_prize_pool':
+            self.set_prize_pool(data['amount'])
+        elif op == 'set_prize_mode':
+            self.set_prize_mode(data['mode'])
+        elif op == 'set_ranked_prize':
+            self.set_ranked_prize(data['index'], data['amount'])
+        elif op == 'add_rank':
+            self.add_rank(data['amount'])
+        elif op == 'remove_rank':
+            self.remove_rank()
+        else:
+            raise ValueError(f"Unknown change '{op}'")
+
+    def squad_index(self, name):
+        """Position of a squad in the squad list"""
+        return self.squads.index(self.squads_by_name[name])
+
+    # Results
+    def generate_export_results(self):
+        """Generate results text for export"""
+        return self.cached_result('export', self._generate_export_results)
+
+    def _generate_export_results(self):
+        """Build the export text (uncached)"""
+        header, rows, footer = self.export_report()
+        return "\n".join(header + [line for _, line in rows] + footer)
+
+    def export_report(self):
+        """Return the export report as (header lines, [(participant name, line), ...], footer lines)
+
+        Lets views show, filter or page through the participant rows
+        without re-parsing the text.
+        """
+        return self.cached_result('report', self._export_report)
+
+    def _export_report(self):
+        """Build the export report sections (uncached)"""
+        results = []
+        results.append("NEX CLAN WAR TRACKER - RESULTS")
+        results.append("=" * 60)
+        results.append(f"War Period: {self.war_dates[0]} to {self.war_dates[-1]}")
+        results.append("")
+
+        if self.prize_mode == "equal":
+            header, rows = self.cached_result('equal_results', self._equal_results)
+        else:
+            header, rows = self.cached_result('ranked_results', self._ranked_results)
+        results.extend(header)
+
+        return results, rows, ["", "Created by Nex Clan"]
+
+    def calculate_equal_payouts(self):
+        """Return (per_day_value, [(participant, payout), ...]) for equal distribution"""
+        return self.cached_result('equal_payouts', self._calculate_equal_payouts)
+
+    def _calculate_equal_payouts(self):
+        """Compute equal payouts (uncached)"""
+        total_attendance_days = sum(p.total_days for p in self.participants)
+        if total_attendance_days == 0:
+            return 0.0, [(participant, 0.0) for participant in self.participants]
+
+        per_day_value = self.prize_pool / total_attendance_days
+        return per_day_value, [(participant, participant.total_days * per_day_value)
+                               for participant in self.participants]
+
+    def ranking(self, places=None):
+        """Rank the roster by days attended; places limits ranking to the paid places and ties"""
+        return Ranking([participant.total_days for participant in self.participants], self.ranked_prizes, places)
+
+    def calculate_ranked_payouts(self):
+        """Return [(participant, rank, label, payout), ...] ordered by rank"""
+        return self.cached_result('ranked_payouts', lambda: self.ranking().rows(self.participants))
+
+    def calculate_payouts(self):
+        """Return [(participant, payout), ...] for the current prize mode"""
+        if self.prize_mode == "equal":
+            return self.calculate_equal_payouts()[1]
+        return [(participant, payout) for participant, rank, label, payout in self.calculate_ranked_payouts()]
+
+    def generate_equal_results(self):
+        """Generate equal distribution results"""
+        header, rows = self.cached_result('equal_results', self._equal_results)
+        return header + [line for _, line in rows]
+
+    def _equal_results(self):
+        """Build the equal distribution report as (header lines, [(name, line), ...]) (uncached)"""
+        prize_total = self.prize_pool
+        total_attendance_days = sum(p.total_days for p in self.participants)
+
+        if total_attendance_days == 0:
+            return ["No attendance recorded."], []
+
+        per_day_value, payouts = self.calculate_equal_payouts()
+
+        results = []
+        results.append("EQUAL DISTRIBUTION CALCULATION")
+        results.append("-" * 40)
+        results.append(f"Total Prize Pool: ${prize_total:,.2f}")
+        results.append(f"Total Attendance Days: {total_attendance_days}")
+        results.append(f"Value per Day: ${per_day_value:,.2f}")
+        results.append("")
+        results.append("INDIVIDUAL PAYOUTS:")
+        results.append("-" * 40)
+
+        rows = [(participant.name, f"{participant.name:<25} {participant.total_days:>2} days  ${payout:>12,.2f}")
+                for participant, payout in payouts]
+        return results, rows
+
+    def generate_ranked_results(self):
+        """Generate ranked distribution results"""
+        header, rows = self.cached_result('ranked_results', self._ranked_results)
+        return header + [line for _, line in rows]
+
+    def _ranked_results(self):
+        """Build the ranked distribution report as (header lines, [(name, line), ...]) (uncached)"""
+        results = []
+        results.append("RANKED PRIZE DISTRIBUTION")
+        results.append("-" * 40)
+        results.append("PRIZE STRUCTURE:")
+
+        for prize in self.ranked_prizes:
+            results.append(f"{prize['label']:<15} ${prize['amount']:>12,}")
+
+        results.append("")
+        results.append("RANKINGS AND PAYOUTS:")
+        results.append("-" * 40)
+
+        rows = [(participant.name,
+                 f"{rank_label:<15} {participant.name:<20} {participant.total_days:>2} days  ${payout:>12,}")
+                for participant, rank, rank_label, payout in self.calculate_ranked_payouts()]
+        return results, rows
+
+    # Persistence
+    def to_dict(self):
+        """Return the JSON-serializable save data"""
+        # Settings come first so streaming readers know the war dates before the roster
+        return {
+            'prize_pool': self.prize_pool,
+            'war_dates': self.war_dates,
+            'prize_mode': self.prize_mode,
+            'ranked_prizes': self.ranked_prizes,
+            'participants': [participant.to_dict(len(self.war_dates)) for participant in self.participants],
+            'squads': [squad.to_dict() for squad in self.squads]
+        }
+
+    def update_from_dict(self, data):
+        """Replace the war state with loaded save data"""
+        if 'participant_columns' in data:
+            # Binary war files hand over parallel columns
+            self.participants = list(map(Participant, *data['participant_columns']))
+        else:
+            self.participants = [Participant.from_dict(p) for p in data.get('participants', [])]
+        self.squads = [Squad.from_dict(squad) for squad in data.get('squads', [])]
+        self.update_settings(data)
+        self.reindex()
+
+    def update_settings(self, data):
+        """Replace the prize pool, war dates, prize mode and ranked prizes from save data"""
+        self.prize_pool = data.get('prize_pool', 0.0)
+        self.war_dates = data.get('war_dates', generate_war_dates())
+        self.prize_mode = data.get('prize_mode', 'equal')
+        self.ranked_prizes = data.get('ranked_prizes', self.ranked_prizes)
+        self.invalidate_results()
+
+    def extend_participants(self, participants):
+        """Append loaded participants in bulk (not journaled)"""
+        for participant in participants:
+            self.participants.append(participant)
+            self.index_participant(participant)
+        for day, count in enumerate(count_days((participant.mask for participant in participants),
+                                               len(self.day_totals))):
+            self.day_totals[day] += count
+        self.invalidate_results()
+
+    def save(self, filename):
+        """Save the war to a JSON or binary war file"""
+        write_war(filename, self.to_dict())
+        self.mark_saved()
+
+    def load(self, filename):
+        """Load the war from a JSON or binary war file, replaying edits still only in its change journal
+
+        The journal is read but never modified, so this is safe while the
+        tracker has the file open.
+        """
+        from clan_war_journal import JOURNAL_SUFFIX, WarJournal  # The journal module builds on this one
+
+        data = read_war(filename)
+        self.update_from_dict(data)
+        if os.path.exists(filename + JOURNAL_SUFFIX):
+            WarJournal(filename).replay(self, data.get('journal_seq', 0), repair=False)
+
+
+def read_war(filename):
+    """Read raw save data from a JSON or binary war file (detected by magic bytes)"""
+    with open(filename, 'rb') as f:
+        content = f.read()
+    if is_binary(content):
+        return decode_war(content)
+    return json.loads(content)
+
+
+def write_war(filename, data):
+    """Atomically write save data; files ending in .nxwar use the binary format"""
+    if filename.endswith(BINARY_EXTENSION):
+        write_atomic(filename, encode_war(data))
+    else:
+        write_atomic(filename, json.dumps(data, indent=2))
+
+
+def load_war(filename):
+    """Load a war file (with its change journal replayed) into a new model"""
+    model = WarModel()
+    model.load(filename)
+    return model
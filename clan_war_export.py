@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Streaming Results Exporter
+Writes one row per participant (name, days attended, a flag for every war
+day, rank and payout) as CSV, TSV or JSON Lines for spreadsheets and bots.
+Rows are produced by a generator and written as they are made, so memory
+does not grow with the roster and large exports run at disk speed.
+
+Usage (the format follows the output extension):
+    python clan_war_export.py war.json payouts.csv [--mode equal|ranked]
+    python clan_war_export.py war.nxwar payouts.jsonl
+Created by Nex Clan
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from functools import lru_cache
+
+from clan_war_engine import load_war, mask_to_list, popcount
+from clan_war_ranking import Ranking
+
+FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.jsonl': 'jsonl'}
+PATTERN_CACHE = 1024  # attendance patterns kept unpacked; long wars rarely repeat one
+
+
+def result_rows(entries, length, prize_mode="equal", prize_pool=0.0, ranked_prizes=()):
+    """Yield (name, days, flags, rank, payout) for each participant in report order
+
+    entries is a list of (name, attendance mask) pairs; flags is a tuple of
+    one bool per war day. Equal mode keeps roster order, ranked mode goes
+    by rank; both report the competition rank by days attended.
+    """
+    day_bits = (1 << length) - 1
+    totals = [popcount(mask & day_bits) for _, mask in entries]
+    ranking = Ranking(totals, ranked_prizes)
+
+    if prize_mode == "equal":
+        total_attendance_days = sum(totals)
+        per_day_value = prize_pool / total_attendance_days if total_attendance_days else 0.0
+        order = range(len(entries))
+    else:
+        payouts = ranking.payouts()
+        order = ranking.order
+
+    # Short wars share few attendance patterns, so the common ones are unpacked once;
+    # the cache is bounded because on long wars nearly every mask is unique
+    unpack = lru_cache(maxsize=PATTERN_CACHE)(lambda mask: tuple(mask_to_list(mask, length)))
+    for index in order:
+        name, mask = entries[index]
+        flags = unpack(mask & day_bits)
+        days = totals[index]
+        payout = days * per_day_value if prize_mode == "equal" else payouts[index]
+        yield name, days, flags, ranking.ranks[index], payout
+
+
+def model_result_rows(model, mode=None):
+    """Result rows for a WarModel (mode defaults to the model's prize mode)"""
+    return result_rows([(participant.name, participant.mask) for participant in model.participants],
+                       len(model.war_dates), mode or model.prize_mode,
+                       model.prize_pool, model.ranked_prizes)
+
+
+def write_delimited(rows, file, war_dates, delimiter=","):
+    """Write rows as CSV/TSV with a header row; flags are 1/0 columns named by date"""
+    writer = csv.writer(file, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(["name", "days"] + list(war_dates) + ["rank", "payout"])
+
+    columns = lru_cache(maxsize=PATTERN_CACHE)(lambda flags: ["1" if flag else "0" for flag in flags])
+    def cells():
+        for name, days, flags, rank, payout in rows:
+            yield [name, days, *columns(flags), rank, f"{payout:.2f}"]
+
+    writer.writerows(cells())
+
+
+def write_jsonl(rows, file, war_dates):
+    """Write rows as JSON Lines, one object per participant"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    write = file.write
+    for name, days, flags, rank, payout in rows:
+        write(encode({'name': name, 'days': days, 'attendance': flags,
+                      'rank': rank, 'payout': round(payout, 2)}))
+        write("\n")
+
+
+def export_format(filename):
+    """Export format for a file name, from its extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported export format '{extension}' (use {', '.join(FORMATS)})")
+    return FORMATS[extension]
+
+
+def export_rows(rows, filename, war_dates, fmt=None):
+    """Stream rows to filename in the given (or extension's) format; return rows written"""
+    fmt = fmt or export_format(filename)
+    count = 0
+
+    def counted():
+        nonlocal count
+        for row in rows:
+            count += 1
+            yield row
+
+    with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        if fmt == 'jsonl':
+            write_jsonl(counted(), f, war_dates)
+        else:
+            write_delimited(counted(), f, war_dates, "\t" if fmt == 'tsv' else ",")
+    return count
+
+
+def export_model(model, filename, fmt=None, mode=None):
+    """Export a WarModel's results; return rows written"""
+    return export_rows(model_result_rows(model, mode), filename, model.war_dates, fmt)
+
+
+def main(argv=None):
+    """Run the exporter"""
+    parser = argparse.ArgumentParser(description="Export clan war results as CSV, TSV or JSON Lines")
+    parser.add_argument('war', help="war file (JSON or .nxwar)")
+    parser.add_argument('output', help="output file ending in .csv, .tsv or .jsonl")
+    parser.add_argument('--mode', choices=['equal', 'ranked'],
+                        help="prize mode to use (default: the mode saved in the file)")
+    args = parser.parse_args(argv)
+
+    try:
+        export_format(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    model = load_war(args.war)
+    start = time.perf_counter()
+    count = export_model(model, args.output, mode=args.mode)
+    print(f"Exported {count} participants to {args.output} in {time.perf_counter() - start:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Change Journal
+Records every edit to a war as one line in an append-only journal next to the
+war file, so saving costs O(change) instead of rewriting the whole roster.
+The journal is folded into the war file (written atomically) every
+`compact_every` changes and on close. Loading replays the journal on top of
+the last snapshot, so a crash loses at most the change being written.
+Created by Nex Clan
+"""
+
+import json
+import os
+
+from clan_war_engine import WarModel, read_war, write_atomic, write_war
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class WarJournal:
+    """Append-only change log for one war file
+
+    Entries are numbered and the snapshot records the last entry it holds
+    (journal_seq), so edits made while a snapshot is being written are kept
+    and nothing is replayed twice.
+    """
+
+    def __init__(self, snapshot_path, compact_every=500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.model = None
+        self.file = None
+        self.seq = 0  # number of the last recorded change
+        self.pending = 0  # changes not yet in the snapshot
+        self.compacting = False
+
+        # Called instead of compact() when set, e.g. to save off the UI thread
+        self.compact_due = None
+
+    def attach(self, model):
+        """Start journaling changes made to model"""
+        self.detach()
+        self.model = model
+        model.listeners.append(self.record)
+        self.file = open(self.journal_path, 'a')
+
+    def detach(self):
+        """Stop journaling and close the journal file"""
+        if self.model is not None and self.record in self.model.listeners:
+            self.model.listeners.remove(self.record)
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def record(self, op, data):
+        """Append one change and flush it to disk"""
+        self.seq += 1
+        self.file.write(json.dumps({'seq': self.seq, 'op': op, 'data': data}, separators=(',', ':')) + "\n")
+        self.file.flush()
+        getattr(os, 'fdatasync', os.fsync)(self.file.fileno())
+
+        self.pending += 1
+        if self.compact_every and self.pending >= self.compact_every and not self.compacting:
+            if self.compact_due:
+                self.compact_due()
+            else:
+                self.compact()
+
+    # Compaction, split so the snapshot can be written on another thread
+    def snapshot(self):
+        """Capture the save data and the number of the last change it holds"""
+        self.compacting = True
+        data = self.model.to_dict()
+        data['journal_seq'] = self.seq
+        return data, self.seq
+
+    def write_snapshot(self, data):
+        """Write a captured snapshot to the war file (safe off the UI thread)"""
+        write_war(self.snapshot_path, data)
+
+    def finish_compaction(self, seq):
+        """Drop journal entries the written snapshot already holds"""
+        self.compacting = False
+        if seq == self.seq:
+            # The snapshot holds every entry, so nothing is lost if this is cut short
+            with open(self.journal_path, 'a') as f:
+                f.truncate(0)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending = 0
+            return
+
+        # Newer entries are only in the journal; replace it atomically with them
+        kept = [line for line_seq, line in JournalReader(self.journal_path).lines() if line_seq > seq]
+        write_atomic(self.journal_path, "".join(kept))
+        if self.file:
+            self.file.close()
+            self.file = open(self.journal_path, 'a')
+        self.pending = len(kept)
+
+    def abort_compaction(self):
+        """Forget a snapshot that could not be written"""
+        self.compacting = False
+
+    def compact(self):
+        """Write a fresh snapshot and empty the journal"""
+        data, seq = self.snapshot()
+        try:
+            self.write_snapshot(data)
+        except BaseException:
+            self.abort_compaction()
+            raise
+        self.finish_compaction(seq)
+
+    def load(self, model):
+        """Load the snapshot into model and replay the journal, return changes replayed"""
+        base = 0
+        if os.path.exists(self.snapshot_path):
+            data = read_war(self.snapshot_path)
+            model.update_from_dict(data)
+            base = data.get('journal_seq', 0)
+        return self.replay(model, base)
+
+    def replay(self, model, base=0, repair=True):
+        """Re-apply journal entries newer than base (the snapshot's journal_seq)
+
+        repair drops a torn final line from the file; readers that must not
+        modify a journal another process may be writing pass False.
+        """
+        return self.apply_entries(model, self.read_entries(base, repair), base)
+
+    # Replay, split so the journal can be read on another thread
+    def read_entries(self, base=0, repair=True):
+        """Read the (seq, op, data) entries newer than base (safe off the UI thread)"""
+        entries = JournalReader(self.journal_path)
+        newer = [entry for entry in entries if entry[0] > base]
+
+        # Drop a torn final line so new entries start on a fresh line
+        if repair and os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > entries.valid_bytes:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(entries.valid_bytes)
+        return newer
+
+    def apply_entries(self, model, entries, base=0):
+        """Apply entries from read_entries to model, return changes applied"""
+        self.seq = base
+        replayed = 0
+        for seq, op, data in entries:
+            self.seq = seq
+            try:
+                model.apply_change(op, data)
+            except (KeyError, ValueError, IndexError):
+                continue
+            replayed += 1
+        self.pending = replayed
+        return replayed
+
+    def close(self):
+        """Fold the journal into the snapshot and stop journaling"""
+        if self.model is not None and self.pending:
+            self.compact()
+        self.detach()
+        self.model = None
+
+
+class JournalReader:
+    """Iterate (seq, op, data) entries of a journal, stopping at a torn final line
+
+    valid_bytes holds the length of the intact prefix once iteration ends.
+    """
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self.valid_bytes = 0
+
+    def lines(self):
+        """Yield (seq, raw line) for every intact entry"""
+        self.valid_bytes = 0
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written when the app died
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self.valid_bytes += len(line)
+                yield entry['seq'], line.decode()
+
+    def __iter__(self):
+        for _, line in self.lines():
+            entry = json.loads(line)
+            yield entry['seq'], entry['op'], entry['data']
+
+
+def open_war(filename, compact_every=500):
+    """Load a war with its journal replayed and return (model, journal) ready for editing"""
+    model = WarModel()
+    journal = WarJournal(filename, compact_every)
+    journal.load(model)
+    journal.attach(model)
+    return model, journal
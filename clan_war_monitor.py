@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Event Loop Latency Monitor
+Opt-in instrumentation for finding what makes the window stutter. Every
+Python callback Tk runs (button and checkbox commands, event bindings such
+as <<ListboxSelect>> and <KeyRelease>, variable traces and after timers)
+is registered through Misc._register, so wrapping that one method times
+them all, per handler. A heartbeat scheduled with after measures how late
+the main loop gets to it, which is the lag a user feels.
+
+Start the tracker with --monitor (or CLAN_WAR_MONITOR=1) to enable it;
+set CLAN_WAR_MONITOR_FILE to dump the report as JSON on exit.
+Created by Nex Clan
+"""
+
+import json
+import math
+import os
+import sys
+import time
+import tkinter as tk
+from collections import deque
+
+LAG = "(event loop lag)"
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class HandlerStats:
+    """Call count, total and recent durations (ms) of one handler"""
+
+    __slots__ = ('calls', 'total', 'worst', 'samples')
+
+    def __init__(self, samples):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.samples = deque(maxlen=samples)
+
+    def add(self, ms):
+        """Record one call"""
+        self.calls += 1
+        self.total += ms
+        if ms > self.worst:
+            self.worst = ms
+        self.samples.append(ms)
+
+    def summary(self):
+        """Percentiles over the recent calls, plus lifetime count, total and max"""
+        ordered = sorted(self.samples)
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.calls, 3) if self.calls else 0.0,
+            'p50_ms': round(percentile(ordered, 0.50), 3),
+            'p90_ms': round(percentile(ordered, 0.90), 3),
+            'p99_ms': round(percentile(ordered, 0.99), 3),
+            'max_ms': round(self.worst, 3)
+        }
+
+
+def describe(func, subst=None):
+    """Readable handler name: kind and qualified name, with the source line for lambdas"""
+    kind = "event" if subst is not None else "command"
+    # after() registers a local callit wrapper; report the function it calls
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_name == 'callit' and 'func' in code.co_freevars:
+        func = func.__closure__[code.co_freevars.index('func')].cell_contents
+        kind = "after"
+
+    target = getattr(func, '__func__', func)
+    name = getattr(target, '__qualname__', None) or type(func).__qualname__
+    if '<lambda>' in name and hasattr(target, '__code__'):
+        name = f"{name} ({os.path.basename(target.__code__.co_filename)}:{target.__code__.co_firstlineno})"
+    return f"{kind}: {name}"
+
+
+class LatencyMonitor:
+    """Times every Tk callback and the main loop's heartbeat lag
+
+    install() must run before the widgets are created so their callbacks
+    are registered through the wrapper; start(root) begins the heartbeat.
+    """
+
+    HEARTBEAT_MS = 50
+    SAMPLES = 2000      # recent durations kept per handler for percentiles
+    SLOW_MS = 50.0      # calls at least this long are listed as slow
+    SLOW_KEPT = 200
+
+    def __init__(self, dump_path=None):
+        self.dump_path = dump_path
+        self.handlers = {}
+        self.slow = deque(maxlen=self.SLOW_KEPT)
+        self.root = None
+        self.beat_id = None
+        self.due = None
+        self.started = time.perf_counter()
+        self.original_register = None
+
+    # Callback timing
+    def install(self):
+        """Route every Tk callback registration through the timing wrapper"""
+        if self.original_register is not None:
+            return
+        original = self.original_register = tk.Misc._register
+        monitor = self
+
+        def _register(widget, func, subst=None, needcleanup=1):
+            return original(widget, monitor.wrap(func, subst), subst, needcleanup)
+
+        tk.Misc._register = _register
+
+    def uninstall(self):
+        """Stop timing callbacks registered from now on and stop the heartbeat"""
+        if self.original_register is not None:
+            tk.Misc._register = self.original_register
+            self.original_register = None
+        self.stop()
+
+    def wrap(self, func, subst=None):
+        """Return func timed under its handler name"""
+        name = describe(func, subst)
+        if name == f"after: {type(self).__qualname__}.beat":
+            return func  # The heartbeat measures lag, not its own run time
+        perf_counter = time.perf_counter
+        record = self.record
+
+        def timed(*args):
+            start = perf_counter()
+            try:
+                return func(*args)
+            finally:
+                record(name, (perf_counter() - start) * 1000)
+
+        # Tk names the command after the function
+        timed.__name__ = getattr(getattr(func, '__func__', func), '__name__', 'callback')
+        return timed
+
+    def record(self, name, ms):
+        """Add one measurement for a handler"""
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = HandlerStats(self.SAMPLES)
+        stats.add(ms)
+        if ms >= self.SLOW_MS:
+            self.slow.append((round(time.perf_counter() - self.started, 3), name, round(ms, 3)))
+
+    # Heartbeat
+    def start(self, root):
+        """Begin measuring main-loop lag on root"""
+        self.root = root
+        self.schedule()
+
+    def stop(self):
+        """Stop the heartbeat"""
+        if self.beat_id is not None and self.root is not None:
+            try:
+                self.root.after_cancel(self.beat_id)
+            except tk.TclError:
+                pass
+        self.beat_id = None
+
+    def schedule(self):
+        """Queue the next heartbeat"""
+        self.due = time.perf_counter() + self.HEARTBEAT_MS / 1000
+        self.beat_id = self.root.after(self.HEARTBEAT_MS, self.beat)
+
+    def beat(self):
+        """Record how late this heartbeat ran"""
+        self.record(LAG, max(0.0, (time.perf_counter() - self.due) * 1000))
+        self.schedule()
+
+    # Reporting
+    def reset(self):
+        """Forget every measurement"""
+        self.handlers.clear()
+        self.slow.clear()
+        self.started = time.perf_counter()
+
+    def report(self, extra=None):
+        """Latency report: lag, per-handler percentiles (slowest p99 first) and recent slow calls"""
+        handlers = {name: stats.summary() for name, stats in self.handlers.items() if name != LAG}
+        lag = self.handlers.get(LAG)
+        report = {
+            'uptime_s': round(time.perf_counter() - self.started, 3),
+            'heartbeat_ms': self.HEARTBEAT_MS,
+            'slow_ms': self.SLOW_MS,
+            'lag': lag.summary() if lag else None,
+            'handlers': dict(sorted(handlers.items(), key=lambda item: item[1]['p99_ms'], reverse=True)),
+            'slow_calls': [{'at_s': at, 'handler': name, 'ms': ms} for at, name, ms in self.slow]
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+    def dump(self, filename, extra=None):
+        """Write the report as JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.report(extra), f, indent=2)
+
+
+def format_report(report, limit=40):
+    """Plain-text table of a report for the diagnostics window"""
+    lines = [f"{'Handler':<60} {'Calls':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'Max':>8}"]
+    lines.append("-" * len(lines[0]))
+    rows = list(report['handlers'].items())
+    if report['lag']:
+        rows.insert(0, (LAG, report['lag']))
+    for name, stats in rows[:limit + 1]:
+        label = name if len(name) <= 60 else name[:57] + "..."
+        lines.append(f"{label:<60} {stats['calls']:>7} {stats['p50_ms']:>6.1f}ms {stats['p90_ms']:>6.1f}ms "
+                     f"{stats['p99_ms']:>6.1f}ms {stats['max_ms']:>6.1f}ms")
+    if len(rows) > limit + 1:
+        lines.append(f"... {len(rows) - limit - 1} more handlers in the JSON report")
+
+    if report['slow_calls']:
+        lines.append("")
+        lines.append(f"Recent calls over {report['slow_ms']:.0f}ms:")
+        for call in reversed(report['slow_calls'][-15:]):
+            lines.append(f"  {call['at_s']:>9.1f}s  {call['ms']:>8.1f}ms  {call['handler']}")
+    return "\n".join(lines)
+
+
+def process_started():
+    """time.perf_counter() reading of when this process was created, or None where the OS won't say
+
+    Includes interpreter startup, which no timestamp taken in Python code
+    can see. Linux reports it in clock ticks (usually 10 ms).
+    """
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/stat') as f:
+                # Fields after the command name, which may itself hold spaces; starttime is field 22
+                start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+            with open('/proc/uptime') as f:
+                uptime = float(f.read().split()[0])
+            age = uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+        elif sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            created, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(created),
+                                            ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            # FILETIME counts 100 ns intervals since 1601
+            created_at = ((created.dwHighDateTime << 32) | created.dwLowDateTime) / 1e7 - 11644473600
+            age = time.time() - created_at
+        else:
+            return None
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return time.perf_counter() - max(0.0, age)
+
+
+class StartupTimer:
+    """Milestones from process start to first paint, for the startup report
+
+    started is the time.perf_counter() reading startup is counted from:
+    process_started() where the OS reports it, otherwise a reading taken
+    as early as possible (before the heavy imports), which leaves out
+    interpreter startup. from_process says which one it is. Each mark
+    records the time since started.
+    """
+
+    TARGET_MS = 300  # process start to first paint on a normal laptop
+
+    def __init__(self, started=None, from_process=False):
+        self.started = time.perf_counter() if started is None else started
+        self.from_process = from_process
+        self.marks = []
+
+    def mark(self, name, at=None):
+        """Record that a startup phase has finished (at a perf_counter() reading, default now)"""
+        self.marks.append((name, ((time.perf_counter() if at is None else at) - self.started) * 1000))
+
+    def elapsed(self, name):
+        """Milliseconds from start to the named mark, or None if not reached"""
+        return next((ms for mark, ms in self.marks if mark == name), None)
+
+    def report(self):
+        """Startup report: each mark's time since start and the phase it ends"""
+        phases = []
+        previous = 0.0
+        for name, ms in self.marks:
+            phases.append({'phase': name, 'at_ms': round(ms, 1), 'took_ms': round(ms - previous, 1)})
+            previous = ms
+        first_paint = self.elapsed('first paint')
+        return {
+            'first_paint_ms': round(first_paint, 1) if first_paint is not None else None,
+            'target_ms': self.TARGET_MS,
+            'measured_from': 'process start' if self.from_process else 'module import',
+            'phases': phases
+        }
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Ranking Engine
+Ranks participants by days attended with the competition tie rule (two
+players tied for 1st are both 1st, the next is 3rd) and maps ranks onto the
+ranked prize ladder. Day totals are small bounded integers, so the roster
+is ordered with a counting sort in O(N) instead of a comparison sort; when
+only the paid places are needed a heap picks them out first.
+Created by Nex Clan
+"""
+
+import heapq
+
+
+def ordinal(n):
+    """Get ordinal string for a number (1st, 2nd, 3rd, etc.)"""
+    if 10 <= n % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
+def competition_ranks(totals):
+    """Competition-style ranks (1, 1, 3, ...) for a list of day totals"""
+    if not totals:
+        return []
+    counts = [0] * (max(totals) + 2)
+    for total in totals:
+        counts[total] += 1
+
+    # greater[t] = number of participants with more than t days
+    greater = [0] * len(counts)
+    for value in range(len(counts) - 2, -1, -1):
+        greater[value] = greater[value + 1] + counts[value + 1]
+    return [greater[total] + 1 for total in totals]
+
+
+def bucket_order(totals, indexes=None):
+    """Indexes ordered by total, highest first, roster order among ties (counting sort)
+
+    indexes limits the result to those positions.
+    """
+    if indexes is None:
+        indexes = range(len(totals))
+    if not totals:
+        return []
+    buckets = [[] for _ in range(max(totals) + 1)]
+    for index in indexes:
+        buckets[totals[index]].append(index)
+    return [index for bucket in reversed(buckets) for index in bucket]
+
+
+def top_order(totals, places):
+    """Indexes of participants ranked within the first places, in rank order
+
+    Ties at the cut-off are all included, as they share the rank.
+    """
+    if places <= 0 or not totals:
+        return []
+    cutoff = heapq.nlargest(places, totals)[-1]
+    return bucket_order(totals, [index for index, total in enumerate(totals) if total >= cutoff])
+
+
+class Ranking:
+    """Competition-style ranks of day totals and the prizes they win
+
+    Participants are referred to by their index in totals. With places set,
+    only participants ranked within the first places are ranked (the rest
+    have rank 0 and are left out of order).
+    """
+
+    __slots__ = ('totals', 'prizes', 'order', 'ranks')
+
+    def __init__(self, totals, ranked_prizes=(), places=None):
+        self.totals = totals
+        self.prizes = list(ranked_prizes)
+        if places is not None and places < len(totals):
+            self.order = top_order(totals, places)
+        else:
+            self.order = bucket_order(totals)
+
+        # Walking the order, a participant's rank is its position unless tied with the one before
+        self.ranks = ranks = [0] * len(totals)
+        previous = None
+        rank = 0
+        for position, index in enumerate(self.order, 1):
+            total = totals[index]
+            if total != previous:
+                rank = position
+                previous = total
+            ranks[index] = rank
+
+    def rank(self, index):
+        """Rank of a participant (0 if not ranked)"""
+        return self.ranks[index]
+
+    def payout(self, index):
+        """Prize won by a participant"""
+        rank = self.ranks[index]
+        return self.prizes[rank - 1]['amount'] if 0 < rank <= len(self.prizes) else 0
+
+    def label(self, index):
+        """Rank label as shown in the ranked report"""
+        rank = self.ranks[index]
+        return self.prizes[rank - 1]['label'] if 0 < rank <= len(self.prizes) else f"{ordinal(rank)} Place"
+
+    def payouts(self):
+        """Prize per participant, indexed like totals"""
+        amounts = [prize['amount'] for prize in self.prizes] + [0]
+        last = len(self.prizes)
+        return [amounts[rank - 1] if 0 < rank <= last else 0 for rank in self.ranks]
+
+    def rows(self, participants):
+        """(participant, rank, label, payout) in rank order, participants indexed like totals"""
+        rows = []
+        append = rows.append
+        ranks = self.ranks
+        rank = None
+        # Ties share a rank, so each distinct rank is labelled once
+        for index in self.order:
+            if ranks[index] != rank:
+                rank = ranks[index]
+                label, payout = self.label(index), self.payout(index)
+            append((participants[index], rank, label, payout))
+        return rows
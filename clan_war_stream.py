@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Streaming War Reader
+Reads JSON war files and multi-war season archives incrementally, yielding
+participants and squads as they are parsed instead of decoding the whole
+file first. Only one record is held in the parse buffer at a time, so
+memory stays flat however large the archive is.
+
+An archive is either a JSON array of wars or an object whose "wars" key
+holds that array; a plain war file is a single war.
+Created by Nex Clan
+"""
+
+import json
+import re
+
+from clan_war_engine import Participant, Squad, WarModel
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DELIMITERS = ' \t\n\r,:]}'
+
+# Records yielded by iter_war_records
+ARCHIVE = 'archive'          # (ARCHIVE, None, None) - the file holds several wars
+FIELD = 'field'              # (FIELD, war, (key, value)) - a war setting
+PARTICIPANT = 'participant'  # (PARTICIPANT, war, participant dict)
+SQUAD = 'squad'              # (SQUAD, war, squad dict)
+END = 'end'                  # (END, war, None) - the war is complete
+
+
+class JsonStream:
+    """Pull parser over a text file: containers are walked, records decoded one at a time"""
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """Read the next chunk, dropping what has been consumed; False at end of file"""
+        chunk = self.file.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of file"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        """Consume char or raise ValueError"""
+        if self.peek() != char:
+            raise ValueError(f"Malformed war file: expected '{char}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue  # The value runs past the buffer
+                raise
+            # A number or literal is only complete once a delimiter follows it: "150000." may be
+            # the start of "150000.0" whose digits are still in the next chunk
+            if (self.buffer[self.pos] not in '"[{' and not self.eof
+                    and (end == len(self.buffer) or self.buffer[end] not in DELIMITERS)
+                    and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """Walk an object, yielding each key; the caller consumes its value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError("Malformed war file: expected ',' or '}'")
+
+    def elements(self):
+        """Walk an array, yielding before each element; the caller consumes it"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError("Malformed war file: expected ',' or ']'")
+
+
+def _read_war(stream, war):
+    """Yield the records of one war object"""
+    for key in stream.members():
+        if key in ('participants', 'squads') and stream.peek() == '[':
+            kind = PARTICIPANT if key == 'participants' else SQUAD
+            for _ in stream.elements():
+                yield kind, war, stream.value()
+        else:
+            yield FIELD, war, (key, stream.value())
+    yield END, war, None
+
+
+def iter_war_records(filename):
+    """Yield (kind, war index, value) records from a war file or season archive"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f)
+        if stream.peek() == '[':
+            yield ARCHIVE, None, None
+            for war, _ in enumerate(stream.elements()):
+                yield from _read_war(stream, war)
+            return
+
+        # A top-level object is a war unless it turns out to hold "wars";
+        # settings read before that is known are held back (they are small)
+        pending = []
+        is_war = False
+        for key in stream.members():
+            if key == 'wars' and not is_war and stream.peek() == '[':
+                yield ARCHIVE, None, None
+                for war, _ in enumerate(stream.elements()):
+                    yield from _read_war(stream, war)
+                pending = None
+            elif key in ('participants', 'squads') and pending is not None and stream.peek() == '[':
+                if not is_war:
+                    is_war = True
+                    for held in pending:
+                        yield FIELD, 0, held
+                kind = PARTICIPANT if key == 'participants' else SQUAD
+                for _ in stream.elements():
+                    yield kind, 0, stream.value()
+            elif is_war:
+                yield FIELD, 0, (key, stream.value())
+            elif pending is not None:
+                pending.append((key, stream.value()))
+            else:
+                stream.value()  # Archive metadata
+
+        if pending is not None:
+            if not is_war:
+                for held in pending:
+                    yield FIELD, 0, held
+            yield END, 0, None
+
+
+def is_archive(filename):
+    """True if a JSON file holds several wars (decided from its first records)"""
+    for kind, _, _ in iter_war_records(filename):
+        if kind == ARCHIVE:
+            return True
+        if kind in (PARTICIPANT, SQUAD, END):
+            return False
+    return False
+
+
+def iter_war_batches(filename, batch_size=2000, wars=None, hold_until=None):
+    """Yield (war index, settings, participants, squads, done) as the file is read
+
+    participants is a list of up to batch_size new Participants; settings
+    and squads are only complete once done is True. wars limits how many
+    wars are read.
+
+    With hold_until (a settings key), no batch is yielded before that
+    setting has been read: rows read earlier are held and come with the
+    first batch after it. Files written before settings were saved first
+    list the whole roster before their settings, so for them every row
+    arrives with the final (done) batch.
+    """
+    settings = {}
+    batch = []
+    squads = []
+    for kind, war, value in iter_war_records(filename):
+        if kind == PARTICIPANT:
+            batch.append(Participant.from_dict(value))
+            if len(batch) >= batch_size and (hold_until is None or hold_until in settings):
+                yield war, settings, batch, squads, False
+                batch = []
+        elif kind == SQUAD:
+            squads.append(Squad.from_dict(value))
+        elif kind == FIELD:
+            key, field_value = value
+            settings[key] = field_value
+        elif kind == END:
+            yield war, settings, batch, squads, True
+            settings, batch, squads = {}, [], []
+            if wars is not None and war + 1 >= wars:
+                return
+
+
+def iter_wars(filename):
+    """Yield a WarModel for each war in a war file or archive, one at a time"""
+    model = WarModel()
+    for _, settings, participants, squads, done in iter_war_batches(filename):
+        model.participants.extend(participants)
+        if done:
+            model.squads = squads
+            model.update_settings(settings)
+            model.reindex()
+            yield model
+            model = WarModel()
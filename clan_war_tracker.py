@@ -5,14 +5,28 @@ Version 2.0 - Custom Theme with Gaming Features
 Created by Nex Clan
 """
 
+import time
+STARTED = time.perf_counter()  # the startup report counts from here, before the heavy imports
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from tkinter import font as tkFont
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import calendar
+import functools
+
+from clan_war_binary import is_binary
+from clan_war_engine import WAR_LENGTHS, WarModel, generate_war_dates, write_war
+from clan_war_export import FORMATS as EXPORT_FORMATS, export_rows, result_rows
+from clan_war_journal import WarJournal
+from clan_war_monitor import LatencyMonitor, StartupTimer, format_report, process_started
+from clan_war_stream import is_archive, iter_war_batches
 
 class NexClanTheme:
     """Custom theme colors for Nex Clan"""
@@ -52,41 +66,131 @@ class ClassIcons:
         "life_staff": {"icon": "✨", "name": "Life Staff"}
     }
 
+def unless_loading(handler):
+    """Turn a handler that edits, saves or replaces the war into a no-op while a file loads"""
+    @functools.wraps(handler)
+    def guarded(self, *args, **kwargs):
+        if self.loading_file is not None:
+            messagebox.showinfo("Still Loading", "The war is still loading. Try again once it has finished.")
+            return None
+        return handler(self, *args, **kwargs)
+    return guarded
+
+
 class ClanWarTracker:
-    def __init__(self):
+    # Participants per batch while a JSON war file streams into the grid
+    LOAD_BATCH = 2000
+    
+    # Unsaved wars (never saved to a file) are autosaved here
+    RECOVERY_FILE = 'clan_war_recovery.json'
+    
+    def __init__(self, monitor=None, startup_report=False, quit_after_startup=False):
+        # Startup is timed from process start to first paint
+        process_start = process_started()
+        if process_start is None:
+            self.startup = StartupTimer(STARTED)
+        else:
+            self.startup = StartupTimer(min(process_start, STARTED), from_process=True)
+            self.startup.mark('interpreter', STARTED)
+        self.startup_report = startup_report
+        self.quit_after_startup = quit_after_startup
+        self.startup.mark('imports')
+        
         self.root = tk.Tk()
         self.root.title("Nex Clan War Tracker v2.0")
         self.root.geometry("1600x900")
         self.root.minsize(1400, 800)
+        self.startup.mark('window')
         
         # Set custom theme
         self.setup_custom_theme()
+        self.startup.mark('theme')
         
-        # Application data
-        self.participants = []
-        self.squads = []
-        self.prize_pool = tk.DoubleVar(value=0.0)
-        self.war_dates = self.generate_war_dates()
+        # Application data lives in the headless model
+        self.model = WarModel()
+        self.prize_pool = tk.DoubleVar(value=self.model.prize_pool)
+        self.prize_pool.trace_add('write', self.on_prize_pool_change)
         
         # Prize system data
-        self.prize_mode = tk.StringVar(value="equal")
-        self.ranked_prizes = []
+        self.prize_mode = tk.StringVar(value=self.model.prize_mode)
+        
+        # Days in the war period
+        self.war_length = tk.IntVar(value=self.model.war_length)
         
         # UI Variables
-        self.participant_vars = {}
+        self.attendance_grid = None
         self.date_vars = []
         
         # Auto-reload settings
         self.last_saved_file = None
         self.auto_reload_enabled = tk.BooleanVar(value=True)
         
+        # War history archive last saved to or loaded from, shown by the leaderboard
+        self.archive_path = None
+        
+        # Edits to the open war file are appended to its change journal
+        self.journal = None
+        
+        # File being loaded; edits wait until it has been read and its journal attached
+        self.loading_file = None
+        
+        # File I/O runs on a worker thread; a save requested mid-flight is merged
+        self.file_worker = FileWorker(self.root, self.on_file_worker_busy)
+        self.save_in_flight = False
+        self.save_queued = None  # None, or whether the queued save should notify
+        
+        # Autosave once edits settle, at most once per interval
+        self.autosave_enabled = tk.BooleanVar(value=True)
+        self.autosave_interval = tk.IntVar(value=60)  # seconds
+        self.autosaver = Autosaver(self.root, self.autosave, self.autosave_enabled, self.autosave_interval)
+        self.autosaver.watch(self.model)
+        
         # Paned window variables
         self.main_paned = None
         self.prize_paned = None
         
+        # The roster tab is built the first time it is shown
+        self.roster_built = False
+        
+        # Views repaint once per idle cycle, in this order
+        self.refresh_scheduler = RefreshScheduler(self.root)
+        
+        # Opt-in callback and main-loop latency measurements (--monitor)
+        self.monitor = monitor
+        if monitor:
+            monitor.start(self.root)
+        
         self.setup_ui()
-        self.initialize_ranked_prizes()
-        self.check_auto_reload()
+        self.refresh_scheduler.register('participant_list', self.refresh_participant_list)
+        self.refresh_scheduler.register('squad_list', self.refresh_squad_list)
+        self.refresh_scheduler.register('prize_config', self.setup_prize_config)
+        self.refresh_scheduler.register('attendance', self.refresh_attendance_grid)
+        self.refresh_scheduler.register('squad_details', self.refresh_squad_details)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.startup.mark('war tab')
+        
+        # Auto-reload waits for the first paint so the window appears at once
+        self.root.bind('<Map>', self.on_first_map, add='+')
+    
+    @property
+    def participants(self):
+        return self.model.participants
+    
+    @property
+    def squads(self):
+        return self.model.squads
+    
+    @property
+    def war_dates(self):
+        return self.model.war_dates
+    
+    @property
+    def ranked_prizes(self):
+        return self.model.ranked_prizes
+    
+    @property
+    def day_totals(self):
+        return self.model.day_totals
         
     def setup_custom_theme(self):
         """Setup custom Nex Clan theme"""
@@ -229,25 +333,17 @@ class ClanWarTracker:
         self.style.configure('Nex.TPanedwindow',
                            background=NexClanTheme.BLACK)
         
-    def generate_war_dates(self):
-        """Generate 14 consecutive dates starting from today"""
-        today = datetime.now()
-        dates = []
-        for i in range(14):
-            date = today + timedelta(days=i)
-            dates.append(date.strftime("%m/%d/%Y"))
-        return dates
-    
-    def initialize_ranked_prizes(self):
-        """Initialize default ranked prize structure"""
-        self.ranked_prizes = [
-            {"rank": 1, "amount": 400000, "label": "1st Place"},
-            {"rank": 2, "amount": 200000, "label": "2nd Place"},
-            {"rank": 3, "amount": 100000, "label": "3rd Place"},
-            {"rank": 4, "amount": 50000, "label": "4th Place"},
-            {"rank": 5, "amount": 25000, "label": "5th Place"}
-        ]
-    
+        # Progress indicator styles
+        self.style.configure('Nex.Horizontal.TProgressbar',
+                           background=NexClanTheme.FLAME_ORANGE,
+                           troughcolor=NexClanTheme.DARK_GRAY,
+                           borderwidth=0)
+        
+        self.style.configure('NexStatus.TLabel',
+                           background=NexClanTheme.BLACK,
+                           foreground=NexClanTheme.FLAME_YELLOW,
+                           font=self.small_font)
+        
     def setup_ui(self):
         """Setup the main user interface"""
         # Main container
@@ -267,9 +363,9 @@ class ClanWarTracker:
         
         self.notebook.add(self.war_frame, text="🏆 Clan War Tracker")
         self.notebook.add(self.roster_frame, text="👥 Roster Manager")
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         self.setup_war_tab()
-        self.setup_roster_tab()
         
         # Footer with branding
         self.setup_footer(main_container)
@@ -296,6 +392,28 @@ class ClanWarTracker:
                   command=self.reload_last_file, 
                   style='Nex.TButton').pack(side='left')
         
+        # Autosave controls
+        autosave_frame = ttk.Frame(header_frame, style='Nex.TFrame')
+        autosave_frame.pack(side='right', padx=(0, 15))
+        
+        ttk.Checkbutton(autosave_frame, text="Autosave every", 
+                       variable=self.autosave_enabled,
+                       style='Nex.TCheckbutton').pack(side='left')
+        tk.Spinbox(autosave_frame, from_=10, to=3600, increment=10, width=5,
+                  textvariable=self.autosave_interval,
+                  bg=NexClanTheme.MEDIUM_GRAY, fg=NexClanTheme.WHITE,
+                  buttonbackground=NexClanTheme.DARK_GRAY,
+                  insertbackground=NexClanTheme.FLAME_ORANGE).pack(side='left', padx=5)
+        ttk.Label(autosave_frame, text="s", style='NexStatus.TLabel').pack(side='left')
+        
+        # Background save/load progress, shown only while busy
+        self.status_frame = ttk.Frame(header_frame, style='Nex.TFrame')
+        self.status_label = ttk.Label(self.status_frame, text="", style='NexStatus.TLabel')
+        self.status_label.pack(side='left', padx=(0, 8))
+        self.progress_bar = ttk.Progressbar(self.status_frame, mode='indeterminate', length=120,
+                                            style='Nex.Horizontal.TProgressbar')
+        self.progress_bar.pack(side='left')
+        
     def setup_footer(self, parent):
         """Setup footer with Nex Clan branding"""
         footer_frame = ttk.Frame(parent, style='Nex.TFrame')
@@ -391,10 +509,15 @@ class ClanWarTracker:
         self.participant_listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
         scrollbar.pack(side='right', fill='y', padx=(0, 5), pady=5)
         
-        # Remove participant button
-        remove_btn = ttk.Button(parent, text="🗑️ Remove Selected", 
+        # Rename and remove participant buttons
+        participant_btn_frame = ttk.Frame(parent, style='Nex.TFrame')
+        participant_btn_frame.pack()
+        
+        ttk.Button(participant_btn_frame, text="✏️ Rename", 
+                  command=self.rename_participant, style='Nex.TButton').pack(side='left', padx=(0, 10))
+        remove_btn = ttk.Button(participant_btn_frame, text="🗑️ Remove Selected", 
                                command=self.remove_participant, style='Nex.TButton')
-        remove_btn.pack()
+        remove_btn.pack(side='left')
         
     def setup_prize_section(self, parent):
         """Setup prize management section"""
@@ -506,9 +629,10 @@ class ClanWarTracker:
         
     def setup_attendance_section(self, parent):
         """Setup attendance tracking section"""
-        attendance_frame = ttk.LabelFrame(parent, text="📅 Attendance Tracking (14 Days)", 
+        attendance_frame = ttk.LabelFrame(parent, text=f"📅 Attendance Tracking ({self.model.war_length} Days)", 
                                         padding=15, style='Nex.TLabelframe')
         attendance_frame.pack(fill='both', expand=True)
+        self.attendance_frame = attendance_frame
         
         # Date management section
         date_mgmt_frame = ttk.Frame(attendance_frame, style='Nex.TFrame')
@@ -521,7 +645,16 @@ class ClanWarTracker:
         ttk.Button(date_mgmt_frame, text="📝 Edit Dates", 
                   command=self.edit_dates, style='Nex.TButton').pack(side='left', padx=(0, 10))
         ttk.Button(date_mgmt_frame, text="🔄 Reset to Today", 
-                  command=self.reset_dates, style='Nex.TButton').pack(side='left')
+                  command=self.reset_dates, style='Nex.TButton').pack(side='left', padx=(0, 20))
+        
+        ttk.Label(date_mgmt_frame, text="War Length:", 
+                 style='NexBody.TLabel').pack(side='left')
+        war_length_box = ttk.Combobox(date_mgmt_frame, textvariable=self.war_length, state='readonly',
+                                      values=WAR_LENGTHS, width=4)
+        war_length_box.pack(side='left', padx=(5, 5))
+        war_length_box.bind('<<ComboboxSelected>>', lambda e: self.change_war_length())
+        ttk.Label(date_mgmt_frame, text="days", 
+                 style='NexBody.TLabel').pack(side='left')
         
         # Attendance grid container
         self.attendance_container = ttk.Frame(attendance_frame, style='Nex.TFrame')
@@ -543,21 +676,71 @@ class ClanWarTracker:
         ttk.Button(button_frame, text="💾 Save Data", 
                   command=self.save_data, style='Nex.TButton').pack(side='left', padx=(0, 15))
         ttk.Button(button_frame, text="📁 Load Data", 
-                  command=self.load_data, style='Nex.TButton').pack(side='left')
+                  command=self.load_data, style='Nex.TButton').pack(side='left', padx=(0, 15))
+        ttk.Button(button_frame, text="🗄️ Save to Archive", 
+                  command=self.save_to_archive, style='Nex.TButton').pack(side='left', padx=(0, 15))
+        ttk.Button(button_frame, text="🗄️ Load from Archive", 
+                  command=self.load_from_archive, style='Nex.TButton').pack(side='left', padx=(0, 15))
+        ttk.Button(button_frame, text="🏆 Leaderboard", 
+                  command=self.open_leaderboard, style='Nex.TButton').pack(side='left')
+        if self.monitor:
+            ttk.Button(button_frame, text="📈 Diagnostics", 
+                      command=self.open_diagnostics, style='Nex.TButton').pack(side='left', padx=(15, 0))
         
     def open_calculate_window(self):
         """Open resizable calculate window"""
         calc_window = CalculateWindow(self.root, self)
         
+    @unless_loading
     def open_calendar_picker(self):
         """Open calendar picker for date selection"""
         calendar_dialog = CalendarDialog(self.root, self.war_dates)
         if calendar_dialog.result:
-            self.war_dates = calendar_dialog.result
-            self.refresh_attendance_grid()
+            self.model.set_war_dates(calendar_dialog.result)
+            self.request_refresh('attendance')
+    
+    def on_first_map(self, event):
+        """Finish starting up once the main window has been drawn"""
+        if event.widget is not self.root:
+            return
+        self.root.unbind('<Map>')
+        self.root.after_idle(self.finish_startup)
+    
+    def finish_startup(self):
+        """Record the first paint, then run the startup work that can wait for it"""
+        self.startup.mark('first paint')
+        self.check_auto_reload()
+        self.startup.mark('auto-reload')
+        
+        if self.startup_report:
+            print(json.dumps(self.startup.report()), flush=True)
+        if self.quit_after_startup:
+            self.on_close()
+    
+    def on_tab_changed(self, event):
+        """Build the roster tab on its first view"""
+        if self.notebook.select() == str(self.roster_frame):
+            self.ensure_roster_tab()
+    
+    def ensure_roster_tab(self):
+        """Build the roster tab if it has not been built yet"""
+        if self.roster_built:
+            return
+        self.roster_built = True
+        self.setup_roster_tab()
+        self.refresh_squad_list()
     
     def check_auto_reload(self):
         """Check for auto-reload on startup"""
+        if os.path.exists(self.RECOVERY_FILE):
+            saved_at = datetime.fromtimestamp(os.path.getmtime(self.RECOVERY_FILE))
+            if messagebox.askyesno("Recover Unsaved War",
+                                   f"A war that was never saved was autosaved at "
+                                   f"{saved_at.strftime('%m/%d/%Y %H:%M')}.\n\nRecover it?"):
+                self.load_specific_file(self.RECOVERY_FILE, recovery=True)
+                return
+            os.remove(self.RECOVERY_FILE)
+        
         if self.auto_reload_enabled.get() and os.path.exists('last_saved_file.txt'):
             try:
                 with open('last_saved_file.txt', 'r') as f:
@@ -567,6 +750,7 @@ class ClanWarTracker:
             except:
                 pass  # Ignore errors in auto-reload
     
+    @unless_loading
     def reload_last_file(self):
         """Reload the last saved file"""
         if os.path.exists('last_saved_file.txt'):
@@ -582,124 +766,47 @@ class ClanWarTracker:
         else:
             messagebox.showwarning("No File", "No previous file found to reload.")
     
+    def request_refresh(self, *views):
+        """Mark views dirty; they repaint together on the next idle cycle"""
+        self.refresh_scheduler.mark_dirty(*views)
+    
+    def refresh_participant_list(self):
+        """Rebuild the participant listbox"""
+        self.participant_listbox.delete(0, tk.END)
+        self.participant_listbox.insert(tk.END, *(participant.name for participant in self.participants))
+    
+    def refresh_squad_list(self):
+        """Rebuild the squad listbox"""
+        if not self.roster_built:
+            return  # Filled when the roster tab is first shown
+        self.squad_listbox.delete(0, tk.END)
+        self.squad_listbox.insert(tk.END, *(squad.name for squad in self.squads))
+    
     def refresh_attendance_grid(self):
         """Refresh the attendance tracking grid with enhanced styling and sticky names"""
-        # Clear existing grid
-        for widget in self.attendance_container.winfo_children():
-            widget.destroy()
+        self.model.recount_attendance()
+        self.war_length.set(self.model.war_length)
+        self.attendance_frame.configure(text=f"📅 Attendance Tracking ({self.model.war_length} Days)")
         
         if not self.participants:
+            # Clear existing grid
+            for widget in self.attendance_container.winfo_children():
+                widget.destroy()
+            self.attendance_grid = None
+            
             ttk.Label(self.attendance_container, 
                      text="Add participants to start tracking attendance",
                      style='NexHeading.TLabel').pack(expand=True)
             return
         
-        # Create main frame for the grid with enhanced styling
-        main_frame = ttk.Frame(self.attendance_container, style='NexCard.TFrame')
-        main_frame.pack(fill='both', expand=True, padx=5, pady=5)
-        
-        # Create canvas and enhanced scrollbars
-        canvas = tk.Canvas(main_frame, 
-                          bg=NexClanTheme.MEDIUM_GRAY,
-                          highlightthickness=0, 
-                          borderwidth=0)
-        v_scrollbar = ttk.Scrollbar(main_frame, orient="vertical", 
-                                  command=canvas.yview,
-                                  style='Nex.Vertical.TScrollbar')
-        h_scrollbar = ttk.Scrollbar(main_frame, orient="horizontal", 
-                                  command=canvas.xview,
-                                  style='Nex.Horizontal.TScrollbar')
-        
-        # Create scrollable frame
-        scrollable_frame = ttk.Frame(canvas, style='Nex.TFrame')
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        # Configure grid weights for proper alignment and sticky names
-        scrollable_frame.grid_columnconfigure(0, weight=0, minsize=180)  # Wider for sticky names
-        for i in range(14):
-            scrollable_frame.grid_columnconfigure(i+1, weight=0, minsize=85)
-        scrollable_frame.grid_columnconfigure(15, weight=0, minsize=70)
+        # The grid is built once and only redrawn afterwards
+        if self.attendance_grid is None:
+            for widget in self.attendance_container.winfo_children():
+                widget.destroy()
+            self.attendance_grid = AttendanceGrid(self.attendance_container, self)
+            self.attendance_grid.frame.pack(fill='both', expand=True, padx=5, pady=5)
         
-        # Create header row with enhanced styling
-        header_bg = NexClanTheme.FLAME_ORANGE
-        
-        # Sticky participant header
-        participant_header = tk.Label(scrollable_frame, text="Participant", 
-                                    bg=header_bg, fg=NexClanTheme.WHITE,
-                                    font=self.heading_font, relief='raised', bd=1)
-        participant_header.grid(row=0, column=0, padx=2, pady=2, sticky='ew', ipadx=5, ipady=5)
-        
-        # Date headers
-        for i, date in enumerate(self.war_dates):
-            short_date = date.split('/')[0] + '/' + date.split('/')[1]
-            date_header = tk.Label(scrollable_frame, text=short_date,
-                                 bg=header_bg, fg=NexClanTheme.WHITE,
-                                 font=self.body_font, relief='raised', bd=1)
-            date_header.grid(row=0, column=i+1, padx=1, pady=2, sticky='ew', ipadx=3, ipady=5)
-        
-        # Total header
-        total_header = tk.Label(scrollable_frame, text="Total",
-                              bg=header_bg, fg=NexClanTheme.WHITE,
-                              font=self.heading_font, relief='raised', bd=1)
-        total_header.grid(row=0, column=15, padx=2, pady=2, sticky='ew', ipadx=5, ipady=5)
-        
-        # Create rows for each participant with sticky names and alternating colors
-        self.participant_vars = {}
-        for row, participant in enumerate(self.participants, 1):
-            # Alternating row colors
-            row_bg = NexClanTheme.DARK_GRAY if row % 2 == 0 else NexClanTheme.MEDIUM_GRAY
-            
-            # Sticky participant name with enhanced styling
-            name_label = tk.Label(scrollable_frame, text=participant['name'],
-                                bg=NexClanTheme.LIGHT_GRAY, fg=NexClanTheme.WHITE,
-                                font=self.body_font, relief='raised', bd=1,
-                                anchor='w')
-            name_label.grid(row=row, column=0, padx=2, pady=1, sticky='ew', ipadx=8, ipady=3)
-            
-            # Attendance checkboxes with enhanced styling
-            self.participant_vars[participant['name']] = []
-            for day in range(14):
-                var = tk.BooleanVar(value=participant['attendance'][day])
-                
-                # Create frame for checkbox with background
-                cb_frame = tk.Frame(scrollable_frame, bg=row_bg, relief='sunken', bd=1)
-                cb_frame.grid(row=row, column=day+1, padx=1, pady=1, sticky='ew', ipadx=2, ipady=2)
-                
-                checkbox = tk.Checkbutton(cb_frame, variable=var,
-                                        bg=row_bg, fg=NexClanTheme.WHITE,
-                                        selectcolor=NexClanTheme.FLAME_ORANGE,
-                                        activebackground=row_bg,
-                                        relief='flat', bd=0,
-                                        command=lambda p=participant['name'], d=day, v=var: self.update_attendance(p, d, v))
-                checkbox.pack()
-                self.participant_vars[participant['name']].append(var)
-            
-            # Total days label with enhanced styling
-            total_label = tk.Label(scrollable_frame, text=str(participant['total_days']),
-                                 bg=NexClanTheme.FLAME_RED, fg=NexClanTheme.WHITE,
-                                 font=self.heading_font, relief='raised', bd=1)
-            total_label.grid(row=row, column=15, padx=2, pady=1, sticky='ew', ipadx=5, ipady=3)
-        
-        # Pack scrollbars and canvas with enhanced positioning
-        canvas.pack(side="left", fill="both", expand=True)
-        v_scrollbar.pack(side="right", fill="y", padx=(2, 0))
-        h_scrollbar.pack(side="bottom", fill="x", pady=(2, 0))
-        
-        # Enhanced mousewheel binding
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        def _on_shift_mousewheel(event):
-            canvas.xview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        canvas.bind_all("<Shift-MouseWheel>", _on_shift_mousewheel)
+        self.attendance_grid.refresh()
     
     def setup_roster_tab(self):
         """Setup the roster management tab with class icons"""
@@ -767,76 +874,142 @@ class ClanWarTracker:
         self.squad_details_frame = ttk.Frame(right_panel, style='Nex.TFrame')
         self.squad_details_frame.pack(fill='both', expand=True)
         
-        # Initially show instructions
-        ttk.Label(self.squad_details_frame, 
-                 text="Select a squad from the left to view and manage members with class icons",
-                 style='NexHeading.TLabel').pack(expand=True)
+        self.setup_squad_details_panel()
+    
+    def setup_squad_details_panel(self):
+        """Build the squad details panel once; refreshes only repopulate its lists"""
+        # Instructions shown while no squad is selected
+        self.squad_hint_label = ttk.Label(self.squad_details_frame, 
+                                         text="Select a squad from the left to view and manage members with class icons",
+                                         style='NexHeading.TLabel')
+        self.squad_hint_label.pack(expand=True)
+        
+        self.squad_panel = ttk.Frame(self.squad_details_frame, style='Nex.TFrame')
+        
+        # Squad name header
+        self.squad_title_label = ttk.Label(self.squad_panel, text="", style='NexTitle.TLabel')
+        self.squad_title_label.pack(pady=(0, 20))
+        
+        # Available participants section
+        self.available_frame = ttk.LabelFrame(self.squad_panel, text="Available Participants", 
+                                             padding=15, style='Nex.TLabelframe')
+        self.available_frame.pack(fill='both', expand=True, pady=(0, 15))
+        
+        self.available_listbox = self.create_squad_listbox(self.available_frame)
+        self.available_listbox.bind('<Double-Button-1>', lambda e: self.add_selected_to_squad())
+        self.available_names = []
+        
+        available_btn_frame = ttk.Frame(self.available_frame, style='Nex.TFrame')
+        available_btn_frame.pack(fill='x', pady=(10, 0))
+        
+        ttk.Button(available_btn_frame, text="🎮 Set Class", 
+                  command=lambda: self.set_class_for_selected(self.available_listbox, self.available_names),
+                  style='Nex.TButton').pack(side='left', padx=(0, 5))
+        ttk.Button(available_btn_frame, text="➕ Add to Squad", 
+                  command=self.add_selected_to_squad,
+                  style='Nex.TButton').pack(side='left')
+        
+        # Squad members section
+        self.members_frame = ttk.LabelFrame(self.squad_panel, text="Squad Members", 
+                                           padding=15, style='Nex.TLabelframe')
+        self.members_frame.pack(fill='both', expand=True)
+        
+        self.members_listbox = self.create_squad_listbox(self.members_frame)
+        self.members_listbox.bind('<Double-Button-1>', lambda e: self.remove_selected_from_squad())
+        self.member_names = []
+        
+        members_btn_frame = ttk.Frame(self.members_frame, style='Nex.TFrame')
+        members_btn_frame.pack(fill='x', pady=(10, 0))
+        
+        ttk.Button(members_btn_frame, text="🎮 Change Class", 
+                  command=lambda: self.set_class_for_selected(self.members_listbox, self.member_names),
+                  style='Nex.TButton').pack(side='left', padx=(0, 5))
+        ttk.Button(members_btn_frame, text="➖ Remove", 
+                  command=self.remove_selected_from_squad,
+                  style='Nex.TButton').pack(side='left')
+    
+    def create_squad_listbox(self, parent):
+        """Create a themed multi-select listbox with a scrollbar"""
+        list_container = ttk.Frame(parent, style='NexCard.TFrame')
+        list_container.pack(fill='both', expand=True)
+        
+        # Listboxes only draw the visible lines, so long rosters stay fast
+        listbox = tk.Listbox(list_container, selectmode='extended',
+                             exportselection=False,
+                             font=self.body_font,
+                             bg=NexClanTheme.MEDIUM_GRAY,
+                             fg=NexClanTheme.WHITE,
+                             selectbackground=NexClanTheme.FLAME_ORANGE,
+                             selectforeground=NexClanTheme.WHITE,
+                             relief='flat',
+                             highlightthickness=0,
+                             borderwidth=0)
+        scrollbar = ttk.Scrollbar(list_container, orient='vertical', 
+                                command=listbox.yview,
+                                style='Nex.Vertical.TScrollbar')
+        listbox.configure(yscrollcommand=scrollbar.set)
+        
+        listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        scrollbar.pack(side='right', fill='y', padx=(0, 5), pady=5)
+        return listbox
     
     # Continue with remaining methods...
+    @unless_loading
     def on_prize_mode_change(self):
         """Handle prize mode change"""
-        self.setup_prize_config()
+        self.model.set_prize_mode(self.prize_mode.get())
+        self.request_refresh('prize_config')
+    
+    def on_prize_pool_change(self, *args):
+        """Push the prize pool entry into the model"""
+        if self.loading_file is not None:
+            return  # Reset from the loaded war when it is shown
+        try:
+            self.model.set_prize_pool(self.prize_pool.get())
+        except tk.TclError:
+            pass  # Ignore partially typed amounts
     
     def update_ranked_prize(self, index, value):
         """Update ranked prize amount"""
+        if self.loading_file is not None:
+            return
         try:
-            if 0 <= index < len(self.ranked_prizes):
-                self.ranked_prizes[index]['amount'] = int(value)
+            self.model.set_ranked_prize(index, value)
         except (ValueError, TypeError):
             pass
     
+    @unless_loading
     def add_rank(self):
         """Add a new rank to the prize structure"""
-        next_rank = len(self.ranked_prizes) + 1
-        new_prize = {
-            "rank": next_rank,
-            "amount": 10000,
-            "label": f"{self.get_ordinal(next_rank)} Place"
-        }
-        self.ranked_prizes.append(new_prize)
-        self.setup_ranked_prize_config()
+        self.model.add_rank()
+        self.request_refresh('prize_config')
     
+    @unless_loading
     def remove_rank(self):
         """Remove the last rank from the prize structure"""
         if len(self.ranked_prizes) > 1:
-            self.ranked_prizes.pop()
-            self.setup_ranked_prize_config()
-    
-    def get_ordinal(self, n):
-        """Get ordinal string for a number (1st, 2nd, 3rd, etc.)"""
-        if 10 <= n % 100 <= 20:
-            suffix = 'th'
-        else:
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
-        return f"{n}{suffix}"
+            self.model.remove_rank()
+            self.request_refresh('prize_config')
     
+    @unless_loading
     def add_participant(self, event=None):
         """Add a new participant"""
         name = self.participant_entry.get().strip()
         if not name:
             return
         
-        # Check if participant already exists
-        if any(p['name'] == name for p in self.participants):
-            messagebox.showwarning("Duplicate Participant", f"'{name}' is already in the list.")
+        try:
+            self.model.add_participant(name)
+        except ValueError as e:
+            messagebox.showwarning("Duplicate Participant", str(e))
             return
         
-        # Add new participant
-        participant = {
-            'name': name,
-            'attendance': [False] * 14,
-            'total_days': 0,
-            'payout': 0.0,
-            'rank': 0,
-            'class_icon': None  # For roster management
-        }
-        
-        self.participants.append(participant)
         self.participant_listbox.insert(tk.END, name)
         self.participant_entry.delete(0, tk.END)
         
-        self.refresh_attendance_grid()
+        self.request_refresh('attendance')
     
+    @unless_loading
     def remove_participant(self):
         """Remove selected participant"""
         selection = self.participant_listbox.curselection()
@@ -845,239 +1018,503 @@ class ClanWarTracker:
             return
         
         index = selection[0]
-        participant_name = self.participants[index]['name']
+        participant_name = self.participants[index].name
         
         # Confirm removal
         if messagebox.askyesno("Confirm Removal", f"Remove '{participant_name}' from the list?"):
-            self.participants.pop(index)
+            self.model.remove_participant(index)
+            self.participant_listbox.delete(index)
+            self.request_refresh('attendance', 'squad_details')
+    
+    @unless_loading
+    def rename_participant(self):
+        """Rename selected participant"""
+        selection = self.participant_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Please select a participant to rename.")
+            return
+        
+        index = selection[0]
+        old_name = self.participants[index].name
+        
+        # Get new name
+        new_name = simpledialog.askstring("Rename Participant", f"Enter new name for '{old_name}':")
+        if new_name and new_name.strip():
+            try:
+                self.model.rename_participant(index, new_name.strip())
+            except ValueError as e:
+                messagebox.showwarning("Duplicate Name", str(e))
+                return
+            
             self.participant_listbox.delete(index)
-            self.refresh_attendance_grid()
+            self.participant_listbox.insert(index, new_name.strip())
+            self.participant_listbox.selection_set(index)
+            self.request_refresh('attendance', 'squad_details')
     
-    def update_attendance(self, participant_name, day, var):
+    @unless_loading
+    def update_attendance(self, index, day, value):
         """Update attendance for a participant"""
-        # Find participant and update attendance
-        for participant in self.participants:
-            if participant['name'] == participant_name:
-                participant['attendance'][day] = var.get()
-                participant['total_days'] = sum(participant['attendance'])
-                break
+        if not self.model.set_attendance(index, day, value):
+            return
         
-        self.refresh_attendance_grid()
+        # Only the toggled cell, its total and the day count are redrawn
+        if self.attendance_grid is not None:
+            self.attendance_grid.update_cell(index, day)
     
+    @unless_loading
     def edit_dates(self):
         """Open dialog to edit the war dates"""
         dialog = DateEditDialog(self.root, self.war_dates)
         if dialog.result:
-            self.war_dates = dialog.result
-            self.refresh_attendance_grid()
+            self.model.set_war_dates(dialog.result)
+            self.request_refresh('attendance')
     
+    @unless_loading
     def reset_dates(self):
         """Reset dates to start from today"""
         if messagebox.askyesno("Reset Dates", "Reset all dates to start from today? This will clear all attendance data."):
-            self.war_dates = self.generate_war_dates()
             # Reset all attendance data
-            for participant in self.participants:
-                participant['attendance'] = [False] * 14
-                participant['total_days'] = 0
-            self.refresh_attendance_grid()
+            self.model.reset_attendance(generate_war_dates(length=self.model.war_length))
+            self.request_refresh('attendance')
+    
+    @unless_loading
+    def change_war_length(self):
+        """Lengthen or shorten the war period to the selected number of days"""
+        length = self.war_length.get()
+        if length == self.model.war_length:
+            return
+        if length < self.model.war_length and not messagebox.askyesno(
+                "Change War Length",
+                f"Shorten the war to {length} days? Attendance after day {length} will be cleared."):
+            self.war_length.set(self.model.war_length)
+            return
+        self.model.set_war_length(length)
+        self.request_refresh('attendance')
+    
+    EXPORT_FILETYPES = [("Text files", "*.txt"), ("CSV files", "*.csv"), ("TSV files", "*.tsv"),
+                        ("JSON Lines", "*.jsonl"), ("All files", "*.*")]
     
     def export_results(self):
-        """Export results to a text file"""
+        """Export results to a text report, or a CSV/TSV/JSON Lines table"""
         if not self.participants:
             messagebox.showwarning("No Data", "No participants to export.")
             return
         
         filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=self.EXPORT_FILETYPES,
             title="Export Results"
         )
         
         if filename:
+            self.write_results(filename)
+    
+    def write_results(self, filename):
+        """Write the results to filename, as a table if its extension is .csv, .tsv or .jsonl"""
+        if os.path.splitext(filename)[1].lower() not in EXPORT_FORMATS:
             try:
-                # Get results from calculate window or generate them
                 results = self.generate_export_results()
                 with open(filename, 'w') as f:
                     f.write(results)
                 messagebox.showinfo("Export Successful", f"Results exported to {filename}")
             except Exception as e:
                 messagebox.showerror("Export Error", f"Failed to export results: {str(e)}")
+            return
+        
+        # Rows are streamed to disk on the file worker from a snapshot of the roster
+        model = self.model
+        entries = [(participant.name, participant.mask) for participant in model.participants]
+        war_dates = list(model.war_dates)
+        settings = (model.prize_mode, model.prize_pool, [dict(prize) for prize in model.ranked_prizes])
+        
+        def write():
+            rows = result_rows(entries, len(war_dates), *settings)
+            return export_rows(rows, filename, war_dates)
+        
+        def failed(e):
+            messagebox.showerror("Export Error", f"Failed to export results: {str(e)}")
+        
+        self.file_worker.submit("📤 Exporting...", write,
+                                lambda count: messagebox.showinfo("Export Successful",
+                                                                  f"{count} results exported to {filename}"),
+                                failed)
     
     def generate_export_results(self):
         """Generate results text for export"""
-        results = []
-        results.append("NEX CLAN WAR TRACKER - RESULTS")
-        results.append("=" * 60)
-        results.append(f"War Period: {self.war_dates[0]} to {self.war_dates[-1]}")
-        results.append("")
-        
-        if self.prize_mode.get() == "equal":
-            results.extend(self.generate_equal_results())
-        else:
-            results.extend(self.generate_ranked_results())
-        
-        results.append("")
-        results.append("Created by Nex Clan")
-        return "\n".join(results)
+        return self.model.generate_export_results()
     
     def generate_equal_results(self):
         """Generate equal distribution results"""
-        prize_total = self.prize_pool.get()
-        total_attendance_days = sum(p['total_days'] for p in self.participants)
-        
-        if total_attendance_days == 0:
-            return ["No attendance recorded."]
-        
-        per_day_value = prize_total / total_attendance_days
-        
-        results = []
-        results.append("EQUAL DISTRIBUTION CALCULATION")
-        results.append("-" * 40)
-        results.append(f"Total Prize Pool: ${prize_total:,.2f}")
-        results.append(f"Total Attendance Days: {total_attendance_days}")
-        results.append(f"Value per Day: ${per_day_value:,.2f}")
-        results.append("")
-        results.append("INDIVIDUAL PAYOUTS:")
-        results.append("-" * 40)
-        
-        for participant in self.participants:
-            payout = participant['total_days'] * per_day_value
-            results.append(f"{participant['name']:<25} {participant['total_days']:>2} days  ${payout:>12,.2f}")
-        
-        return results
+        return self.model.generate_equal_results()
     
     def generate_ranked_results(self):
         """Generate ranked distribution results"""
-        sorted_participants = sorted(self.participants, key=lambda p: p['total_days'], reverse=True)
-        
-        results = []
-        results.append("RANKED PRIZE DISTRIBUTION")
-        results.append("-" * 40)
-        results.append("PRIZE STRUCTURE:")
-        
-        for prize in self.ranked_prizes:
-            results.append(f"{prize['label']:<15} ${prize['amount']:>12,}")
-        
-        results.append("")
-        results.append("RANKINGS AND PAYOUTS:")
-        results.append("-" * 40)
-        
-        current_rank = 1
-        prev_attendance = None
-        
-        for i, participant in enumerate(sorted_participants):
-            if prev_attendance is not None and participant['total_days'] != prev_attendance:
-                current_rank = i + 1
-            
-            if current_rank <= len(self.ranked_prizes):
-                payout = self.ranked_prizes[current_rank - 1]['amount']
-                rank_label = self.ranked_prizes[current_rank - 1]['label']
-            else:
-                payout = 0
-                rank_label = f"{self.get_ordinal(current_rank)} Place"
-            
-            results.append(f"{rank_label:<15} {participant['name']:<20} {participant['total_days']:>2} days  ${payout:>12,}")
-            prev_attendance = participant['total_days']
-        
-        return results
+        return self.model.generate_ranked_results()
     
+    @unless_loading
     def save_data(self):
-        """Save application data to JSON file"""
+        """Save application data to a JSON or compact (.nxwar) war file"""
         filename = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[("JSON files", "*.json"), ("Compact war files", "*.nxwar"), ("All files", "*.*")],
             title="Save Clan War Data"
         )
         
         if filename:
-            try:
-                data = {
-                    'participants': self.participants,
-                    'squads': self.squads,
-                    'prize_pool': self.prize_pool.get(),
-                    'war_dates': self.war_dates,
-                    'prize_mode': self.prize_mode.get(),
-                    'ranked_prizes': self.ranked_prizes
-                }
-                
-                with open(filename, 'w') as f:
-                    json.dump(data, f, indent=2)
-                
+            if not self.journal or self.journal.snapshot_path != filename:
+                self.close_journal()
+                self.journal = self.open_journal(WarJournal(filename))
+            self.request_save(notify=True)
+    
+    def request_save(self, notify=False):
+        """Write a snapshot of the open war in the background, merging saves requested mid-flight"""
+        if self.save_in_flight:
+            self.save_queued = bool(self.save_queued) or notify
+            return
+        
+        journal = self.journal
+        model, version = journal.model, journal.model.version
+        data, seq = journal.snapshot()
+        self.save_in_flight = True
+        
+        def done(_):
+            journal.finish_compaction(seq)
+            model.mark_saved(version)
+            if os.path.exists(self.RECOVERY_FILE):
+                os.remove(self.RECOVERY_FILE)  # The war now lives in a real file
+            if notify:
                 # Save last file reference
                 with open('last_saved_file.txt', 'w') as f:
-                    f.write(filename)
+                    f.write(journal.snapshot_path)
                 
-                self.last_saved_file = filename
-                messagebox.showinfo("Save Successful", f"Data saved to {filename}")
-            except Exception as e:
-                messagebox.showerror("Save Error", f"Failed to save data: {str(e)}")
+                self.last_saved_file = journal.snapshot_path
+                messagebox.showinfo("Save Successful", f"Data saved to {journal.snapshot_path}")
+            self.save_finished()
+        
+        def failed(e):
+            journal.abort_compaction()
+            messagebox.showerror("Save Error", f"Failed to save data: {str(e)}")
+            self.save_finished()
+        
+        self.file_worker.submit("💾 Saving...", lambda: journal.write_snapshot(data), done, failed)
+    
+    def autosave(self):
+        """Save edits in the background: into the open war file, or the recovery file for an unsaved war"""
+        if self.journal:
+            self.request_save()
+            return
+        
+        model, version = self.model, self.model.version
+        data = model.to_dict()
+        # A failed autosave is retried after the next edit
+        self.file_worker.submit("💾 Autosaving...", lambda: write_war(self.RECOVERY_FILE, data),
+                                lambda _: model.mark_saved(version), lambda e: None)
+    
+    def save_finished(self):
+        """Start the save that was requested while the last one was running"""
+        self.save_in_flight = False
+        if self.save_queued is not None and self.journal:
+            notify, self.save_queued = self.save_queued, None
+            self.request_save(notify)
+        else:
+            self.save_queued = None
     
+    @unless_loading
     def load_data(self):
-        """Load application data from JSON file"""
+        """Load application data from a JSON or compact war file"""
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=[("JSON files", "*.json"), ("Compact war files", "*.nxwar"), ("All files", "*.*")],
             title="Load Clan War Data"
         )
         
         if filename:
             self.load_specific_file(filename)
     
-    def load_specific_file(self, filename):
-        """Load specific file"""
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+    def load_specific_file(self, filename, recovery=False):
+        """Load specific file (recovery=True opens an autosaved war without journaling or remembering it)
+
+        Edits are refused until the file has been read and its journal attached,
+        so nothing is changed on a partly loaded (and not yet journaled) war.
+        
+        JSON rows are shown in batches while the file is read, once its war
+        dates are known. Older saves store the dates after the roster, so
+        their rows appear only when the whole file has been read; saving
+        such a file once writes the settings first, and it then loads
+        progressively.
+        """
+        self.close_journal()
+        self.loading_file = filename
+        previous = self.model
+        loading = None  # model shown while a JSON file streams in
+        
+        def read(report):
+            with open(filename, 'rb') as f:
+                binary = is_binary(f.read(4))
+            journal = WarJournal(filename)
+            if binary:
+                # Parse and replay into a fresh model; the UI keeps the old one until done
+                model = WarModel()
+                journal.load(model)
+                return model, journal
             
-            self.participants = data.get('participants', [])
-            self.squads = data.get('squads', [])
-            self.prize_pool.set(data.get('prize_pool', 0.0))
-            self.war_dates = data.get('war_dates', self.generate_war_dates())
-            self.prize_mode.set(data.get('prize_mode', 'equal'))
-            self.ranked_prizes = data.get('ranked_prizes', self.ranked_prizes)
+            # JSON streams in batches so rows appear before the file is read, once
+            # the war dates are known; only the first war of a season archive is loaded
+            archive = is_archive(filename)
+            for _, settings, participants, squads, done in iter_war_batches(filename, self.LOAD_BATCH, wars=1,
+                                                                             hold_until='war_dates'):
+                if done:
+                    # Journal entries are read here; done only applies them
+                    entries = None if archive else journal.read_entries(settings.get('journal_seq', 0))
+                    return settings, participants, squads, archive, journal, entries
+                report((dict(settings), participants))
+            raise ValueError("No war found in file")
+        
+        def show_batch(batch):
+            nonlocal loading
+            settings, participants = batch
+            if loading is None:
+                loading = WarModel()
+                loading.update_settings(settings)
+                loading.recount_attendance()
+                self.show_model(loading)
+            loading.extend_participants(participants)
+            self.request_refresh('participant_list', 'attendance')
+        
+        def done(result):
+            if isinstance(result[0], WarModel):
+                model, journal = result
+                archive = held_back = False
+            else:
+                settings, participants, squads, archive, journal, entries = result
+                model = loading or WarModel()
+                try:
+                    model.extend_participants(participants)
+                    model.squads = squads
+                    model.update_settings(settings)
+                    model.reindex()
+                    if archive:
+                        journal = None
+                    else:
+                        journal.apply_entries(model, entries, settings.get('journal_seq', 0))
+                except Exception as e:
+                    failed(e)
+                    return
+                # No rows could be shown early when the file lists the roster before the war dates
+                held_back = loading is None and len(participants) > self.LOAD_BATCH
+            model.mark_saved()
+            self.loading_file = None
+            self.show_model(model)
             
-            # Refresh UI
-            self.participant_listbox.delete(0, tk.END)
-            for participant in self.participants:
-                self.participant_listbox.insert(tk.END, participant['name'])
+            if recovery:
+                messagebox.showinfo("Recovery Successful",
+                                    "The unsaved war was recovered. Save it to a file to keep it.")
+                return
             
-            self.squad_listbox.delete(0, tk.END)
-            for squad in self.squads:
-                self.squad_listbox.insert(tk.END, squad['name'])
+            if archive:
+                messagebox.showinfo("Load Successful",
+                                    f"Loaded the first war from the archive {filename}.\n"
+                                    "Save it to a new file to keep editing.")
+                return
             
-            self.setup_prize_config()
-            self.refresh_attendance_grid()
-            self.refresh_squad_details()
+            self.journal = self.open_journal(journal)
             
             # Save as last file
             with open('last_saved_file.txt', 'w') as f:
                 f.write(filename)
             
             self.last_saved_file = filename
-            messagebox.showinfo("Load Successful", f"Data loaded from {filename}")
-        except Exception as e:
+            message = f"Data loaded from {filename}"
+            if held_back:
+                message += ("\n\nThis file was saved by an older version, so it is only shown once fully "
+                            "read. Save it again to have its rows appear while it loads.")
+            messagebox.showinfo("Load Successful", message)
+        
+        def failed(e):
+            self.loading_file = None
+            if loading is not None:
+                self.show_model(previous)  # Not a half-loaded roster
             messagebox.showerror("Load Error", f"Failed to load data: {str(e)}")
+        
+        self.file_worker.submit("📁 Loading...", read, done, failed, on_progress=show_batch)
+    
+    @unless_loading
+    def save_to_archive(self):
+        """Store a copy of the current war in a war history archive"""
+        path = filedialog.asksaveasfilename(
+            defaultextension=".db",
+            filetypes=[("War archives", "*.db"), ("All files", "*.*")],
+            confirmoverwrite=False,
+            title="Save War to Archive"
+        )
+        if not path:
+            return
+        
+        default_name = self.war_dates[0] if self.war_dates else ""
+        name = simpledialog.askstring("Archive War", "Name for this war in the archive:",
+                                      initialvalue=default_name)
+        if not name or not name.strip():
+            return
+        name = name.strip()
+        data = self.model.to_dict()
+        self.archive_path = path
+        
+        def store():
+            from clan_war_archive import WarArchive  # Archive support loads on first use
+            model = WarModel()
+            model.update_from_dict(data)
+            with WarArchive(path) as archive:
+                archive.save_war(model, name)
+        
+        def failed(e):
+            messagebox.showerror("Archive Error", f"Failed to archive war: {str(e)}")
+        
+        self.file_worker.submit("🗄️ Archiving...", store,
+                                lambda _: messagebox.showinfo("Archive Successful",
+                                                              f"War '{name}' saved to {path}"),
+                                failed)
+    
+    @unless_loading
+    def load_from_archive(self):
+        """Pick a war from a war history archive and load a copy of it"""
+        path = filedialog.askopenfilename(
+            filetypes=[("War archives", "*.db"), ("All files", "*.*")],
+            title="Load War from Archive"
+        )
+        if not path:
+            return
+        self.archive_path = path
+        
+        def list_wars():
+            from clan_war_archive import WarArchive  # Archive support loads on first use
+            with WarArchive(path) as archive:
+                return archive.list_wars()
+        
+        def choose(wars):
+            if not wars:
+                messagebox.showinfo("Archive Empty", f"No wars are stored in {path}")
+                return
+            war_id = ArchiveDialog(self.root, wars).result
+            if war_id is None:
+                return
+            
+            def read():
+                from clan_war_archive import WarArchive
+                with WarArchive(path) as archive:
+                    return archive.load_war(war_id)
+            
+            def done(model):
+                self.close_journal()
+                model.mark_saved()
+                self.show_model(model)
+                messagebox.showinfo("Load Successful",
+                                    "War loaded from the archive.\nSave it to a file to keep editing.")
+            
+            self.file_worker.submit("🗄️ Loading...", read, done, failed)
+        
+        def failed(e):
+            messagebox.showerror("Archive Error", f"Failed to read archive: {str(e)}")
+        
+        self.file_worker.submit("🗄️ Reading archive...", list_wars, choose, failed)
+    
+    def open_leaderboard(self):
+        """Open the cross-war leaderboard for the current war history archive"""
+        path = self.archive_path or filedialog.askopenfilename(
+            filetypes=[("War archives", "*.db"), ("All files", "*.*")],
+            title="Open War Archive"
+        )
+        if path:
+            self.archive_path = path
+            LeaderboardWindow(self.root, self, path)
     
+    def show_model(self, model):
+        """Make model the current war and repaint every view"""
+        self.model = model
+        self.autosaver.watch(model)
+        self.prize_pool.set(model.prize_pool)
+        self.prize_mode.set(model.prize_mode)
+        self.request_refresh('participant_list', 'squad_list', 'prize_config',
+                             'attendance', 'squad_details')
+    
+    def open_journal(self, journal):
+        """Journal edits to the current model, compacting in the background"""
+        journal.attach(self.model)
+        journal.compact_due = self.request_save
+        return journal
+    
+    def close_journal(self):
+        """Stop journaling and fold pending entries into the war file in the background"""
+        if not self.journal:
+            return
+        
+        journal, self.journal = self.journal, None
+        self.save_queued = None
+        if not journal.pending:
+            journal.detach()
+            return
+        
+        data, seq = journal.snapshot()
+        journal.detach()
+        
+        def failed(e):
+            messagebox.showerror("Save Error", f"Failed to save data: {str(e)}")
+        
+        self.file_worker.submit("💾 Saving...", lambda: journal.write_snapshot(data),
+                                lambda _: journal.finish_compaction(seq), failed)
+    
+    def open_diagnostics(self):
+        """Open the latency diagnostics window"""
+        DiagnosticsWindow(self.root, self)
+    
+    def diagnostics(self):
+        """Tracker state added to latency reports"""
+        return {'refresh_views': self.refresh_scheduler.stats(), 'startup': self.startup.report()}
+    
+    def on_file_worker_busy(self, message):
+        """Show or hide the background I/O progress indicator"""
+        if message:
+            self.status_label.configure(text=message)
+            if not self.status_frame.winfo_ismapped():
+                self.status_frame.pack(side='right', padx=(0, 15))
+                self.progress_bar.start(12)
+        else:
+            self.progress_bar.stop()
+            self.status_frame.pack_forget()
+    
+    def on_close(self):
+        """Finish pending writes and compact the journal before the window closes"""
+        try:
+            self.file_worker.shutdown()
+            if self.journal:
+                self.journal.close()
+            elif self.model.dirty:
+                # Offered for recovery on the next start
+                self.model.save(self.RECOVERY_FILE)
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Failed to save data: {str(e)}")
+        if self.monitor and self.monitor.dump_path:
+            try:
+                self.monitor.dump(self.monitor.dump_path, self.diagnostics())
+            except OSError:
+                pass  # Diagnostics never block closing
+        self.root.destroy()
+    
+    @unless_loading
     def add_squad(self, event=None):
         """Add a new squad"""
         name = self.squad_entry.get().strip()
         if not name:
             return
         
-        # Check if squad already exists
-        if any(s['name'] == name for s in self.squads):
-            messagebox.showwarning("Duplicate Squad", f"'{name}' already exists.")
+        try:
+            self.model.add_squad(name)
+        except ValueError as e:
+            messagebox.showwarning("Duplicate Squad", str(e))
             return
         
-        # Add new squad
-        squad = {
-            'name': name,
-            'members': []
-        }
-        
-        self.squads.append(squad)
         self.squad_listbox.insert(tk.END, name)
         self.squad_entry.delete(0, tk.END)
     
+    @unless_loading
     def rename_squad(self):
         """Rename selected squad"""
         selection = self.squad_listbox.curselection()
@@ -1086,23 +1523,24 @@ class ClanWarTracker:
             return
         
         index = selection[0]
-        old_name = self.squads[index]['name']
+        old_name = self.squads[index].name
         
         # Get new name
         new_name = simpledialog.askstring("Rename Squad", f"Enter new name for '{old_name}':")
         if new_name and new_name.strip():
             new_name = new_name.strip()
             
-            # Check if name already exists
-            if any(s['name'] == new_name for s in self.squads):
-                messagebox.showwarning("Duplicate Name", f"'{new_name}' already exists.")
+            try:
+                self.model.rename_squad(index, new_name)
+            except ValueError as e:
+                messagebox.showwarning("Duplicate Name", str(e))
                 return
             
-            self.squads[index]['name'] = new_name
             self.squad_listbox.delete(index)
             self.squad_listbox.insert(index, new_name)
             self.squad_listbox.selection_set(index)
     
+    @unless_loading
     def delete_squad(self):
         """Delete selected squad"""
         selection = self.squad_listbox.curselection()
@@ -1111,148 +1549,616 @@ class ClanWarTracker:
             return
         
         index = selection[0]
-        squad_name = self.squads[index]['name']
+        squad_name = self.squads[index].name
         
         if messagebox.askyesno("Confirm Deletion", f"Delete squad '{squad_name}'?"):
-            self.squads.pop(index)
+            self.model.delete_squad(index)
             self.squad_listbox.delete(index)
-            self.refresh_squad_details()
+            self.request_refresh('squad_details')
     
     def on_squad_select(self, event):
         """Handle squad selection"""
-        self.refresh_squad_details()
+        self.request_refresh('squad_details')
     
     def refresh_squad_details(self):
         """Refresh the squad details panel with class icons"""
-        # Clear existing content
-        for widget in self.squad_details_frame.winfo_children():
-            widget.destroy()
-        
+        if not self.roster_built:
+            return
         selection = self.squad_listbox.curselection()
         if not selection:
-            ttk.Label(self.squad_details_frame, 
-                     text="Select a squad from the left to view and manage members with class icons",
-                     style='NexHeading.TLabel').pack(expand=True)
+            self.squad_panel.pack_forget()
+            self.squad_hint_label.pack(expand=True)
             return
         
-        squad_index = selection[0]
-        squad = self.squads[squad_index]
+        squad = self.squads[selection[0]]
         
-        # Squad name header
-        ttk.Label(self.squad_details_frame, text=f"🔥 Squad: {squad['name']} 🔥", 
-                 style='NexTitle.TLabel').pack(pady=(0, 20))
+        self.squad_hint_label.pack_forget()
+        self.squad_panel.pack(fill='both', expand=True)
+        self.squad_title_label.configure(text=f"🔥 Squad: {squad.name} 🔥")
         
-        # Available participants section
-        available_frame = ttk.LabelFrame(self.squad_details_frame, text="Available Participants", 
-                                       padding=15, style='Nex.TLabelframe')
-        available_frame.pack(fill='x', pady=(0, 15))
+        # Available participants with class icon
+        available_participants = self.model.available_participants(squad)
+        self.available_names = [participant.name for participant in available_participants]
+        available_rows = []
+        for participant in available_participants:
+            class_icon = participant.class_icon or 'none'
+            if class_icon != 'none' and class_icon in ClassIcons.CLASSES:
+                available_rows.append(f"{ClassIcons.CLASSES[class_icon]['icon']} {participant.name}")
+            else:
+                available_rows.append(participant.name)
+        
+        self.available_frame.configure(text=f"Available Participants ({len(available_rows)})")
+        self.fill_listbox(self.available_listbox, available_rows or ["No available participants"])
+        
+        # Squad members with class icon and class name
+        self.member_names = []
+        member_rows = []
+        for member_name in squad.members:
+            participant = self.model.get_participant(member_name)
+            if not participant:
+                continue
+            
+            class_icon = participant.class_icon or 'none'
+            if class_icon != 'none' and class_icon in ClassIcons.CLASSES:
+                class_data = ClassIcons.CLASSES[class_icon]
+                member_rows.append(f"{class_data['icon']} {member_name}  —  {class_data['name']}")
+            else:
+                member_rows.append(f"{member_name}  —  No class assigned")
+            self.member_names.append(member_name)
+        
+        self.members_frame.configure(text=f"Squad Members ({len(member_rows)})")
+        self.fill_listbox(self.members_listbox, member_rows or ["No members assigned"])
+    
+    def fill_listbox(self, listbox, rows):
+        """Replace listbox contents in one call, keeping the scroll position"""
+        top = listbox.yview()[0]
+        listbox.delete(0, tk.END)
+        listbox.insert(tk.END, *rows)
+        listbox.yview_moveto(top)
+    
+    def selected_names(self, listbox, names):
+        """Participant names for the selected listbox rows"""
+        return [names[index] for index in listbox.curselection() if index < len(names)]
+    
+    @unless_loading
+    def add_selected_to_squad(self):
+        """Add the selected available participants to the squad"""
+        selection = self.squad_listbox.curselection()
+        names = self.selected_names(self.available_listbox, self.available_names)
+        if not selection or not names:
+            return
         
-        available_participants = [p for p in self.participants if p['name'] not in squad['members']]
+        for name in names:
+            self.model.add_to_squad(selection[0], name)
+        self.request_refresh('squad_details')
+    
+    @unless_loading
+    def remove_selected_from_squad(self):
+        """Remove the selected members from the squad"""
+        selection = self.squad_listbox.curselection()
+        names = self.selected_names(self.members_listbox, self.member_names)
+        if not selection or not names:
+            return
         
-        if available_participants:
-            for participant in available_participants:
-                participant_frame = ttk.Frame(available_frame, style='Nex.TFrame')
-                participant_frame.pack(fill='x', pady=5)
-                
-                # Participant info with class icon
-                info_frame = ttk.Frame(participant_frame, style='Nex.TFrame')
-                info_frame.pack(side='left', fill='x', expand=True)
-                
-                class_icon = participant.get('class_icon', 'none')
-                if class_icon != 'none' and class_icon in ClassIcons.CLASSES:
-                    icon_text = f"{ClassIcons.CLASSES[class_icon]['icon']} {participant['name']}"
-                else:
-                    icon_text = participant['name']
-                
-                ttk.Label(info_frame, text=icon_text, style='NexBody.TLabel').pack(side='left')
-                
-                # Buttons
-                btn_frame = ttk.Frame(participant_frame, style='Nex.TFrame')
-                btn_frame.pack(side='right')
-                
-                ttk.Button(btn_frame, text="🎮 Set Class", 
-                          command=lambda p=participant: self.set_class_icon(p),
-                          style='Nex.TButton').pack(side='left', padx=(0, 5))
-                ttk.Button(btn_frame, text="➕ Add to Squad", 
-                          command=lambda p=participant['name']: self.add_to_squad(squad_index, p),
-                          style='Nex.TButton').pack(side='left')
-        else:
-            ttk.Label(available_frame, text="No available participants", 
-                     style='NexBody.TLabel').pack()
+        for name in names:
+            self.model.remove_from_squad(selection[0], name)
+        self.request_refresh('squad_details')
+    
+    def set_class_for_selected(self, listbox, names):
+        """Open the class dialog for the first selected participant"""
+        selected = self.selected_names(listbox, names)
+        if not selected:
+            messagebox.showwarning("No Selection", "Please select a participant first.")
+            return
         
-        # Squad members section
-        members_frame = ttk.LabelFrame(self.squad_details_frame, text="Squad Members", 
-                                     padding=15, style='Nex.TLabelframe')
-        members_frame.pack(fill='both', expand=True)
-        
-        if squad['members']:
-            for member_name in squad['members']:
-                # Find participant data
-                participant = next((p for p in self.participants if p['name'] == member_name), None)
-                if not participant:
-                    continue
-                
-                member_frame = ttk.Frame(members_frame, style='NexCard.TFrame')
-                member_frame.pack(fill='x', pady=5, padx=5)
-                
-                # Member info with class icon
-                info_frame = ttk.Frame(member_frame, style='Nex.TFrame')
-                info_frame.pack(side='left', fill='x', expand=True, padx=10, pady=5)
-                
-                class_icon = participant.get('class_icon', 'none')
-                if class_icon != 'none' and class_icon in ClassIcons.CLASSES:
-                    icon_text = f"{ClassIcons.CLASSES[class_icon]['icon']} {member_name}"
-                    class_name = ClassIcons.CLASSES[class_icon]['name']
-                    display_text = f"{icon_text}\n{class_name}"
-                else:
-                    display_text = f"{member_name}\nNo class assigned"
-                
-                ttk.Label(info_frame, text=display_text, style='NexBody.TLabel').pack(side='left')
-                
-                # Buttons
-                btn_frame = ttk.Frame(member_frame, style='Nex.TFrame')
-                btn_frame.pack(side='right', padx=10, pady=5)
-                
-                ttk.Button(btn_frame, text="🎮 Change Class", 
-                          command=lambda p=participant: self.set_class_icon(p),
-                          style='Nex.TButton').pack(pady=2)
-                ttk.Button(btn_frame, text="➖ Remove", 
-                          command=lambda m=member_name: self.remove_from_squad(squad_index, m),
-                          style='Nex.TButton').pack(pady=2)
-        else:
-            ttk.Label(members_frame, text="No members assigned", 
-                     style='NexBody.TLabel').pack()
+        self.set_class_icon(self.model.get_participant(selected[0]))
     
+    @unless_loading
     def set_class_icon(self, participant):
         """Set class icon for participant"""
-        dialog = ClassIconDialog(self.root, participant.get('class_icon', 'none'))
+        dialog = ClassIconDialog(self.root, participant.class_icon or 'none')
         if dialog.result:
-            participant['class_icon'] = dialog.result
-            self.refresh_squad_details()
+            self.model.set_class_icon(participant, dialog.result)
+            self.request_refresh('squad_details')
     
+    @unless_loading
     def add_to_squad(self, squad_index, participant_name):
         """Add participant to squad"""
-        self.squads[squad_index]['members'].append(participant_name)
-        self.refresh_squad_details()
+        self.model.add_to_squad(squad_index, participant_name)
+        self.request_refresh('squad_details')
     
+    @unless_loading
     def remove_from_squad(self, squad_index, participant_name):
         """Remove participant from squad"""
-        self.squads[squad_index]['members'].remove(participant_name)
-        self.refresh_squad_details()
+        self.model.remove_from_squad(squad_index, participant_name)
+        self.request_refresh('squad_details')
     
     def run(self):
         """Start the application"""
         self.root.mainloop()
 
 
-class CalculateWindow:
-    """Resizable calculate window"""
+class RefreshScheduler:
+    """Coalesces view refreshes into a single repaint per idle cycle.
     
-    def __init__(self, parent, tracker):
-        self.tracker = tracker
-        
-        # Create window
-        self.window = tk.Toplevel(parent)
+    Handlers mark views dirty instead of repainting them; every dirty view
+    is repainted once by after_idle, however many times it was marked.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self.views = {}
+        self.dirty = set()
+        self.pending = None
+        self.requested = {}
+        self.performed = {}
+    
+    def register(self, name, callback):
+        """Register a view; views repaint in registration order"""
+        self.views[name] = callback
+        self.requested[name] = 0
+        self.performed[name] = 0
+    
+    def mark_dirty(self, *names):
+        """Mark views as needing a repaint"""
+        for name in names:
+            self.requested[name] += 1
+            self.dirty.add(name)
+        
+        if self.pending is None:
+            self.pending = self.root.after_idle(self.flush)
+    
+    def flush(self):
+        """Repaint every dirty view once"""
+        self.pending = None
+        dirty, self.dirty = self.dirty, set()
+        for name, callback in self.views.items():
+            if name in dirty:
+                self.performed[name] += 1
+                callback()
+    
+    def stats(self):
+        """Requested versus performed refreshes per view"""
+        return {name: {'requested': self.requested[name], 'performed': self.performed[name]}
+                for name in self.views}
+
+
+class Autosaver:
+    """Triggers a background save once edits settle, at most once per interval.
+    
+    Every model change restarts the settle timer; when it expires the save
+    runs unless the previous autosave was less than the interval ago, in
+    which case it is deferred to the end of the interval.
+    """
+    
+    SETTLE_MS = 2000
+    
+    def __init__(self, root, save, enabled, interval):
+        self.root = root
+        self.save = save            # starts a background save
+        self.enabled = enabled      # tk.BooleanVar
+        self.interval = interval    # tk.IntVar, seconds
+        self.model = None
+        self.pending = None
+        self.last_change = 0.0
+        self.last_save = 0.0
+    
+    def watch(self, model):
+        """Track changes to model instead of the previous one"""
+        if self.model is not None and self.on_change in self.model.listeners:
+            self.model.listeners.remove(self.on_change)
+        self.model = model
+        model.listeners.append(self.on_change)
+    
+    def on_change(self, op, data):
+        """Model listener: restart the settle timer"""
+        self.last_change = time.monotonic()
+        if self.pending is None:
+            self.pending = self.root.after(self.SETTLE_MS, self.check)
+    
+    def check(self):
+        """Save if edits have settled and the interval has passed, else wait"""
+        self.pending = None
+        if not self.enabled.get() or not self.model.dirty:
+            return
+        
+        try:
+            interval = max(1, self.interval.get())
+        except tk.TclError:
+            interval = 60  # Partially typed interval
+        now = time.monotonic()
+        wait = max(self.last_change + self.SETTLE_MS / 1000 - now, self.last_save + interval - now)
+        if wait > 0:
+            self.pending = self.root.after(int(wait * 1000) + 1, self.check)
+            return
+        
+        self.last_save = now
+        self.save()
+
+
+class FileWorker:
+    """Runs file I/O on one worker thread and hands results back to Tk.
+    
+    Tasks run one at a time in submission order, so saves never race each
+    other or a load. Completion is polled with after, so callbacks always
+    run on the Tk thread.
+    """
+    
+    POLL_MS = 50
+    MAX_UPDATES = 8  # progress items buffered before the worker waits for Tk
+    
+    def __init__(self, root, on_busy):
+        self.root = root
+        self.on_busy = on_busy  # called with a status message, or None when idle
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clan-war-io")
+        self.tasks = []
+        self.polling = None
+        self.closing = threading.Event()
+    
+    def submit(self, message, work, on_done, on_error, on_progress=None):
+        """Run work() in the background, then on_done(result) or on_error(exception) on the Tk thread
+        
+        With on_progress, work is called as work(report) and every
+        report(item) reaches on_progress(item) on the Tk thread, in order.
+        """
+        updates = None
+        if on_progress is None:
+            future = self.executor.submit(work)
+        else:
+            updates = queue.Queue(self.MAX_UPDATES)
+            future = self.executor.submit(work, lambda item: self.report(updates, item))
+        self.tasks.append((message, future, on_done, on_error, updates, on_progress))
+        self.on_busy(message)
+        if self.polling is None:
+            self.polling = self.root.after(self.POLL_MS, self.poll)
+    
+    def report(self, updates, item):
+        """Queue a progress item from the worker, waiting while Tk catches up"""
+        while not self.closing.is_set():
+            try:
+                updates.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise RuntimeError("Application is closing")
+    
+    def poll(self):
+        """Deliver progress and finished tasks in submission order"""
+        self.polling = None
+        while self.tasks:
+            _, future, on_done, on_error, updates, on_progress = self.tasks[0]
+            finished = future.done()
+            while updates is not None:
+                try:
+                    on_progress(updates.get_nowait())
+                except queue.Empty:
+                    break
+            if not finished:
+                break
+            
+            self.tasks.pop(0)
+            error = future.exception()
+            if error is None:
+                on_done(future.result())
+            else:
+                on_error(error)
+        
+        if self.tasks:
+            self.on_busy(self.tasks[0][0])
+            self.polling = self.root.after(self.POLL_MS, self.poll)
+        else:
+            self.on_busy(None)
+    
+    def shutdown(self):
+        """Wait for queued work to finish; pending callbacks are dropped"""
+        if self.polling is not None:
+            self.root.after_cancel(self.polling)
+            self.polling = None
+        self.closing.set()
+        self.executor.shutdown(wait=True)
+        self.tasks.clear()
+
+
+class AttendanceGrid:
+    """Virtualized attendance grid drawn on canvases.
+    
+    Only the rows and day columns inside the viewport (plus a small
+    overscan) have canvas items, so build time and memory stay flat as the
+    roster and the war period grow.
+    """
+    
+    ROW_HEIGHT = 30
+    HEADER_HEIGHT = 44
+    NAME_WIDTH = 180
+    DAY_WIDTH = 85
+    TOTAL_WIDTH = 70
+    CHECK_SIZE = 16
+    OVERSCAN = 5
+    COLUMN_OVERSCAN = 2
+    
+    def __init__(self, parent, tracker):
+        self.tracker = tracker
+        self.drawn_rows = set()
+        self.drawn_columns = set()  # day indexes; the total column is index len(war_dates)
+        
+        self.frame = ttk.Frame(parent, style='NexCard.TFrame')
+        self.frame.grid_rowconfigure(1, weight=1)
+        self.frame.grid_columnconfigure(1, weight=1)
+        
+        canvas_options = dict(bg=NexClanTheme.MEDIUM_GRAY, highlightthickness=0, borderwidth=0)
+        
+        # Fixed corner, date header (scrolls horizontally), sticky name
+        # column (scrolls vertically) and the attendance body (scrolls both)
+        self.corner = tk.Canvas(self.frame, width=self.NAME_WIDTH, height=self.HEADER_HEIGHT,
+                                **canvas_options)
+        self.header = tk.Canvas(self.frame, height=self.HEADER_HEIGHT,
+                                xscrollincrement=self.DAY_WIDTH, **canvas_options)
+        self.names = tk.Canvas(self.frame, width=self.NAME_WIDTH,
+                               yscrollincrement=self.ROW_HEIGHT, **canvas_options)
+        self.body = tk.Canvas(self.frame, xscrollincrement=self.DAY_WIDTH,
+                              yscrollincrement=self.ROW_HEIGHT, **canvas_options)
+        
+        self.v_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", 
+                                         command=self.yview,
+                                         style='Nex.Vertical.TScrollbar')
+        self.h_scrollbar = ttk.Scrollbar(self.frame, orient="horizontal", 
+                                         command=self.xview,
+                                         style='Nex.Horizontal.TScrollbar')
+        self.body.configure(yscrollcommand=self.on_yscroll, xscrollcommand=self.on_xscroll)
+        
+        self.corner.grid(row=0, column=0, sticky='nsew')
+        self.header.grid(row=0, column=1, sticky='nsew')
+        self.names.grid(row=1, column=0, sticky='nsew')
+        self.body.grid(row=1, column=1, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=2, rowspan=2, sticky='ns', padx=(2, 0))
+        self.h_scrollbar.grid(row=2, column=1, sticky='ew', pady=(2, 0))
+        
+        self.body.bind('<Configure>', lambda e: self.render())
+        self.body.bind('<Button-1>', self.on_click)
+        
+        # Enhanced mousewheel binding
+        def _on_mousewheel(event):
+            self.scroll_units(int(-1*(event.delta/120)))
+        
+        def _on_shift_mousewheel(event):
+            self.scroll_units(int(-1*(event.delta/120)), vertical=False)
+        
+        self.body.bind_all("<MouseWheel>", _on_mousewheel)
+        self.body.bind_all("<Shift-MouseWheel>", _on_shift_mousewheel)
+        
+        # Sticky participant header
+        self.draw_header_cell(self.corner, 0, self.NAME_WIDTH, "Participant", self.tracker.heading_font)
+    
+    def yview(self, *args):
+        """Scroll the name column and the body together"""
+        self.names.yview(*args)
+        self.body.yview(*args)
+        self.render()
+    
+    def xview(self, *args):
+        """Scroll the date header and the body together"""
+        self.header.xview(*args)
+        self.body.xview(*args)
+        self.render()
+    
+    def on_yscroll(self, first, last):
+        """Keep the scrollbar in sync and draw rows that came into view"""
+        self.v_scrollbar.set(first, last)
+        self.render()
+    
+    def on_xscroll(self, first, last):
+        """Keep the scrollbar in sync and draw columns that came into view"""
+        self.h_scrollbar.set(first, last)
+        self.render()
+    
+    def scroll_units(self, amount, vertical=True):
+        """Scroll by whole rows or day columns (used by the mousewheel)"""
+        if vertical:
+            self.yview("scroll", amount, "units")
+        else:
+            self.xview("scroll", amount, "units")
+    
+    def draw_header_cell(self, canvas, x0, width, text, font, tags=()):
+        """Draw one raised header cell"""
+        canvas.create_rectangle(x0 + 1, 2, x0 + width - 1, self.HEADER_HEIGHT - 2,
+                                fill=NexClanTheme.FLAME_ORANGE, outline=NexClanTheme.DARK_RED, tags=tags)
+        canvas.create_text(x0 + width / 2, self.HEADER_HEIGHT / 2, text=text,
+                           fill=NexClanTheme.WHITE, font=font, tags=tags)
+    
+    def draw_date_header(self, day, date):
+        """Draw a date header with the number of participants present"""
+        x0 = day * self.DAY_WIDTH
+        tag = f"col{day}"
+        short_date = date.split('/')[0] + '/' + date.split('/')[1]
+        self.header.create_rectangle(x0 + 1, 2, x0 + self.DAY_WIDTH - 1, self.HEADER_HEIGHT - 2,
+                                     fill=NexClanTheme.FLAME_ORANGE, outline=NexClanTheme.DARK_RED,
+                                     tags=(tag,))
+        self.header.create_text(x0 + self.DAY_WIDTH / 2, self.HEADER_HEIGHT / 3, text=short_date,
+                                fill=NexClanTheme.WHITE, font=self.tracker.body_font, tags=(tag,))
+        self.header.create_text(x0 + self.DAY_WIDTH / 2, self.HEADER_HEIGHT * 2 / 3,
+                                text=f"{self.tracker.day_totals[day]} present",
+                                fill=NexClanTheme.WHITE, font=self.tracker.small_font,
+                                tags=(tag, f"count{day}"))
+    
+    def draw_column_header(self, column):
+        """Draw the header of a day column or, past the last day, the total column"""
+        days = len(self.tracker.war_dates)
+        if column < days:
+            self.draw_date_header(column, self.tracker.war_dates[column])
+        else:
+            self.draw_header_cell(self.header, days * self.DAY_WIDTH, self.TOTAL_WIDTH,
+                                  "Total", self.tracker.heading_font, tags=(f"col{column}",))
+    
+    def refresh(self):
+        """Redraw after participants or dates changed"""
+        days = len(self.tracker.war_dates)
+        content_width = days * self.DAY_WIDTH + self.TOTAL_WIDTH
+        content_height = len(self.tracker.participants) * self.ROW_HEIGHT
+        
+        self.header.configure(scrollregion=(0, 0, content_width, self.HEADER_HEIGHT))
+        self.names.configure(scrollregion=(0, 0, self.NAME_WIDTH, content_height))
+        self.body.configure(scrollregion=(0, 0, content_width, content_height))
+        
+        # Rows and columns are redrawn lazily as they come into view
+        self.header.delete("all")
+        self.names.delete("all")
+        self.body.delete("all")
+        self.drawn_rows = set()
+        self.drawn_columns = set()
+        self.render()
+    
+    def visible_rows(self):
+        """Return the range of row indexes in the viewport plus overscan"""
+        top = self.body.canvasy(0)
+        bottom = top + max(self.body.winfo_height(), 1)
+        first = max(int(top // self.ROW_HEIGHT) - self.OVERSCAN, 0)
+        last = min(int(bottom // self.ROW_HEIGHT) + 1 + self.OVERSCAN, len(self.tracker.participants))
+        return range(first, last)
+    
+    def visible_columns(self):
+        """Return the range of column indexes (days, then the total) in the viewport plus overscan"""
+        left = self.body.canvasx(0)
+        right = left + max(self.body.winfo_width(), 1)
+        first = max(int(left // self.DAY_WIDTH) - self.COLUMN_OVERSCAN, 0)
+        last = min(int(right // self.DAY_WIDTH) + 1 + self.COLUMN_OVERSCAN, len(self.tracker.war_dates) + 1)
+        return range(first, last)
+    
+    def render(self):
+        """Draw rows and columns entering the viewport and drop those that left it"""
+        rows = set(self.visible_rows())
+        columns = set(self.visible_columns())
+        
+        for row in self.drawn_rows - rows:
+            self.names.delete(f"row{row}")
+            self.body.delete(f"row{row}")
+        for column in self.drawn_columns - columns:
+            self.header.delete(f"col{column}")
+            self.body.delete(f"col{column}")
+        
+        # Rows already drawn only need the newly visible columns
+        new_columns = sorted(columns - self.drawn_columns)
+        for column in new_columns:
+            self.draw_column_header(column)
+        for row in sorted(rows):
+            if row in self.drawn_rows:
+                if new_columns:
+                    self.draw_cells(row, new_columns)
+            else:
+                self.draw_row(row, sorted(columns))
+        
+        self.drawn_rows = rows
+        self.drawn_columns = columns
+    
+    def row_background(self, row):
+        """Alternating row colors"""
+        return NexClanTheme.DARK_GRAY if row % 2 == 1 else NexClanTheme.MEDIUM_GRAY
+    
+    def draw_row(self, row, columns):
+        """Draw the sticky name and the given columns for one participant"""
+        participant = self.tracker.participants[row]
+        tag = f"row{row}"
+        y0 = row * self.ROW_HEIGHT
+        y1 = y0 + self.ROW_HEIGHT
+        
+        # Sticky participant name
+        self.names.create_rectangle(2, y0 + 1, self.NAME_WIDTH - 2, y1 - 1,
+                                    fill=NexClanTheme.LIGHT_GRAY, outline=NexClanTheme.BLACK,
+                                    tags=(tag,))
+        self.names.create_text(10, (y0 + y1) / 2, text=participant.name, anchor='w',
+                               fill=NexClanTheme.WHITE, font=self.tracker.body_font,
+                               tags=(tag,))
+        
+        self.draw_cells(row, columns)
+    
+    def draw_cells(self, row, columns):
+        """Draw attendance checkboxes (and the total, if its column is given) for one participant"""
+        participant = self.tracker.participants[row]
+        days = len(self.tracker.war_dates)
+        y0 = row * self.ROW_HEIGHT
+        y1 = y0 + self.ROW_HEIGHT
+        row_bg = self.row_background(row)
+        
+        for column in columns:
+            tags = (f"row{row}", f"col{column}")
+            x0 = column * self.DAY_WIDTH
+            if column < days:
+                self.body.create_rectangle(x0 + 1, y0 + 1, x0 + self.DAY_WIDTH - 1, y1 - 1,
+                                           fill=row_bg, outline=NexClanTheme.BLACK, tags=tags)
+                self.draw_checkbox(row, column, participant.attended(column), row_bg)
+            else:
+                # Total days
+                self.body.create_rectangle(x0 + 2, y0 + 1, x0 + self.TOTAL_WIDTH - 2, y1 - 1,
+                                           fill=NexClanTheme.FLAME_RED, outline=NexClanTheme.BLACK,
+                                           tags=tags)
+                self.body.create_text(x0 + self.TOTAL_WIDTH / 2, (y0 + y1) / 2,
+                                      text=str(participant.total_days),
+                                      fill=NexClanTheme.WHITE, font=self.tracker.heading_font,
+                                      tags=tags + (f"total{row}",))
+    
+    def draw_checkbox(self, row, day, checked, row_bg):
+        """Draw a single attendance checkbox"""
+        cx = day * self.DAY_WIDTH + self.DAY_WIDTH / 2
+        cy = row * self.ROW_HEIGHT + self.ROW_HEIGHT / 2
+        half = self.CHECK_SIZE / 2
+        tags = (f"row{row}", f"col{day}", f"cell{row}_{day}")
+        
+        self.body.create_rectangle(cx - half, cy - half, cx + half, cy + half,
+                                   fill=NexClanTheme.FLAME_ORANGE if checked else row_bg,
+                                   outline=NexClanTheme.WHITE, tags=tags)
+        if checked:
+            self.body.create_text(cx, cy, text="✓", fill=NexClanTheme.WHITE,
+                                  font=self.tracker.body_font, tags=tags)
+    
+    def update_cell(self, row, day):
+        """Redraw one toggled cell, its row total and the day count"""
+        participant = self.tracker.participants[row]
+        self.header.itemconfigure(f"count{day}", text=f"{self.tracker.day_totals[day]} present")
+        
+        # Cells outside the viewport are drawn fresh when scrolled into view
+        if row not in self.drawn_rows:
+            return
+        
+        if day in self.drawn_columns:
+            self.body.delete(f"cell{row}_{day}")
+            self.draw_checkbox(row, day, participant.attended(day), self.row_background(row))
+        self.body.itemconfigure(f"total{row}", text=str(participant.total_days))
+    
+    def on_click(self, event):
+        """Toggle the attendance cell under the mouse"""
+        row = int(self.body.canvasy(event.y) // self.ROW_HEIGHT)
+        day = int(self.body.canvasx(event.x) // self.DAY_WIDTH)
+        if 0 <= row < len(self.tracker.participants) and 0 <= day < len(self.tracker.war_dates):
+            participant = self.tracker.participants[row]
+            self.tracker.update_attendance(row, day, not participant.attended(day))
+
+
+class CalculateWindow:
+    """Resizable calculate window
+    
+    The report is streamed into the text widget a chunk of lines at a time
+    (scheduled with after), tagged as it is inserted, so the window stays
+    responsive while a large roster renders. Participant rows can be
+    narrowed to the top/bottom N or a name search.
+    """
+    
+    CHUNK_LINES = 500
+    SEARCH_DELAY_MS = 250
+    VIEW_ALL = "All rows"
+    VIEW_TOP = "Top N"
+    VIEW_BOTTOM = "Bottom N"
+    VIEW_BOTH = "Top & Bottom N"
+    
+    def __init__(self, parent, tracker):
+        self.tracker = tracker
+        self.report = None
+        self.render_job = None
+        self.search_job = None
+        self.view = tk.StringVar(value=self.VIEW_ALL)
+        self.row_limit = tk.IntVar(value=50)
+        self.search = tk.StringVar()
+        
+        # Create window
+        self.window = tk.Toplevel(parent)
         self.window.title("Nex Clan - Prize Calculation")
         self.window.geometry("800x600")
         self.window.configure(bg=NexClanTheme.BLACK)
@@ -1263,6 +2169,7 @@ class CalculateWindow:
         # Center window
         self.window.transient(parent)
         self.window.grab_set()
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         self.setup_calculate_ui()
         self.calculate_and_display()
@@ -1276,6 +2183,31 @@ class CalculateWindow:
         ttk.Label(header_frame, text="🔥 PRIZE CALCULATION RESULTS 🔥", 
                  style='NexTitle.TLabel').pack()
         
+        # Row filters
+        filter_frame = ttk.Frame(self.window, style='Nex.TFrame')
+        filter_frame.pack(fill='x', padx=20, pady=(0, 10))
+        
+        ttk.Label(filter_frame, text="Show:", style='NexBody.TLabel').pack(side='left')
+        view_box = ttk.Combobox(filter_frame, textvariable=self.view, state='readonly', width=15,
+                                values=[self.VIEW_ALL, self.VIEW_TOP, self.VIEW_BOTTOM, self.VIEW_BOTH])
+        view_box.pack(side='left', padx=(5, 10))
+        view_box.bind('<<ComboboxSelected>>', lambda e: self.display_results())
+        
+        ttk.Label(filter_frame, text="N:", style='NexBody.TLabel').pack(side='left')
+        tk.Spinbox(filter_frame, from_=10, to=100000, increment=10, width=6,
+                  textvariable=self.row_limit, command=self.display_results,
+                  bg=NexClanTheme.MEDIUM_GRAY, fg=NexClanTheme.WHITE,
+                  buttonbackground=NexClanTheme.DARK_GRAY,
+                  insertbackground=NexClanTheme.FLAME_ORANGE).pack(side='left', padx=(5, 20))
+        
+        ttk.Label(filter_frame, text="🔍 Search:", style='NexBody.TLabel').pack(side='left')
+        search_entry = ttk.Entry(filter_frame, textvariable=self.search, width=20, style='Nex.TEntry')
+        search_entry.pack(side='left', padx=(5, 0))
+        self.search.trace_add('write', self.on_search_change)
+        
+        self.status_label = ttk.Label(filter_frame, text="", style='NexStatus.TLabel')
+        self.status_label.pack(side='right')
+        
         # Results area with scrolling
         results_frame = ttk.LabelFrame(self.window, text="Calculation Results", 
                                      padding=15, style='Nex.TLabelframe')
@@ -1297,6 +2229,12 @@ class CalculateWindow:
                                    borderwidth=0,
                                    wrap='word')
         
+        # Tags are applied as lines are inserted
+        self.results_text.tag_configure("title", foreground=NexClanTheme.FLAME_ORANGE, font=('Consolas', 12, 'bold'))
+        self.results_text.tag_configure("separator", foreground=NexClanTheme.FLAME_YELLOW)
+        self.results_text.tag_configure("prize", foreground=NexClanTheme.SUCCESS, font=('Consolas', 11, 'bold'))
+        self.results_text.tag_configure("note", foreground=NexClanTheme.LIGHT_ORANGE)
+        
         scrollbar = ttk.Scrollbar(text_container, orient='vertical', 
                                 command=self.results_text.yview,
                                 style='Nex.Vertical.TScrollbar')
@@ -1314,59 +2252,380 @@ class CalculateWindow:
         ttk.Button(button_frame, text="🔄 Recalculate", 
                   command=self.calculate_and_display, style='Nex.TButton').pack(side='left', padx=(0, 10))
         ttk.Button(button_frame, text="❌ Close", 
-                  command=self.window.destroy, style='Nex.TButton').pack(side='right')
+                  command=self.close, style='Nex.TButton').pack(side='right')
         
     def calculate_and_display(self):
         """Calculate and display results"""
         if not self.tracker.participants:
+            self.cancel_render()
+            self.report = None
             self.results_text.delete(1.0, tk.END)
             self.results_text.insert(1.0, "No participants added yet.")
+            self.status_label.configure(text="")
+            return
+        
+        # Cached by the model until the war changes
+        self.report = self.tracker.model.export_report()
+        self.display_results()
+    
+    def on_search_change(self, *args):
+        """Re-filter once typing pauses"""
+        if self.search_job is not None:
+            self.window.after_cancel(self.search_job)
+        self.search_job = self.window.after(self.SEARCH_DELAY_MS, self.display_results)
+    
+    def visible_rows(self):
+        """Participant rows left after the search and top/bottom N filters, with hidden-row notes"""
+        header, rows, footer = self.report
+        query = self.search.get().strip().lower()
+        if query:
+            rows = [row for row in rows if query in row[0].lower()]
+        
+        view = self.view.get()
+        try:
+            limit = max(1, self.row_limit.get())
+        except tk.TclError:
+            limit = 50
+        if view == self.VIEW_ALL or len(rows) <= limit * (2 if view == self.VIEW_BOTH else 1):
+            return [line for _, line in rows], len(rows)
+        
+        hidden = f"   ... {len(rows) - limit * (2 if view == self.VIEW_BOTH else 1):,} rows hidden ..."
+        if view == self.VIEW_TOP:
+            lines = [line for _, line in rows[:limit]] + [hidden]
+        elif view == self.VIEW_BOTTOM:
+            lines = [hidden] + [line for _, line in rows[-limit:]]
+        else:
+            lines = [line for _, line in rows[:limit]] + [hidden] + [line for _, line in rows[-limit:]]
+        return lines, len(rows)
+    
+    def display_results(self):
+        """Start streaming the (filtered) report into the text widget"""
+        self.search_job = None
+        if self.report is None:
             return
         
-        results = self.tracker.generate_export_results()
+        header, rows, footer = self.report
+        lines, matched = self.visible_rows()
+        self.cancel_render()
         self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, results)
         
-        # Add some color highlighting
-        self.highlight_results()
+        total = len(rows)
+        summary = f"{matched:,} of {total:,} participants" if matched != total else f"{total:,} participants"
+        self.render_chunk(header + lines + footer, 0, summary)
     
-    def highlight_results(self):
-        """Add color highlighting to results"""
-        # Highlight headers
-        content = self.results_text.get(1.0, tk.END)
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            line_start = f"{i+1}.0"
-            line_end = f"{i+1}.end"
-            
-            if "NEX CLAN" in line or "RESULTS" in line:
-                self.results_text.tag_add("title", line_start, line_end)
-            elif line.startswith("=") or line.startswith("-"):
-                self.results_text.tag_add("separator", line_start, line_end)
-            elif "Place" in line and "$" in line:
-                self.results_text.tag_add("prize", line_start, line_end)
-        
-        # Configure tags
-        self.results_text.tag_configure("title", foreground=NexClanTheme.FLAME_ORANGE, font=('Consolas', 12, 'bold'))
-        self.results_text.tag_configure("separator", foreground=NexClanTheme.FLAME_YELLOW)
-        self.results_text.tag_configure("prize", foreground=NexClanTheme.SUCCESS, font=('Consolas', 11, 'bold'))
+    def line_tag(self, line):
+        """Highlight tag for a report line"""
+        if "NEX CLAN" in line or "RESULTS" in line:
+            return "title"
+        if line.startswith("=") or line.startswith("-"):
+            return "separator"
+        if "Place" in line and "$" in line:
+            return "prize"
+        if line.startswith("   ..."):
+            return "note"
+        return ()
+    
+    def render_chunk(self, lines, start, summary):
+        """Insert the next CHUNK_LINES lines with their tags, then yield to the event loop"""
+        end = min(start + self.CHUNK_LINES, len(lines))
+        
+        # One insert call per chunk: text, tags, text, tags, ...
+        args = []
+        for line in lines[start:end]:
+            args.append(line + "\n")
+            args.append(self.line_tag(line))
+        self.results_text.insert(tk.END, *args)
+        
+        if end < len(lines):
+            self.status_label.configure(text=f"Rendering... {end:,}/{len(lines):,} lines")
+            self.render_job = self.window.after(1, self.render_chunk, lines, end, summary)
+        else:
+            self.render_job = None
+            self.status_label.configure(text=summary)
+    
+    def cancel_render(self):
+        """Stop a render that is still streaming"""
+        if self.render_job is not None:
+            self.window.after_cancel(self.render_job)
+            self.render_job = None
+    
+    def close(self):
+        """Stop pending rendering and searches, then close the window"""
+        self.cancel_render()
+        if self.search_job is not None:
+            self.window.after_cancel(self.search_job)
+            self.search_job = None
+        self.window.destroy()
     
     def export_results(self):
-        """Export results from calculate window"""
+        """Export the full results from calculate window, whatever rows are shown"""
         filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=self.tracker.EXPORT_FILETYPES,
             title="Export Calculation Results"
         )
         
+        if filename:
+            self.tracker.write_results(filename)
+
+
+class LeaderboardWindow:
+    """Top players across every war in a war history archive"""
+    
+    METRIC_LABELS = {
+        'days': "Days Attended",
+        'wars': "Wars Joined",
+        'payout': "Total Payout",
+        'streak': "Current Streak",
+        'best_streak': "Best Streak"
+    }
+    LIFETIME = "Lifetime"
+    
+    def __init__(self, parent, tracker, path):
+        self.tracker = tracker
+        self.path = path
+        self.metric = tk.StringVar(value=self.METRIC_LABELS['days'])
+        self.season = tk.StringVar(value=self.LIFETIME)
+        self.top = tk.IntVar(value=25)
+        
+        # Create window
+        self.window = tk.Toplevel(parent)
+        self.window.title("Nex Clan - Leaderboard")
+        self.window.geometry("800x600")
+        self.window.configure(bg=NexClanTheme.BLACK)
+        
+        # Make resizable
+        self.window.resizable(True, True)
+        
+        self.window.transient(parent)
+        self.window.grab_set()
+        
+        self.setup_leaderboard_ui()
+        self.show_leaderboard()
+    
+    def setup_leaderboard_ui(self):
+        """Setup leaderboard window UI"""
+        from clan_war_archive import METRICS  # Archive support loads on first use
+        
+        # Header
+        header_frame = ttk.Frame(self.window, style='Nex.TFrame')
+        header_frame.pack(fill='x', padx=20, pady=20)
+        
+        ttk.Label(header_frame, text="🏆 NEX CLAN LEADERBOARD 🏆", 
+                 style='NexTitle.TLabel').pack()
+        ttk.Label(header_frame, text=os.path.basename(self.path), 
+                 style='NexStatus.TLabel').pack()
+        
+        # Ranking options
+        options_frame = ttk.Frame(self.window, style='Nex.TFrame')
+        options_frame.pack(fill='x', padx=20, pady=(0, 10))
+        
+        ttk.Label(options_frame, text="Rank by:", style='NexBody.TLabel').pack(side='left')
+        self.metric_box = ttk.Combobox(options_frame, textvariable=self.metric, state='readonly', width=16,
+                                       values=[self.METRIC_LABELS[metric] for metric in METRICS])
+        self.metric_box.pack(side='left', padx=(5, 15))
+        
+        ttk.Label(options_frame, text="Season:", style='NexBody.TLabel').pack(side='left')
+        self.season_box = ttk.Combobox(options_frame, textvariable=self.season, state='readonly', width=10,
+                                       values=[self.LIFETIME])
+        self.season_box.pack(side='left', padx=(5, 15))
+        
+        ttk.Label(options_frame, text="Top:", style='NexBody.TLabel').pack(side='left')
+        tk.Spinbox(options_frame, from_=5, to=1000, increment=5, width=5,
+                  textvariable=self.top,
+                  bg=NexClanTheme.MEDIUM_GRAY, fg=NexClanTheme.WHITE,
+                  buttonbackground=NexClanTheme.DARK_GRAY,
+                  insertbackground=NexClanTheme.FLAME_ORANGE).pack(side='left', padx=5)
+        
+        self.metric_box.bind('<<ComboboxSelected>>', lambda e: self.show_leaderboard())
+        self.season_box.bind('<<ComboboxSelected>>', lambda e: self.show_leaderboard())
+        
+        # Leaderboard area with scrolling
+        results_frame = ttk.LabelFrame(self.window, text="Top Players", 
+                                     padding=15, style='Nex.TLabelframe')
+        results_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        text_container = ttk.Frame(results_frame, style='Nex.TFrame')
+        text_container.pack(fill='both', expand=True)
+        
+        self.results_text = tk.Text(text_container, 
+                                   font=('Consolas', 11),
+                                   bg=NexClanTheme.MEDIUM_GRAY,
+                                   fg=NexClanTheme.WHITE,
+                                   selectbackground=NexClanTheme.FLAME_ORANGE,
+                                   selectforeground=NexClanTheme.WHITE,
+                                   relief='flat',
+                                   highlightthickness=0,
+                                   borderwidth=0,
+                                   wrap='none')
+        self.results_text.tag_configure("title", foreground=NexClanTheme.FLAME_ORANGE, font=('Consolas', 11, 'bold'))
+        
+        scrollbar = ttk.Scrollbar(text_container, orient='vertical', 
+                                command=self.results_text.yview,
+                                style='Nex.Vertical.TScrollbar')
+        self.results_text.configure(yscrollcommand=scrollbar.set)
+        
+        self.results_text.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        scrollbar.pack(side='right', fill='y', padx=(0, 5), pady=5)
+        
+        # Button frame
+        button_frame = ttk.Frame(self.window, style='Nex.TFrame')
+        button_frame.pack(fill='x', padx=20, pady=(0, 20))
+        
+        ttk.Button(button_frame, text="🔄 Refresh", 
+                  command=self.show_leaderboard, style='Nex.TButton').pack(side='left', padx=(0, 10))
+        ttk.Button(button_frame, text="❌ Close", 
+                  command=self.window.destroy, style='Nex.TButton').pack(side='right')
+    
+    def show_leaderboard(self):
+        """Query the archive in the background and show the top players"""
+        from clan_war_archive import SEASON_METRICS, WarArchive, format_leaderboard
+        metric = next(key for key, label in self.METRIC_LABELS.items() if label == self.metric.get())
+        season = None if self.season.get() == self.LIFETIME else self.season.get()
+        if season and metric not in SEASON_METRICS:
+            season = None  # Streaks only exist across all wars
+            self.season.set(self.LIFETIME)
+        try:
+            top = max(1, self.top.get())
+        except tk.TclError:
+            top = 25
+        
+        def query():
+            with WarArchive(self.path) as archive:
+                return archive.seasons(), archive.leaderboard(metric, top, season)
+        
+        def done(result):
+            if not self.window.winfo_exists():
+                return
+            seasons, rows = result
+            self.season_box.configure(values=[self.LIFETIME] + seasons)
+            self.results_text.delete(1.0, tk.END)
+            if not rows:
+                self.results_text.insert(1.0, "No wars in this archive yet.")
+                return
+            self.results_text.insert(1.0, format_leaderboard(rows, season))
+            self.results_text.tag_add("title", "1.0", "1.end")
+        
+        def failed(e):
+            messagebox.showerror("Archive Error", f"Failed to read archive: {str(e)}")
+        
+        self.tracker.file_worker.submit("🏆 Ranking...", query, done, failed)
+
+
+class DiagnosticsWindow:
+    """Live per-handler latency percentiles and main-loop lag from the latency monitor"""
+    
+    REFRESH_MS = 1000
+    
+    def __init__(self, parent, tracker):
+        self.tracker = tracker
+        self.monitor = tracker.monitor
+        self.pending = None
+        
+        # Create window; it stays open beside the tracker while you work
+        self.window = tk.Toplevel(parent)
+        self.window.title("Nex Clan - Diagnostics")
+        self.window.geometry("1000x600")
+        self.window.configure(bg=NexClanTheme.BLACK)
+        self.window.resizable(True, True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.setup_diagnostics_ui()
+        self.refresh()
+    
+    def setup_diagnostics_ui(self):
+        """Setup diagnostics window UI"""
+        # Header
+        header_frame = ttk.Frame(self.window, style='Nex.TFrame')
+        header_frame.pack(fill='x', padx=20, pady=20)
+        
+        ttk.Label(header_frame, text="📈 EVENT LOOP DIAGNOSTICS 📈", 
+                 style='NexTitle.TLabel').pack()
+        self.summary_label = ttk.Label(header_frame, text="", style='NexStatus.TLabel')
+        self.summary_label.pack()
+        
+        # Handler table with scrolling
+        results_frame = ttk.LabelFrame(self.window, text="Slowest Handlers (by p99)", 
+                                     padding=15, style='Nex.TLabelframe')
+        results_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        text_container = ttk.Frame(results_frame, style='Nex.TFrame')
+        text_container.pack(fill='both', expand=True)
+        
+        self.results_text = tk.Text(text_container, 
+                                   font=('Consolas', 10),
+                                   bg=NexClanTheme.MEDIUM_GRAY,
+                                   fg=NexClanTheme.WHITE,
+                                   selectbackground=NexClanTheme.FLAME_ORANGE,
+                                   selectforeground=NexClanTheme.WHITE,
+                                   relief='flat',
+                                   highlightthickness=0,
+                                   borderwidth=0,
+                                   wrap='none')
+        self.results_text.tag_configure("title", foreground=NexClanTheme.FLAME_ORANGE, font=('Consolas', 10, 'bold'))
+        
+        scrollbar = ttk.Scrollbar(text_container, orient='vertical', 
+                                command=self.results_text.yview,
+                                style='Nex.Vertical.TScrollbar')
+        self.results_text.configure(yscrollcommand=scrollbar.set)
+        
+        self.results_text.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        scrollbar.pack(side='right', fill='y', padx=(0, 5), pady=5)
+        
+        # Button frame
+        button_frame = ttk.Frame(self.window, style='Nex.TFrame')
+        button_frame.pack(fill='x', padx=20, pady=(0, 20))
+        
+        ttk.Button(button_frame, text="🔄 Reset", 
+                  command=self.reset, style='Nex.TButton').pack(side='left', padx=(0, 10))
+        ttk.Button(button_frame, text="💾 Save JSON", 
+                  command=self.save_report, style='Nex.TButton').pack(side='left')
+        ttk.Button(button_frame, text="❌ Close", 
+                  command=self.close, style='Nex.TButton').pack(side='right')
+    
+    def refresh(self):
+        """Redraw the table, keeping the scroll position, and schedule the next redraw"""
+        if not self.window.winfo_exists():
+            return
+        report = self.monitor.report()
+        lag = report['lag']
+        if lag:
+            self.summary_label.configure(
+                text=f"Main loop lag p50 {lag['p50_ms']:.1f}ms · p99 {lag['p99_ms']:.1f}ms · "
+                     f"max {lag['max_ms']:.1f}ms over {report['uptime_s']:.0f}s")
+        
+        top = self.results_text.yview()[0]
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(1.0, format_report(report))
+        self.results_text.tag_add("title", "1.0", "1.end")
+        self.results_text.yview_moveto(top)
+        self.pending = self.window.after(self.REFRESH_MS, self.refresh)
+    
+    def reset(self):
+        """Start measuring afresh"""
+        self.monitor.reset()
+        self.window.after_cancel(self.pending)
+        self.refresh()
+    
+    def save_report(self):
+        """Save the latency report as JSON"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            title="Save Latency Report"
+        )
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    f.write(self.results_text.get(1.0, tk.END))
-                messagebox.showinfo("Export Successful", f"Results exported to {filename}")
+                self.monitor.dump(filename, self.tracker.diagnostics())
+                messagebox.showinfo("Report Saved", f"Latency report saved to {filename}")
             except Exception as e:
-                messagebox.showerror("Export Error", f"Failed to export results: {str(e)}")
+                messagebox.showerror("Save Error", f"Failed to save report: {str(e)}")
+    
+    def close(self):
+        """Stop refreshing and close the window"""
+        if self.pending is not None:
+            self.window.after_cancel(self.pending)
+        self.window.destroy()
 
 
 class CalendarDialog:
@@ -1402,7 +2661,7 @@ class CalendarDialog:
                  style='NexTitle.TLabel').pack()
         
         # Instructions
-        ttk.Label(header_frame, text="Select the first day of your 14-day war period", 
+        ttk.Label(header_frame, text=f"Select the first day of your {len(self.current_dates)}-day war period", 
                  style='NexBody.TLabel').pack(pady=(10, 0))
         
         # Calendar frame
@@ -1527,24 +2786,12 @@ class CalendarDialog:
     
     def use_selected_date(self):
         """Use the selected date as start date"""
-        start_date = self.selected_date
-        dates = []
-        for i in range(14):
-            date = start_date + timedelta(days=i)
-            dates.append(date.strftime("%m/%d/%Y"))
-        
-        self.result = dates
+        self.result = generate_war_dates(self.selected_date, len(self.current_dates))
         self.dialog.destroy()
     
     def use_today(self):
         """Use today as start date"""
-        start_date = datetime.now()
-        dates = []
-        for i in range(14):
-            date = start_date + timedelta(days=i)
-            dates.append(date.strftime("%m/%d/%Y"))
-        
-        self.result = dates
+        self.result = generate_war_dates(datetime.now(), len(self.current_dates))
         self.dialog.destroy()
 
 
@@ -1701,7 +2948,7 @@ class DateEditDialog:
         # Header
         ttk.Label(main_frame, text="🔥 EDIT WAR DATES 🔥", 
                  style='NexTitle.TLabel').pack(pady=(0, 15))
-        ttk.Label(main_frame, text="Edit the dates for the 14-day war period:", 
+        ttk.Label(main_frame, text=f"Edit the dates for the {len(current_dates)}-day war period:", 
                  style='NexHeading.TLabel').pack(pady=(0, 10))
         ttk.Label(main_frame, text="Format: MM/DD/YYYY", 
                  style='NexBody.TLabel').pack(pady=(0, 20))
@@ -1790,7 +3037,104 @@ class DateEditDialog:
         self.dialog.destroy()
 
 
+class ArchiveDialog:
+    """Dialog for picking a war stored in a war history archive"""
+    
+    def __init__(self, parent, wars):
+        self.result = None
+        self.wars = wars
+        
+        # Create dialog window
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Nex Clan - Load from Archive")
+        self.dialog.geometry("600x500")
+        self.dialog.configure(bg=NexClanTheme.BLACK)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 150, parent.winfo_rooty() + 100))
+        
+        self.setup_archive_ui()
+        
+        # Wait for dialog to close
+        self.dialog.wait_window()
+    
+    def setup_archive_ui(self):
+        """Setup war selection UI"""
+        # Header
+        header_frame = ttk.Frame(self.dialog, style='Nex.TFrame')
+        header_frame.pack(fill='x', padx=20, pady=20)
+        
+        ttk.Label(header_frame, text="🗄️ WAR ARCHIVE 🗄️", 
+                 style='NexTitle.TLabel').pack()
+        
+        # War list frame
+        list_frame = ttk.LabelFrame(self.dialog, text="Archived Wars", 
+                                  padding=20, style='Nex.TLabelframe')
+        list_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        self.war_listbox = tk.Listbox(list_frame, selectmode='single',
+                                      font=('Consolas', 10),
+                                      bg=NexClanTheme.MEDIUM_GRAY,
+                                      fg=NexClanTheme.WHITE,
+                                      selectbackground=NexClanTheme.FLAME_ORANGE,
+                                      selectforeground=NexClanTheme.WHITE,
+                                      relief='flat',
+                                      highlightthickness=0,
+                                      borderwidth=0)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical",
+                                command=self.war_listbox.yview,
+                                style='Nex.Vertical.TScrollbar')
+        self.war_listbox.configure(yscrollcommand=scrollbar.set)
+        
+        for _, name, start_date, end_date, participants in self.wars:
+            period = f"{start_date or '?'} - {end_date or '?'}"
+            self.war_listbox.insert(tk.END, f"{name:<24} {period:<25} {participants:>6} players")
+        self.war_listbox.selection_set(0)
+        
+        self.war_listbox.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Button frame
+        button_frame = ttk.Frame(self.dialog, style='Nex.TFrame')
+        button_frame.pack(fill='x', padx=20, pady=(0, 20))
+        
+        ttk.Button(button_frame, text="📁 Load War", 
+                  command=self.ok_clicked, style='NexPrimary.TButton').pack(side='left', padx=(0, 10))
+        ttk.Button(button_frame, text="❌ Cancel", 
+                  command=self.dialog.destroy, style='Nex.TButton').pack(side='left')
+        
+        # Bind double click, Enter and Escape keys
+        self.war_listbox.bind('<Double-Button-1>', lambda e: self.ok_clicked())
+        self.dialog.bind('<Return>', lambda e: self.ok_clicked())
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+    
+    def ok_clicked(self):
+        """Load the selected war"""
+        selection = self.war_listbox.curselection()
+        if not selection:
+            return
+        self.result = self.wars[selection[0]][0]
+        self.dialog.destroy()
+
+
 if __name__ == "__main__":
-    app = ClanWarTracker()
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
+    # Headless batch payout calculator: clan_war_tracker.py batch WARS...
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from clan_war_batch import main
+        sys.exit(main(sys.argv[2:]))
+    
+    # Opt-in latency monitor, installed before any widget registers a callback
+    monitor = None
+    if "--monitor" in sys.argv[1:] or os.environ.get("CLAN_WAR_MONITOR"):
+        monitor = LatencyMonitor(os.environ.get("CLAN_WAR_MONITOR_FILE"))
+        monitor.install()
+    
+    app = ClanWarTracker(monitor, startup_report="--startup-report" in sys.argv[1:],
+                         quit_after_startup="--quit-after-startup" in sys.argv[1:])
     app.run()
 
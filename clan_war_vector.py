@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Clan War Tracker - Vectorized Payout Engine
+Computes attendance totals, per-day value, equal payouts and ranked payouts
+for very large rosters as NumPy array operations. Falls back to pure Python
+when NumPy is not installed; both paths give identical results.
+Created by Nex Clan
+"""
+
+from collections import Counter
+
+from clan_war_engine import ordinal, popcount
+from clan_war_ranking import bucket_order, competition_ranks
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+class PayoutResult:
+    """Payouts for a roster, indexed like the input masks"""
+
+    __slots__ = ('totals', 'day_totals', 'per_day_value', 'ranks', 'payouts', 'order')
+
+    def __init__(self, totals, day_totals, per_day_value, ranks, payouts, order):
+        self.totals = totals                # days attended per participant
+        self.day_totals = day_totals        # participants present per day
+        self.per_day_value = per_day_value  # equal mode only, else None
+        self.ranks = ranks                  # ranked mode only, else None
+        self.payouts = payouts
+        self.order = order                  # participant indexes in report order
+
+    def labels(self, ranked_prizes):
+        """Rank labels as shown in the ranked report"""
+        return [ranked_prizes[rank - 1]['label'] if rank <= len(ranked_prizes) else f"{ordinal(rank)} Place"
+                for rank in self.ranks]
+
+
+def attendance_matrix(masks, length):
+    """Build an N x D boolean attendance matrix from attendance bitmasks"""
+    columns = []
+    for start in range(0, length, 64):
+        # Split each mask into 64-bit words so any war length fits
+        if length <= 64:
+            chunk = np.array(masks, dtype=np.uint64)
+        else:
+            chunk = np.fromiter((mask >> start & 0xFFFFFFFFFFFFFFFF for mask in masks),
+                                dtype=np.uint64, count=len(masks))
+        shifts = np.arange(min(64, length - start), dtype=np.uint64)
+        columns.append((chunk[:, None] >> shifts) & np.uint64(1))
+    if not columns:
+        return np.zeros((len(masks), 0), dtype=bool)
+    return np.concatenate(columns, axis=1).astype(bool)
+
+
+def _compute_python(masks, length, mode, prize_pool, amounts):
+    """Pure Python payout computation"""
+    totals = [popcount(mask) for mask in masks]
+
+    # Rosters share few distinct attendance patterns, so count those once
+    day_totals = [0] * length
+    for mask, count in Counter(masks).items():
+        while mask:
+            low = mask & -mask
+            day_totals[low.bit_length() - 1] += count
+            mask ^= low
+
+    if mode == "equal":
+        total_attendance_days = sum(totals)
+        per_day_value = prize_pool / total_attendance_days if total_attendance_days else 0.0
+        payouts = [total * per_day_value for total in totals]
+        return PayoutResult(totals, day_totals, per_day_value, None, payouts, list(range(len(masks))))
+
+    ranks = competition_ranks(totals)
+    payouts = [amounts[rank - 1] if rank <= len(amounts) else 0 for rank in ranks]
+    order = bucket_order(totals)
+    return PayoutResult(totals, day_totals, None, ranks, payouts, order)
+
+
+def _compute_numpy(masks, length, mode, prize_pool, amounts):
+    """Vectorized payout computation"""
+    matrix = attendance_matrix(masks, length)
+    totals = matrix.sum(axis=1, dtype=np.int64)
+    day_totals = matrix.sum(axis=0, dtype=np.int64).tolist()
+
+    if mode == "equal":
+        total_attendance_days = int(totals.sum())
+        per_day_value = prize_pool / total_attendance_days if total_attendance_days else 0.0
+        payouts = totals * np.float64(per_day_value)
+        return PayoutResult(totals.tolist(), day_totals, per_day_value, None,
+                            payouts.tolist(), list(range(len(masks))))
+
+    # Rank = 1 + number of participants with strictly more days
+    counts = np.bincount(totals, minlength=length + 1)
+    greater = np.concatenate((np.cumsum(counts[::-1])[::-1][1:], [0]))
+    ranks = greater[totals] + 1
+
+    # Ranks past the prize ladder map to the trailing zero
+    prize_table = np.array(amounts + [0], dtype=np.int64)
+    payouts = prize_table[np.minimum(ranks, len(amounts) + 1) - 1]
+
+    # Stable sort keeps roster order among ties, like sorted(..., reverse=True)
+    order = np.argsort(-totals, kind='stable')
+    return PayoutResult(totals.tolist(), day_totals, None, ranks.tolist(), payouts.tolist(), order.tolist())
+
+
+def compute_from_masks(masks, length, mode="equal", prize_pool=0.0, ranked_prizes=(), use_numpy=None):
+    """Compute payouts for raw attendance bitmasks
+
+    use_numpy: True forces NumPy, False forces pure Python, None picks
+    NumPy when it is installed.
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise RuntimeError("NumPy is not installed")
+
+    amounts = [int(prize['amount']) for prize in ranked_prizes]
+    compute = _compute_numpy if use_numpy else _compute_python
+    return compute(list(masks), length, mode, prize_pool, amounts)
+
+
+def compute_payouts(model, mode=None, use_numpy=None):
+    """Compute payouts for a WarModel (mode defaults to the model's prize mode)"""
+    return compute_from_masks([participant.mask for participant in model.participants],
+                              len(model.war_dates),
+                              mode or model.prize_mode,
+                              model.prize_pool,
+                              model.ranked_prizes,
+                              use_numpy)
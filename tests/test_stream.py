@@ -0,0 +1,135 @@
+"""
+Streaming war reader tests
+
+The reader refills its buffer one chunk at a time, so the record tests
+parse with a tiny chunk size at every split offset: a value cut in two
+must decode exactly as json.load decodes it. The batch tests cover both
+key orders a war file can have.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import clan_war_stream
+from clan_war_engine import Participant, WarModel, generate_war_dates
+from clan_war_stream import END, FIELD, PARTICIPANT, SQUAD, iter_war_batches, iter_war_records
+
+SCALARS = {
+    'prize_pool': 150000.0,
+    'small': 1.5e-07,
+    'large': -2.5E+12,
+    'count': 12345,
+    'negative': -7,
+    'zero': 0,
+    'journal_seq': 42,
+    'enabled': True,
+    'disabled': False,
+    'nothing': None,
+    'name': "Nex \"Clan\" \\ été"
+}
+
+
+def rebuild(filename):
+    """The war a file's records describe, as json.load would return it"""
+    war = {}
+    for kind, _, value in iter_war_records(filename):
+        if kind == FIELD:
+            key, field_value = value
+            war[key] = field_value
+        elif kind == PARTICIPANT:
+            war.setdefault('participants', []).append(value)
+        elif kind == SQUAD:
+            war.setdefault('squads', []).append(value)
+        elif kind == END:
+            break
+    return war
+
+
+def parse_at_every_split(monkeypatch, tmp_path, data, text=None):
+    """Check the reader matches json.load for every chunk size up to the file length"""
+    path = tmp_path / "war.json"
+    path.write_text(json.dumps(data) if text is None else text, encoding='utf-8')
+    expected = json.loads(path.read_text(encoding='utf-8'))
+    # An empty roster yields no records, so it cannot be told from a missing one
+    expected = {key: value for key, value in expected.items() if value != []}
+    for chunk_size in range(1, len(path.read_text(encoding='utf-8')) + 2):
+        monkeypatch.setattr(clan_war_stream, 'CHUNK_SIZE', chunk_size)
+        war = rebuild(str(path))
+        assert war == expected, f"chunk size {chunk_size}"
+        for key, value in expected.items():
+            assert type(war[key]) is type(value), f"{key} at chunk size {chunk_size}"
+
+
+def test_float_split_after_point(monkeypatch, tmp_path):
+    text = '{"participants": [], "prize_pool": 150000.0, "war_length": 14}'
+    parse_at_every_split(monkeypatch, tmp_path, None, text)
+
+
+def test_scalars_at_every_split(monkeypatch, tmp_path):
+    parse_at_every_split(monkeypatch, tmp_path, SCALARS)
+
+
+def test_scalars_without_whitespace(monkeypatch, tmp_path):
+    text = json.dumps(SCALARS, separators=(',', ':'))
+    parse_at_every_split(monkeypatch, tmp_path, None, text)
+
+
+@pytest.mark.parametrize('settings_first', [True, False])
+def test_war_with_settings_after_roster(monkeypatch, tmp_path, settings_first):
+    # Older saves list the roster first, so prize_pool and journal_seq follow it
+    settings = {'prize_pool': 2500000.0, 'war_dates': ["01/01/2026", "01/02/2026"],
+                'prize_mode': "ranked", 'ranked_prizes': [10000, 5000.5]}
+    roster = {'participants': [{'id': i, 'name': f"Player {i}", 'attendance': [True, i % 2 == 0],
+                                'total_days': 1 + (i % 2 == 0), 'payout': i * 0.1, 'rank': i,
+                                'class_icon': None} for i in range(3)],
+              'squads': [{'name': "Alpha", 'members': ["Player 0", "Player 2"]}]}
+    data = {**settings, **roster} if settings_first else {**roster, **settings}
+    data['journal_seq'] = 17
+    parse_at_every_split(monkeypatch, tmp_path, data, json.dumps(data, indent=2))
+
+
+def write_war_file(tmp_path, settings_first, size=5000):
+    """A 30-day war saved with its settings before (current) or after (older saves) the roster"""
+    model = WarModel()
+    model.set_war_dates(generate_war_dates(length=30))
+    model.prize_pool = 1000000.0
+    model.participants = [Participant(f"Player {i:05d}", (i * 2654435761) & ((1 << 30) - 1))
+                          for i in range(size)]
+    model.reindex()
+    data = model.to_dict()
+    if not settings_first:
+        data = {'participants': data.pop('participants'), 'squads': data.pop('squads'), **data}
+    path = tmp_path / ("new.json" if settings_first else "old.json")
+    path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    return str(path), model
+
+
+@pytest.mark.parametrize('settings_first', [True, False])
+def test_batches_wait_for_war_dates(tmp_path, settings_first):
+    path, expected = write_war_file(tmp_path, settings_first)
+    early = []
+    rows = []
+    for _, settings, participants, squads, done in iter_war_batches(path, 1000, wars=1, hold_until='war_dates'):
+        rows.extend(participants)
+        if done:
+            break
+        assert settings['war_dates'] == expected.war_dates
+        early.append(len(participants))
+
+    if settings_first:
+        assert early == [1000] * 5
+    else:
+        assert early == []  # The dates follow the roster, so every row waits for them
+    assert settings['war_dates'] == expected.war_dates
+    assert [(p.name, p.mask) for p in rows] == [(p.name, p.mask) for p in expected.participants]
+
+
+def test_batches_without_hold_until_stream_older_saves(tmp_path):
+    path, expected = write_war_file(tmp_path, settings_first=False)
+    batches = [(len(participants), done) for _, _, participants, _, done in iter_war_batches(path, 1000, wars=1)]
+    assert batches == [(1000, False)] * 5 + [(0, True)]